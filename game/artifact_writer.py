@@ -0,0 +1,126 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+"""
+后台产物写入器 (Artifact Writer)
+地图快照、enemies.json 等调试/持久化文件统一交给一个后台线程写入：
+- 同一路径的多次提交只保留最后一次（合并）
+- 工作线程每次取走全部待写文件（批量）
+- 可整体关闭；退出时调用 flush() 等待落盘
+"""
+
+
+class ArtifactWriter:
+    """单线程、按路径合并的异步文件写入队列"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        # path -> ('text' | 'json', payload)
+        self._pending: Dict[str, Tuple[str, Any]] = {}
+        self._cond = threading.Condition()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计
+        self.submitted = 0
+        self.coalesced = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+
+    def write_text(self, path: str, text: str) -> None:
+        """排队写入文本文件"""
+        self._submit(path, 'text', text)
+
+    def write_json(self, path: str, data: Any) -> None:
+        """排队写入 JSON 文件（原子替换）"""
+        self._submit(path, 'json', data)
+
+    def _submit(self, path: str, kind: str, payload: Any) -> None:
+        if not self.enabled:
+            return
+        path = os.path.normpath(path)
+        with self._cond:
+            if path in self._pending:
+                self.coalesced += 1
+            self._pending[path] = (kind, payload)
+            self.submitted += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='artifact-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch = self._pending
+                self._pending = {}
+                self._busy = True
+            try:
+                for path, (kind, payload) in batch.items():
+                    self._write(path, kind, payload)
+                self.batches += 1
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, path: str, kind: str, payload: Any) -> None:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if kind == 'json':
+                with tempfile.NamedTemporaryFile('w', delete=False, dir=directory or None, encoding='utf-8') as tf:
+                    json.dump(payload, tf, ensure_ascii=False, indent=2)
+                    temp_name = tf.name
+                os.replace(temp_name, path)
+            else:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+            self.written += 1
+        except Exception:
+            # 调试产物写入失败不影响游戏
+            self.errors += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待所有已提交的文件写完；超时返回 False"""
+        with self._cond:
+            if not self._pending and not self._busy:
+                return True
+            self._ensure_thread()
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """写入统计，供 PerformanceOptimizer.get_stats 汇总"""
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            'enabled': self.enabled,
+            'submitted': self.submitted,
+            'coalesced': self.coalesced,
+            'written': self.written,
+            'batches': self.batches,
+            'errors': self.errors,
+            'pending': pending,
+        }
+
+
+# 进程内共享实例（工作线程在首次提交时才启动）
+_artifact_writer = ArtifactWriter()
+# 工作线程是守护线程：解释器退出前先等待已排队的文件写完，避免留下半写的临时文件
+atexit.register(_artifact_writer.flush, 5.0)
+
+
+def get_artifact_writer() -> ArtifactWriter:
+    """进程内共享的产物写入器"""
+    return _artifact_writer
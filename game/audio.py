@@ -193,13 +193,13 @@ def _safe_log(msg: str, level: str = 'info', logger: Optional[Any] = None, game_
             # Prefer logger methods if available
             try:
                 if level == 'debug' and hasattr(logger, 'debug'):
-                    logger.debug(msg, 'AUDIO')
+                    logger.debug(msg, category='AUDIO')
                     return
                 if level == 'info' and hasattr(logger, 'info'):
-                    logger.info(msg, 'AUDIO')
+                    logger.info(msg, category='AUDIO')
                     return
                 if level == 'warning' and hasattr(logger, 'warning'):
-                    logger.warning(msg, 'AUDIO')
+                    logger.warning(msg, category='AUDIO')
                     return
                 if level == 'error' and hasattr(logger, 'error'):
                     logger.error(msg, 'AUDIO')
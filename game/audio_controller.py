@@ -24,7 +24,7 @@ def initialize_audio(
     if logger:
         logger.debug(
             f"Audio initialized: sound_enabled={sound_enabled} hit={hit_sound is not None} sprint={sprint_sound is not None}",
-            "AUDIO",
+            category="AUDIO",
         )
 
     return sound_enabled, hit_sound, sprint_sound, sprint_ready_sound
@@ -181,6 +181,40 @@ class GameConfig:
         self.corridor_radius = self.parse_int_arg('--corridor-radius', None) or self._get_config_value(
             'game.corridor_radius', 1
         )
+        # 地牢生成后端：python（逐格循环）或 numpy（切片/掩码，相同种子输出一致）
+        self.generator_backend = self._get_config_value('game.generator_backend', 'python')
+        if '--gen-backend' in sys.argv:
+            try:
+                idx = sys.argv.index('--gen-backend')
+                self.generator_backend = sys.argv[idx + 1]
+            except (IndexError, ValueError):
+                pass
+        # 房间连接使用原 O(n^3) Prim 实现，保证旧种子生成相同拓扑
+        self.legacy_room_connect = '--legacy-rooms' in sys.argv or self._get_config_value(
+            'game.legacy_room_connect', False
+        )
+
+        # 敌人寻路深度上限（A* 路径最大步数）
+        self.max_path_length = self.parse_int_arg('--max-path', None) or self._get_config_value(
+            'game.max_path_length', 20
+        )
+        # 进入楼层后在后台线程预生成下一层
+        self.floor_prefetch = '--no-prefetch' not in sys.argv and self._get_config_value('game.floor_prefetch', True)
+        # 敌人 AI 细节分级：远处敌人降频或休眠（半径见 enemy_types.json 的 ai_lod）
+        self.ai_lod = '--no-ai-lod' not in sys.argv and self._get_config_value('game.ai_lod', True)
+        # 敌人存储后端: objects / soa（numpy 结构数组，向量化每帧冷却与距离判断）
+        self.enemy_backend = self._get_config_value('game.enemy_backend', 'objects')
+        if '--enemy-backend' in sys.argv:
+            try:
+                idx = sys.argv.index('--enemy-backend')
+                self.enemy_backend = sys.argv[idx + 1]
+            except (IndexError, ValueError):
+                pass
+
+        # 地图快照 / enemies.json 等产物的后台写入（关闭后不写任何产物）
+        self.write_artifacts = '--no-artifacts' not in sys.argv and self._get_config_value(
+            'game.write_artifacts', True
+        )
 
         # Camera parameters
         self.cam_lerp = self.parse_float_arg('--cam-lerp', None) or self._get_config_value('camera.lerp', 0.2)
@@ -244,11 +278,36 @@ class GameConfig:
         # Display parameters - 增大瓦片大小以获得更好的视觉效果
         self.tile_size = 28  # 从 24 增加到 28
         self.fps = 30
+        # 静态地形层缓存（关闭后回退到逐格绘制）
+        self.terrain_cache = '--no-terrain-cache' not in sys.argv and self._get_config_value(
+            'display.terrain_cache', True
+        )
 
         # Logging and debug configuration
         self.verbose_logging = '--verbose' in sys.argv
         self.performance_monitoring = '--perf' in sys.argv or self.debug_mode
         self.game_log_max = self.parse_int_arg('--log-max', 8)
+        # game.log / exit_log.txt 只保留在内存环形缓冲中（条数），按需或崩溃时写盘；0 表示直接写盘
+        self.log_ring = self.parse_int_arg('--log-ring', None) or self._get_config_value('logging.ring_size', 0)
+        # 逐帧遥测环（帧数）；指定 --telemetry 路径时退出/崩溃时写出（.npz 或二进制 .tlm）
+        self.telemetry_frames = self.parse_int_arg('--telemetry-frames', None) or self._get_config_value(
+            'debug.telemetry_frames', 4096
+        )
+        self.telemetry_path = self._get_config_value('debug.telemetry_path', None)
+        # 分层区段分析：指定路径时开启，退出时写出 Chrome trace JSON 与同名 .txt 汇总表
+        self.profile_path = self._get_config_value('debug.profile_path', None)
+        if '--profile' in sys.argv:
+            try:
+                idx = sys.argv.index('--profile')
+                self.profile_path = sys.argv[idx + 1]
+            except (IndexError, ValueError):
+                pass
+        if '--telemetry' in sys.argv:
+            try:
+                idx = sys.argv.index('--telemetry')
+                self.telemetry_path = sys.argv[idx + 1]
+            except (IndexError, ValueError):
+                pass
 
         # Developer tools
         self.show_fps = '--show-fps' in sys.argv or self.debug_mode
@@ -287,6 +346,10 @@ PyGame 字符地牢探索游戏 - 命令行参数
   --verbose-logging       详细日志输出
   --save-debug-levels     保存调试关卡文件
   --max-debug-levels <数量> 保留的调试关卡数量 (默认: 3)
+  --log-ring <数量>       game.log / exit_log 只保留在内存中的最近 N 条，崩溃或按需时写盘
+  --telemetry <文件>      退出时写出逐帧遥测（.npz 或 .tlm，用 tools/analyze_telemetry.py 查看）
+  --telemetry-frames <数量> 遥测环保留的帧数 (默认: 4096)
+  --profile <文件>        开启区段分析，退出时写出 Chrome trace JSON（同名 .txt 为汇总表）
 
 地图生成:
   --map-width <数字>      地图宽度 (默认: 100)
@@ -297,12 +360,20 @@ PyGame 字符地牢探索游戏 - 命令行参数
   --max-room <数字>       最大房间大小 (默认: 16)
   --corridor-radius <数字> 走廊半径 (默认: 1)
   --seed <数字>           随机种子
+  --gen-backend <名称>    地牢生成后端: python / numpy (默认: python)
+  --legacy-rooms          使用旧版房间连接算法（与旧种子生成相同地图）
+  --no-prefetch           关闭下一层后台预生成
+  --max-path <数字>       敌人寻路最大步数 (默认: 20)
+  --no-ai-lod             远处敌人也运行完整 AI（关闭 AI 细节分级）
+  --enemy-backend <名称>  敌人存储后端: objects / soa (默认: objects)
+  --no-artifacts          不写出地图快照与 enemies.json
 
 显示设置:
   --view-w <数字>         视窗宽度(瓦片) (默认: 40)
   --view-h <数字>         视窗高度(瓦片) (默认: 30)
   --show-fps              显示FPS
   --show-coords           显示坐标
+  --no-terrain-cache      禁用静态地形层缓存(逐格绘制)
 
 相机设置:
   --cam-lerp <浮点数>     相机跟随平滑度 (默认: 0.2)
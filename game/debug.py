@@ -4,6 +4,7 @@ Enhanced debug overlay and developer tools
 
 import pygame
 from game import utils
+from game.profiler import profiled
 
 
 class DebugOverlay:
@@ -45,9 +46,9 @@ class DebugOverlay:
 
         # If debug mode was just enabled, show a notification
         if self.enabled and not self.was_enabled:
-            self.logger.info("Debug mode enabled - Press 1-5 to toggle panels, F12 to disable", "DEBUG")
+            self.logger.info("Debug mode enabled - Press 1-5 to toggle panels, F12 to disable", category="DEBUG")
         elif not self.enabled and self.was_enabled:
-            self.logger.info("Debug mode disabled", "DEBUG")
+            self.logger.info("Debug mode disabled", category="DEBUG")
 
         self.was_enabled = self.enabled
 
@@ -57,7 +58,7 @@ class DebugOverlay:
             self.font = utils.load_preferred_font(16)[0]
             self.small_font = utils.load_preferred_font(12)[0]
         except Exception as e:
-            self.logger.warning(f"Failed to load debug fonts: {e}", "DEBUG")
+            self.logger.warning(f"Failed to load debug fonts: {e}", category="DEBUG")
 
     def toggle_panel(self, panel_name: str):
         """Toggle visibility of a debug panel"""
@@ -66,6 +67,7 @@ class DebugOverlay:
         else:
             self.visible_panels.add(panel_name)
 
+    @profiled('debug.overlay')
     def render(self, screen, game_state, player, entity_mgr, npcs):
         """Render all enabled debug panels"""
         if not self.enabled:
@@ -232,7 +234,7 @@ class DebugOverlay:
         x, y = self.panel_positions['entity_debug']
 
         # Background
-        panel_surf = pygame.Surface((200, 100), pygame.SRCALPHA)
+        panel_surf = pygame.Surface((200, 115), pygame.SRCALPHA)
         panel_surf.fill((0, 0, 0, 180))
         screen.blit(panel_surf, (x, y))
 
@@ -244,9 +246,11 @@ class DebugOverlay:
         if entity_mgr:
             enemy_count = len([e for e in entity_mgr.entities_by_id.values() if hasattr(e, 'hp')])
             total_entities = len(entity_mgr.entities_by_id)
+            lod = entity_mgr.get_lod_counts() if hasattr(entity_mgr, 'get_lod_counts') else None
         else:
             enemy_count = 0
             total_entities = 0
+            lod = None
 
         npc_count = len(npcs) if npcs else 0
 
@@ -255,6 +259,8 @@ class DebugOverlay:
             f"NPCs: {npc_count}",
             f"Total Entities: {total_entities}",
         ]
+        if lod is not None:
+            info_lines.append(f"AI LOD: near {lod['near']} / mid {lod['mid']} / far {lod['far']}")
 
         line_y = y + 25
         for line in info_lines:
@@ -24,11 +24,11 @@ def toggle_debug_mode(config, renderer, logger, game_state) -> Optional[bool]:
         # Log the state change and add to in-game log if available
         status_message = f"Debug mode {'enabled' if new_state else 'disabled'}"
         if new_state:
-            logger.info(f"{status_message} - Press 1-5 to toggle panels, F12 to disable", "DEBUG")
+            logger.info(f"{status_message} - Press 1-5 to toggle panels, F12 to disable", category="DEBUG")
             if hasattr(game_state, 'game_log'):
                 game_state.game_log("Debug mode enabled (F12 to disable)")
         else:
-            logger.info(f"{status_message}", "DEBUG")
+            logger.info(f"{status_message}", category="DEBUG")
             if hasattr(game_state, 'game_log'):
                 game_state.game_log("Debug mode disabled")
 
@@ -54,7 +54,7 @@ def toggle_panel(renderer, panel_name: str, logger, game_state, config) -> bool:
             panel_status = (
                 "visible" if panel_name in renderer.debug_overlay.visible_panels else "hidden"
             )
-            logger.debug(f"Debug panel '{panel_name}' is now {panel_status}", "DEBUG")
+            logger.debug(f"Debug panel '{panel_name}' is now {panel_status}")
             if hasattr(game_state, 'game_log'):
                 game_state.game_log(f"Debug panel '{panel_name}': {panel_status}")
             return True
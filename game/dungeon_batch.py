@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+from .utils import DungeonResult, generate_dungeon_data
+
+"""
+批量并行地牢生成
+每个种子在独立的工作进程中调用 generate_dungeon_data；生成器只使用由种子派生的实例级 RNG，
+因此结果与顺序生成逐字节一致，且与进程调度顺序无关。
+"""
+
+
+def _generate_one(args) -> DungeonResult:
+    seed, kwargs = args
+    return generate_dungeon_data(seed=seed, **kwargs)
+
+
+def generate_dungeons(seeds: Iterable[int], workers: Optional[int] = None, **kwargs) -> List[DungeonResult]:
+    """按 seeds 顺序返回 DungeonResult 列表，使用全部 CPU 核心并行生成
+
+    workers: 工作进程数（默认 os.cpu_count()）；为 1 或只有一个种子时在当前进程中顺序生成。
+    其余关键字参数原样传给 generate_dungeon_data（width、height、room_attempts、backend 等）。
+    """
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    jobs = [(seed, kwargs) for seed in seeds]
+    if workers <= 1 or len(seeds) <= 1:
+        return [_generate_one(job) for job in jobs]
+
+    workers = min(workers, len(seeds))
+    chunksize = max(1, len(seeds) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_generate_one, jobs, chunksize=chunksize))
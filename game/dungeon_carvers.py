@@ -0,0 +1,153 @@
+from typing import List, Tuple
+
+"""
+地牢生成的网格雕刻后端 (Carvers)
+generate_dungeon 负责所有随机决策（调用顺序固定），后端只负责在网格上执行雕刻：
+- python: list[list[str]] 逐格循环（原实现）
+- numpy: uint8 二维数组，房间切片赋值、走廊路径掩码膨胀、布尔掩码提取地面
+两个后端在相同随机序列下产生完全一致的地图。
+"""
+
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+WALL = '#'
+FLOOR = '.'
+
+
+class ListCarver:
+    """纯 Python 后端：list[list[str]] 网格"""
+
+    name = 'python'
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.grid = [[WALL for _ in range(width)] for _ in range(height)]
+
+    def get(self, x: int, y: int) -> str:
+        return self.grid[y][x]
+
+    def set(self, x: int, y: int, ch: str) -> None:
+        self.grid[y][x] = ch
+
+    def carve_rect(self, x: int, y: int, w: int, h: int) -> None:
+        grid = self.grid
+        for yy in range(y, y + h):
+            for xx in range(x, x + w):
+                grid[yy][xx] = FLOOR
+
+    def soften(self, x0: int, y0: int, x1: int, y1: int, rng) -> None:
+        """区域内每个墙格以 50% 概率打通（按行优先顺序消耗随机数）"""
+        grid = self.grid
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                if grid[yy][xx] == WALL:
+                    if rng.random() < 0.5:
+                        grid[yy][xx] = FLOOR
+
+    def stamp(self, x: int, y: int, radius: int) -> None:
+        """在走廊当前位置打通 (2r+1)^2 区域（边界钳制）"""
+        grid = self.grid
+        width = self.width
+        height = self.height
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                xx = max(0, min(width - 1, x + dx))
+                yy = max(0, min(height - 1, y + dy))
+                grid[yy][xx] = FLOOR
+
+    def finish_corridors(self) -> None:
+        pass
+
+    def floor_positions(self) -> List[Tuple[int, int]]:
+        return [(x, y) for y in range(self.height) for x in range(self.width) if self.grid[y][x] == FLOOR]
+
+    def to_rows(self) -> List[str]:
+        return [''.join(row) for row in self.grid]
+
+
+class NumpyCarver:
+    """NumPy 后端：uint8 二维数组，走廊在全部路径确定后一次性膨胀雕刻"""
+
+    name = 'numpy'
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.grid = np.full((height, width), ord(WALL), dtype=np.uint8)
+        self._path_x: List[int] = []
+        self._path_y: List[int] = []
+        self._radius = 0
+
+    def get(self, x: int, y: int) -> str:
+        return chr(self.grid[y, x])
+
+    def set(self, x: int, y: int, ch: str) -> None:
+        self.grid[y, x] = ord(ch)
+
+    def carve_rect(self, x: int, y: int, w: int, h: int) -> None:
+        self.grid[y:y + h, x:x + w] = ord(FLOOR)
+
+    def soften(self, x0: int, y0: int, x1: int, y1: int, rng) -> None:
+        box = self.grid[y0:y1, x0:x1]
+        walls = box == ord(WALL)
+        n = int(walls.sum())
+        if not n:
+            return
+        # 布尔掩码按行优先顺序展开，与逐格循环的随机数消耗顺序一致
+        draws = np.fromiter((rng.random() for _ in range(n)), dtype=np.float64, count=n)
+        opened = np.zeros_like(walls)
+        opened[walls] = draws < 0.5
+        box[opened] = ord(FLOOR)
+
+    def stamp(self, x: int, y: int, radius: int) -> None:
+        # 走廊只会把格子打通为地面，顺序无关：先记录路径，最后统一膨胀
+        self._path_x.append(x)
+        self._path_y.append(y)
+        self._radius = radius
+
+    def finish_corridors(self) -> None:
+        if not self._path_x:
+            return
+        h, w = self.height, self.width
+        path = np.zeros((h, w), dtype=bool)
+        path[np.asarray(self._path_y), np.asarray(self._path_x)] = True
+        carved = path.copy()
+        r = self._radius
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                if dx == 0 and dy == 0:
+                    continue
+                # carved[y + dy, x + dx] |= path[y, x]（越界部分由钳制后落在已覆盖的格子内）
+                dst_y = slice(max(0, dy), h + min(0, dy))
+                dst_x = slice(max(0, dx), w + min(0, dx))
+                src_y = slice(max(0, -dy), h + min(0, -dy))
+                src_x = slice(max(0, -dx), w + min(0, -dx))
+                carved[dst_y, dst_x] |= path[src_y, src_x]
+        self.grid[carved] = ord(FLOOR)
+        self._path_x = []
+        self._path_y = []
+
+    def floor_positions(self) -> List[Tuple[int, int]]:
+        ys, xs = np.nonzero(self.grid == ord(FLOOR))
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def to_rows(self) -> List[str]:
+        data = self.grid.tobytes()
+        w = self.width
+        return [data[y * w:(y + 1) * w].decode('latin-1') for y in range(self.height)]
+
+
+def make_carver(backend: str, width: int, height: int):
+    """按名称创建后端；numpy 不可用时回退到 python 后端"""
+    if backend == 'numpy' and NUMPY_AVAILABLE:
+        return NumpyCarver(width, height)
+    return ListCarver(width, height)
@@ -1,7 +1,8 @@
 import json
 import os
 from functools import lru_cache
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 
 # 单一来源的默认配置，避免散落硬编码
 DEFAULT_CONFIG: Dict[str, Any] = {
@@ -38,6 +39,8 @@ DEFAULT_CONFIG: Dict[str, Any] = {
             "damage": 1,
             "ai_update_interval": 1,
             "move_interval": 3,
+            # 侦察兵视野更远，完整 AI 的范围也更大
+            "ai_lod": {"near_radius": 30, "wake_radius": 48},
         },
         "brute": {
             "hp": 12,
@@ -49,6 +52,13 @@ DEFAULT_CONFIG: Dict[str, Any] = {
             "move_interval": 8,
         },
     },
+    # AI 细节分级（切比雪夫距离，单位：格）；各种类可在 types.<kind>.ai_lod 中覆盖
+    # near: 完整状态机；mid: 降频随机游走；超出 wake_radius: 冻结，玩家靠近时唤醒
+    "ai_lod": {
+        "near_radius": 24,
+        "wake_radius": 40,
+        "mid_rate": 3,
+    },
 }
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'enemy_types.json')
@@ -77,10 +87,42 @@ def get_enemy_stats(kind: str) -> Dict[str, Any]:
     return dict(cfg['types'].get(kind, cfg['types']['basic']))
 
 
+@lru_cache(maxsize=None)
+def get_shared_enemy_stats(kind: str) -> Mapping[str, Any]:
+    """某种敌人的只读属性映射，同种敌人共享同一对象（get_enemy_stats 返回可修改的副本）"""
+    return MappingProxyType(get_enemy_stats(kind))
+
+
 def get_enemy_hp(kind: str) -> int:
     return int(get_enemy_stats(kind).get('hp', 5))
 
 
+def get_max_chase_range() -> int:
+    """所有敌人种类中最大的 chase_range（共享寻路距离场的半径）"""
+    types = load_enemy_config()['types']
+    return max((int(t.get('chase_range', 0)) for t in types.values()), default=0)
+
+
+def get_enemy_lod(kind: str) -> Dict[str, int]:
+    """某种敌人的 AI 分级参数：全局 ai_lod 与 types.<kind>.ai_lod 合并"""
+    cfg = load_enemy_config()
+    lod = dict(DEFAULT_CONFIG['ai_lod'])
+    lod.update(cfg.get('ai_lod', {}))
+    lod.update(get_enemy_stats(kind).get('ai_lod', {}))
+    near = max(0, int(lod['near_radius']))
+    return {
+        'near_radius': near,
+        'wake_radius': max(near, int(lod['wake_radius'])),
+        'mid_rate': max(1, int(lod['mid_rate'])),
+    }
+
+
+def get_max_wake_radius() -> int:
+    """所有敌人种类中最大的 wake_radius（休眠敌人唤醒检查的范围）"""
+    kinds = load_enemy_config()['types'].keys()
+    return max((get_enemy_lod(k)['wake_radius'] for k in kinds), default=0)
+
+
 def pick_enemy_kind_for_coord(x: int, y: int) -> str:
     """根据坐标哈希 + 配置中的权重分布确定敌人种类。
     保持确定性：同一 (x,y) 在相同配置下始终返回同一结果。
@@ -107,7 +149,11 @@ def reassign_enemy_kind(ent) -> None:
 __all__ = [
     'load_enemy_config',
     'get_enemy_stats',
+    'get_shared_enemy_stats',
     'get_enemy_hp',
+    'get_max_chase_range',
+    'get_enemy_lod',
+    'get_max_wake_radius',
     'pick_enemy_kind_for_coord',
     'reassign_enemy_kind',
 ]
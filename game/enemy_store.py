@@ -0,0 +1,173 @@
+from typing import Dict, List, Optional
+
+from .enemy_config import get_enemy_lod, get_enemy_stats
+from .entities import Enemy
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+"""
+敌人结构数组存储 (Struct-of-Arrays Enemy Store)
+x / y / hp / 种类 / 冷却 / 状态等热字段存放在 NumPy 数组中，每帧的冷却计数、
+与玩家的相邻判断、距离与追击范围测试对全部敌人一次性向量化完成。
+Enemy 对象保持原有接口：加入存储后其热字段改为读写数组中对应的行。
+"""
+
+
+STATE_NAMES = ('patrol', 'chase', 'attack')
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+# 存放在数组中的字段（加入存储时从对象搬入，移出时写回）
+_FIELDS = ('x', 'y', 'hp', 'move_cooldown', 'ai_cooldown', 'state')
+
+
+class EnemyStore:
+    """按行保存敌人热字段；删除时用末行填补空位，保持数组紧凑"""
+
+    # due 数组中的特殊取值（非负值为到期帧，与时间轮后端的 _due 相同）
+    UNSCHEDULED = -1  # 新加入，下一次 update 入轮
+    DORMANT = -2  # far 分级休眠，玩家进入唤醒半径时本帧到期
+    DETACHED = -3  # 不在位置索引中，重新 add 时再入轮
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(1, capacity)
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.hp = np.zeros(capacity, dtype=np.int32)
+        self.kind_id = np.zeros(capacity, dtype=np.int16)
+        self.move_cd = np.zeros(capacity, dtype=np.int32)
+        self.ai_cd = np.zeros(capacity, dtype=np.int32)
+        self.state = np.zeros(capacity, dtype=np.int8)
+        # entities_by_pos 的插入序号，保证向量化选出的敌人按原遍历顺序行动
+        self.seq = np.zeros(capacity, dtype=np.int64)
+        # 最近一次 update 的 AI 分级：0 near / 1 mid / 2 far
+        self.tier = np.zeros(capacity, dtype=np.int8)
+        # 下一次行动的帧号（或上面的特殊取值）
+        self.due = np.zeros(capacity, dtype=np.int64)
+        self.enemies: List = []
+
+        # 按 kind_id 索引的属性表
+        self.kinds: List[str] = []
+        self._kind_ids: Dict[str, int] = {}
+        self.move_interval = np.zeros(0, dtype=np.int32)
+        self.ai_interval = np.zeros(0, dtype=np.int32)
+        self.chase_range = np.zeros(0, dtype=np.int32)
+        self.near_radius = np.zeros(0, dtype=np.int32)
+        self.wake_radius = np.zeros(0, dtype=np.int32)
+        self.mid_rate = np.zeros(0, dtype=np.int32)
+
+    def kind_id_for(self, kind: str) -> int:
+        kid = self._kind_ids.get(kind)
+        if kid is None:
+            stats = get_enemy_stats(kind)
+            lod = get_enemy_lod(kind)
+            kid = self._kind_ids[kind] = len(self.kinds)
+            self.kinds.append(kind)
+            self.move_interval = np.append(self.move_interval, max(1, int(stats.get('move_interval', 6))))
+            self.ai_interval = np.append(self.ai_interval, int(stats.get('ai_update_interval', 3)))
+            self.chase_range = np.append(self.chase_range, int(stats.get('chase_range', 0)))
+            self.near_radius = np.append(self.near_radius, lod['near_radius'])
+            self.wake_radius = np.append(self.wake_radius, lod['wake_radius'])
+            self.mid_rate = np.append(self.mid_rate, lod['mid_rate'])
+        return kid
+
+    def _grow(self) -> None:
+        capacity = len(self.x) * 2
+        for name in ('x', 'y', 'hp', 'kind_id', 'move_cd', 'ai_cd', 'state', 'seq', 'tier', 'due'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def adopt(self, enemy, seq: int = 0) -> None:
+        """把敌人的热字段搬入新行，之后对这些字段的读写都落在数组上
+
+        已在存储中的敌人只恢复调度：脱离位置索引的行重新 add 时再入轮（同时间轮后端）。
+        """
+        if isinstance(enemy, StoredEnemy):
+            if enemy._store is self and self.due[enemy._row] == self.DETACHED:
+                self.due[enemy._row] = self.UNSCHEDULED
+            return
+        if self.count == len(self.x):
+            self._grow()
+        row = self.count
+        self.count += 1
+        values = {name: getattr(enemy, name) for name in _FIELDS}
+        self.x[row] = values['x']
+        self.y[row] = values['y']
+        self.hp[row] = values['hp']
+        self.move_cd[row] = values['move_cooldown']
+        self.ai_cd[row] = values['ai_cooldown']
+        self.state[row] = STATE_CODES.get(values['state'], 0)
+        self.kind_id[row] = self.kind_id_for(enemy.kind)
+        self.seq[row] = seq
+        self.tier[row] = 0
+        self.due[row] = self.UNSCHEDULED
+        self.enemies.append(enemy)
+        enemy._store = self
+        enemy._row = row
+        # 同一对象换成数组视图类：外部持有的引用与 isinstance(Enemy) 判断不受影响
+        enemy.__class__ = StoredEnemy
+
+    def release(self, enemy) -> None:
+        """移出存储：字段写回对象，末行填补空位"""
+        if not isinstance(enemy, StoredEnemy) or enemy._store is not self:
+            return
+        values = {name: getattr(enemy, name) for name in _FIELDS}
+        row = enemy._row
+        last = self.count - 1
+        if row != last:
+            for name in ('x', 'y', 'hp', 'kind_id', 'move_cd', 'ai_cd', 'state', 'seq', 'tier', 'due'):
+                arr = getattr(self, name)
+                arr[row] = arr[last]
+            moved = self.enemies[last]
+            self.enemies[row] = moved
+            moved._row = row
+        self.enemies.pop()
+        self.count = last
+
+        enemy.__class__ = Enemy
+        del enemy._store
+        del enemy._row
+        for name, value in values.items():
+            setattr(enemy, name, value)
+
+    def row_of(self, enemy) -> Optional[int]:
+        if isinstance(enemy, StoredEnemy) and enemy._store is self:
+            return enemy._row
+        return None
+
+
+def _array_field(array_name: str, encode=None, decode=None):
+    def fget(self):
+        value = getattr(self._store, array_name)[self._row]
+        return decode(value) if decode else int(value)
+
+    def fset(self, value):
+        getattr(self._store, array_name)[self._row] = encode(value) if encode else value
+
+    return property(fget, fset)
+
+
+class StoredEnemy(Enemy):
+    """热字段存放在 EnemyStore 数组中的敌人（与 Enemy 槽位布局相同，可互换 __class__）"""
+
+    __slots__ = ()
+
+    x = _array_field('x')
+    y = _array_field('y')
+    hp = _array_field('hp')
+    move_cooldown = _array_field('move_cd')
+    ai_cooldown = _array_field('ai_cd')
+    state = _array_field('state', encode=lambda s: STATE_CODES.get(s, 0), decode=lambda c: STATE_NAMES[int(c)])
+
+    def to_config(self) -> dict:
+        c = super().to_config()
+        c['type'] = Enemy.__name__
+        return c
@@ -1,11 +1,37 @@
 import json
+import random
 import os
 from typing import Dict, List, Optional, Tuple, Any
-from .enemy_config import get_enemy_stats, get_enemy_hp, pick_enemy_kind_for_coord
+from .enemy_config import (
+    get_enemy_hp,
+    get_enemy_lod,
+    get_max_chase_range,
+    get_max_wake_radius,
+    get_shared_enemy_stats,
+    pick_enemy_kind_for_coord,
+)
 from .log_utils import safe_log
 from game.utils import set_tile
+from game.tile_grid import find_tiles, tile_getter
+from game.pathfinding import DEFAULT_MAX_DEPTH, build_walkable_mask, find_path
+from game.flow_field import FlowField
+from game.line_of_sight import LineOfSightCache, tile_between
+from game.profiler import profiled
+from game.scheduler import TimingWheel
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 追击路径只需覆盖到下一次 AI 重新规划：AI 帧取走一步，冷却期间最多再走一步
+CHASE_LOOKAHEAD = 2
+# 休眠敌人按 LOD_CELL x LOD_CELL 的格子分桶，唤醒时只检查玩家附近的桶
+LOD_CELL = 16
 
 class Entity:
+    __slots__ = ('id', 'x', 'y')
+
     def __init__(self, x: int, y: int):
         # id will be assigned by EntityManager when added
         self.id: Optional[int] = None
@@ -24,12 +50,30 @@ class Entity:
 
 
 class Enemy(Entity):
+    # 大地图上同时存在数百个敌人：不带 __dict__，属性表按种类共享
+    __slots__ = (
+        'kind',
+        'enemy_stats',
+        'hp',
+        'dir',
+        '_path',
+        'target_pos',
+        '_patrol_points',
+        'state',
+        'last_player_pos',
+        'stuck_counter',
+        'ai_cooldown',
+        'move_cooldown',
+        '_store',
+        '_row',
+    )
+
     def __init__(self, x: int, y: int, hp: int = 5, dir=(1, 0), kind: str = 'basic'):
         super().__init__(x, y)
         self.kind = kind
         
-        # 从集中配置获取属性
-        self.enemy_stats = get_enemy_stats(kind)
+        # 从集中配置获取属性（同种敌人共享同一只读映射）
+        self.enemy_stats = get_shared_enemy_stats(kind)
         # 如果调用方传入的 hp 看起来仍是“占位默认值”(5)，使用配置中 hp
         if hp == 5 and kind != 'basic':
             self.hp = get_enemy_hp(kind)
@@ -39,16 +83,36 @@ class Enemy(Entity):
             
         self.dir = tuple(dir)
         
-        # AI状态和寻路
-        self.path: List[Tuple[int, int]] = []  # 当前路径
+        # AI状态和寻路（path / patrol_points 首次使用时才创建列表）
+        self._path: Optional[List[Tuple[int, int]]] = None  # 当前路径
         self.target_pos: Optional[Tuple[int, int]] = None  # 目标位置
-        self.patrol_points: List[Tuple[int, int]] = []  # 巡逻点
+        self._patrol_points: Optional[List[Tuple[int, int]]] = None  # 巡逻点
         self.state: str = 'patrol'  # 状态: patrol, chase, attack
         self.last_player_pos: Optional[Tuple[int, int]] = None  # 上次看到玩家的位置
         self.stuck_counter: int = 0  # 卡住计数器
         self.ai_cooldown: int = 0  # AI决策冷却
         self.move_cooldown: int = 0  # 独立的移动冷却
-        
+
+    @property
+    def path(self) -> List[Tuple[int, int]]:
+        if self._path is None:
+            self._path = []
+        return self._path
+
+    @path.setter
+    def path(self, value: List[Tuple[int, int]]) -> None:
+        # 空路径不保留列表对象
+        self._path = value or None
+
+    @property
+    def patrol_points(self) -> List[Tuple[int, int]]:
+        if self._patrol_points is None:
+            self._patrol_points = []
+        return self._patrol_points
+
+    @patrol_points.setter
+    def patrol_points(self, value: List[Tuple[int, int]]) -> None:
+        self._patrol_points = value or None
 
     def to_config(self) -> dict:
         c = super().to_config()
@@ -71,26 +135,93 @@ class Enemy(Entity):
 
 
 class EntityManager:
-    def __init__(self):
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        max_path_length: int = DEFAULT_MAX_DEPTH,
+        max_path_nodes: Optional[int] = None,
+        use_flow_field: bool = True,
+        use_ai_lod: bool = True,
+        backend: str = 'objects',
+    ):
+        # AI 随机决策（巡逻目标、随机游走）使用的实例级随机源，通常由楼层种子派生
+        self.rng = rng if rng is not None else random.Random()
+        # 寻路深度/展开节点上限
+        self.max_path_length = max_path_length
+        self.max_path_nodes = max_path_nodes
+        # 寻路用可行走掩码：每次 update 开始时重建，敌人移动时增量维护
+        self._walkable: Optional[bytearray] = None
+        self._walkable_width = 0
+        # 追击者共享的玩家距离场（半径为最大 chase_range），关闭时每个追击者各自 A*
+        self.flow_field: Optional[FlowField] = FlowField(get_max_chase_range()) if use_flow_field else None
+        # 敌人→玩家视线：不透明掩码 + (敌人格, 玩家格) 结果缓存
+        self.los = LineOfSightCache()
+        # 本次 update 的玩家视野（对称阴影投射）：玩家看得见的格子上的敌人必然看得见玩家
+        self._fov_visible = None
+        self._fov_origin: Optional[Tuple[int, int]] = None
         # map pos -> entity and id -> entity
         self.entities_by_pos: Dict[Tuple[int, int], Entity] = {}
         self.entities_by_id: Dict[int, Entity] = {}
         self._next_id = 1
         self.move_cooldown = 0
+        # 敌人移动调度：时间轮按到期帧取出敌人，每帧只处理到期的敌人
+        self._tick = 0
+        self._wheel = TimingWheel()
+        self._due: Dict[int, int] = {}  # id -> 到期帧（与轮中条目不一致的视为已取消）
+        self._unscheduled: Dict[int, Enemy] = {}  # 新加入、等待下一次 update 入轮的敌人
+        # entities_by_pos 的插入序号，保证到期敌人按原字典遍历顺序行动
+        self._pos_seq: Dict[int, int] = {}
+        self._next_seq = 0
+        # AI 细节分级：near 完整 AI，mid 降频随机游走，far 移出时间轮休眠直到玩家进入唤醒半径
+        self.use_ai_lod = use_ai_lod
+        self._lod_tier: Dict[int, str] = {}
+        self._lod_by_kind: Dict[str, Dict[str, int]] = {}
+        self._dormant: Dict[int, Tuple[int, int]] = {}  # id -> 所在分桶
+        self._dormant_cells: Dict[Tuple[int, int], set] = {}
+        self._max_wake_radius = get_max_wake_radius() if use_ai_lod else 0
+        self._lod_player_pos: Optional[Tuple[int, int]] = None
+        # 可选的结构数组后端（需要 numpy）：冷却、相邻攻击与距离判断对全部敌人向量化
+        self.store = None
+        if backend == 'soa':
+            from .enemy_store import NUMPY_AVAILABLE, EnemyStore
+
+            if NUMPY_AVAILABLE:
+                self.store = EnemyStore()
+        self.backend = 'soa' if self.store is not None else 'objects'
         # Optional runtime-injected references (set by Game or controllers)
         self.logger = None
         self.game_state = None
 
-    def _prefer_log(self, msg: str, level: str = 'debug'):
-        safe_log(getattr(self, 'logger', None), getattr(self, 'game_state', None), msg, level=level, channel='ENTITY')
+    def _prefer_log(self, msg, *args, level: str = 'debug'):
+        safe_log(getattr(self, 'logger', None), getattr(self, 'game_state', None), msg, *args, level=level, channel='ENTITY')
 
     def add(self, ent: Entity):
         if getattr(ent, 'id', None) is None:
             ent.id = self._next_id
             self._next_id += 1
-        self.entities_by_pos[(ent.x, ent.y)] = ent
+        if self.store is not None and isinstance(ent, Enemy):
+            self.store.adopt(ent)
+        self._place(ent)
         if ent.id is not None:
             self.entities_by_id[ent.id] = ent
+            if self.store is None and isinstance(ent, Enemy) and ent.id not in self._due and ent.id not in self._dormant:
+                self._unscheduled[ent.id] = ent
+
+    def _place(self, ent: Entity):
+        """写入 entities_by_pos 并记录插入序号（覆盖已有键时沿用其位置，与 dict 语义一致）"""
+        key = (ent.x, ent.y)
+        prev = self.entities_by_pos.get(key)
+        if prev is not None:
+            seq = self._pos_seq.get(prev.id, self._next_seq)
+        else:
+            seq = self._next_seq
+            self._next_seq += 1
+        self.entities_by_pos[key] = ent
+        self._pos_seq[ent.id] = seq
+        if self.store is not None:
+            row = self.store.row_of(ent)
+            if row is not None:
+                self.store.seq[row] = seq
 
     def get_entity_at(self, x: int, y: int) -> Optional[Entity]:
         return self.entities_by_pos.get((x, y))
@@ -108,6 +239,99 @@ class EntityManager:
             del self.entities_by_pos[key]
         if getattr(ent, 'id', None) is not None and ent.id in self.entities_by_id:
             del self.entities_by_id[ent.id]
+        # 时间轮中的条目惰性取消
+        self._due.pop(ent.id, None)
+        self._unscheduled.pop(ent.id, None)
+        self._pos_seq.pop(ent.id, None)
+        self._lod_tier.pop(ent.id, None)
+        cell = self._dormant.pop(ent.id, None)
+        if cell is not None:
+            self._dormant_cells[cell].discard(ent.id)
+        if self.store is not None:
+            self.store.release(ent)
+
+    def move_cooldown_of(self, enemy: Enemy) -> int:
+        """敌人当前的移动冷却计数（与逐帧累加的 move_cooldown 含义相同）"""
+        store = self.store
+        if store is not None:
+            row = store.row_of(enemy)
+            if row is None or store.due[row] < 0:
+                return enemy.move_cooldown
+            tier = ('near', 'mid', 'far')[int(store.tier[row])]
+            return max(0, self._move_interval(enemy, tier) - (int(store.due[row]) - self._tick))
+        due = self._due.get(enemy.id)
+        if due is None:
+            return enemy.move_cooldown
+        return max(0, self._move_interval(enemy, self._lod_tier.get(enemy.id, 'near')) - (due - self._tick))
+
+    def _move_interval(self, enemy: Enemy, tier: str) -> int:
+        interval = max(1, enemy.enemy_stats.get('move_interval', 6))
+        if tier == 'mid':
+            interval *= self._lod_settings(enemy.kind)['mid_rate']
+        return interval
+
+    def _lod_settings(self, kind: str) -> Dict[str, int]:
+        lod = self._lod_by_kind.get(kind)
+        if lod is None:
+            lod = self._lod_by_kind[kind] = get_enemy_lod(kind)
+        return lod
+
+    def _classify_lod(self, enemy: Enemy, player_pos: Tuple[int, int], is_visible=None) -> str:
+        """按与玩家的切比雪夫距离（及是否在视野内）确定敌人的 AI 分级"""
+        if not self.use_ai_lod:
+            return 'near'
+        lod = self._lod_settings(enemy.kind)
+        d = max(abs(enemy.x - player_pos[0]), abs(enemy.y - player_pos[1]))
+        if d <= lod['near_radius'] or (is_visible is not None and is_visible(enemy.x, enemy.y)):
+            return 'near'
+        if d <= lod['wake_radius']:
+            return 'mid'
+        return 'far'
+
+    def _sleep(self, enemy: Enemy) -> None:
+        """移出时间轮，放入休眠分桶"""
+        self._due.pop(enemy.id, None)
+        cell = (enemy.x // LOD_CELL, enemy.y // LOD_CELL)
+        self._dormant[enemy.id] = cell
+        self._dormant_cells.setdefault(cell, set()).add(enemy.id)
+        self._lod_tier[enemy.id] = 'far'
+
+    def _wake_dormant(self, player_pos: Tuple[int, int], tick: int) -> None:
+        """玩家移动后唤醒进入唤醒半径的休眠敌人（只检查附近的分桶），本帧即行动"""
+        if player_pos == self._lod_player_pos:
+            return
+        self._lod_player_pos = player_pos
+        if not self._dormant:
+            return
+        px, py = player_pos
+        r = self._max_wake_radius
+        cells = self._dormant_cells
+        for cy in range((py - r) // LOD_CELL, (py + r) // LOD_CELL + 1):
+            for cx in range((px - r) // LOD_CELL, (px + r) // LOD_CELL + 1):
+                ids = cells.get((cx, cy))
+                if not ids:
+                    continue
+                for ent_id in list(ids):
+                    ent = self.entities_by_id.get(ent_id)
+                    if ent is None:
+                        continue
+                    if max(abs(ent.x - px), abs(ent.y - py)) <= self._lod_settings(ent.kind)['wake_radius']:
+                        ids.discard(ent_id)
+                        del self._dormant[ent_id]
+                        self._due[ent_id] = tick
+                        self._wheel.schedule(tick, ent_id)
+
+    def get_lod_counts(self) -> Dict[str, int]:
+        """各 AI 分级的敌人数量（尚未分级的新敌人计入 near）"""
+        counts = {'near': 0, 'mid': 0, 'far': 0}
+        store = self.store
+        if store is not None:
+            tiers = np.bincount(store.tier[: store.count], minlength=3)
+            return {'near': int(tiers[0]), 'mid': int(tiers[1]), 'far': int(tiers[2])}
+        for ent_id, ent in self.entities_by_id.items():
+            if isinstance(ent, Enemy):
+                counts[self._lod_tier.get(ent_id, 'near')] += 1
+        return counts
 
     def load_from_level(self, level: List[str]):
         """Scan for 'E' tiles and create Enemy instances using centralized config.
@@ -199,168 +423,344 @@ class EntityManager:
             return
         try:
             with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # if level provided, clear existing 'E' marks to avoid leftover static enemies
-                if level is not None and len(level) > 0:
-                    w = len(level[0])
-                    h = len(level)
-                    for y in range(h):
-                        for x in range(w):
-                            if level[y][x] == 'E':
-                                set_tile(level, x, y, '.')
-                for cfg in data.get('entities', []):
-                    t = cfg.get('type', 'Enemy')
-                    if t == 'Enemy':
-                        e = Enemy.from_config(cfg)
-                        # respect id in cfg if present
-                        if 'id' in cfg:
-                            try:
-                                e.id = int(cfg.get('id'))
-                                if e.id >= self._next_id:
-                                    self._next_id = e.id + 1
-                            except Exception:
-                                pass
-                        # If level provided, try to place on a valid '.' tile
-                        if level is not None and len(level) > 0:
-                            w = len(level[0])
-                            h = len(level)
-                            ex, ey = int(e.x), int(e.y)
-
-                            def is_empty(x, y):
-                                return 0 <= x < w and 0 <= y < h and level[y][x] == '.'
-
-                            def has_free_neighbor(x, y):
-                                for dxn, dyn in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-                                    nxn, nyn = x + dxn, y + dyn
-                                    if 0 <= nxn < w and 0 <= nyn < h and level[nyn][nxn] == '.':
-                                        return True
-                                return False
-
-                            if not is_empty(ex, ey):
-                                # search for nearest '.' using increasing radius, prefer tiles with a free neighbor
+                configs = json.load(f).get('entities', [])
+        except Exception:
+            return
+        self.load_configs_with_level(configs, level=level)
+
+    def load_configs_with_level(self, configs: List[dict], level: Optional[List[str]] = None):
+        """Load entities from config dicts (enemies.json 'entities' format) with the same placement rules
+        as load_from_file_with_level; used with placements returned by utils.generate_dungeon_data.
+        """
+        try:
+            # if level provided, clear existing 'E' marks to avoid leftover static enemies
+            if level is not None and len(level) > 0:
+                for x, y in find_tiles(level, 'E'):
+                    set_tile(level, x, y, '.')
+            for cfg in configs:
+                t = cfg.get('type', 'Enemy')
+                if t == 'Enemy':
+                    e = Enemy.from_config(cfg)
+                    # respect id in cfg if present
+                    if 'id' in cfg:
+                        try:
+                            e.id = int(cfg.get('id'))
+                            if e.id >= self._next_id:
+                                self._next_id = e.id + 1
+                        except Exception:
+                            pass
+                    # If level provided, try to place on a valid '.' tile
+                    if level is not None and len(level) > 0:
+                        w = len(level[0])
+                        h = len(level)
+                        ex, ey = int(e.x), int(e.y)
+
+                        def is_empty(x, y):
+                            return 0 <= x < w and 0 <= y < h and level[y][x] == '.'
+
+                        def has_free_neighbor(x, y):
+                            for dxn, dyn in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                                nxn, nyn = x + dxn, y + dyn
+                                if 0 <= nxn < w and 0 <= nyn < h and level[nyn][nxn] == '.':
+                                    return True
+                            return False
+
+                        if not is_empty(ex, ey):
+                            # search for nearest '.' using increasing radius, prefer tiles with a free neighbor
+                            found = None
+                            found_any = None
+                            for r in range(1, max(w, h)):
+                                stop = False
+                                for dy in range(-r, r + 1):
+                                    for dx in range(-r, r + 1):
+                                        nx = ex + dx
+                                        ny = ey + dy
+                                        if is_empty(nx, ny):
+                                            # prefer tiles that have at least one free neighbor
+                                            if has_free_neighbor(nx, ny):
+                                                found = (nx, ny)
+                                                stop = True
+                                                break
+                                            if found_any is None:
+                                                found_any = (nx, ny)
+                                    if stop:
+                                        break
+                                if found:
+                                    break
+                            if not found and found_any:
+                                found = found_any
+                            if found:
+                                ex, ey = found
+                                e.x, e.y = ex, ey
+                                set_tile(level, ex, ey, 'E')
+                            else:
+                                # can't place entity, skip
+                                continue
+                        else:
+                            # tile is empty; if it has no free neighbor, try to find a better spot
+                            if not has_free_neighbor(ex, ey):
+                                # look for a nearby empty tile that has a free neighbor
                                 found = None
-                                found_any = None
                                 for r in range(1, max(w, h)):
                                     stop = False
                                     for dy in range(-r, r + 1):
                                         for dx in range(-r, r + 1):
                                             nx = ex + dx
                                             ny = ey + dy
-                                            if is_empty(nx, ny):
-                                                # prefer tiles that have at least one free neighbor
-                                                if has_free_neighbor(nx, ny):
-                                                    found = (nx, ny)
-                                                    stop = True
-                                                    break
-                                                if found_any is None:
-                                                    found_any = (nx, ny)
+                                            if is_empty(nx, ny) and has_free_neighbor(nx, ny):
+                                                found = (nx, ny)
+                                                stop = True
+                                                break
                                         if stop:
                                             break
                                     if found:
                                         break
-                                if not found and found_any:
-                                    found = found_any
                                 if found:
                                     ex, ey = found
                                     e.x, e.y = ex, ey
                                     set_tile(level, ex, ey, 'E')
                                 else:
-                                    # can't place entity, skip
-                                    continue
-                            else:
-                                # tile is empty; if it has no free neighbor, try to find a better spot
-                                if not has_free_neighbor(ex, ey):
-                                    # look for a nearby empty tile that has a free neighbor
-                                    found = None
-                                    for r in range(1, max(w, h)):
-                                        stop = False
-                                        for dy in range(-r, r + 1):
-                                            for dx in range(-r, r + 1):
-                                                nx = ex + dx
-                                                ny = ey + dy
-                                                if is_empty(nx, ny) and has_free_neighbor(nx, ny):
-                                                    found = (nx, ny)
-                                                    stop = True
-                                                    break
-                                            if stop:
-                                                break
-                                        if found:
-                                            break
-                                    if found:
-                                        ex, ey = found
-                                        e.x, e.y = ex, ey
-                                        set_tile(level, ex, ey, 'E')
-                                    else:
-                                        # accept original empty tile
-                                        set_tile(level, ex, ey, 'E')
-                                else:
-                                    # tile is empty and has free neighbor, mark it as entity
+                                    # accept original empty tile
                                     set_tile(level, ex, ey, 'E')
-                        # finally add entity to manager
-                        self.add(e)
+                            else:
+                                # tile is empty and has free neighbor, mark it as entity
+                                set_tile(level, ex, ey, 'E')
+                    # finally add entity to manager
+                    self.add(e)
         except Exception:
             pass
 
+    @profiled('ai.update')
     def update(
-        self, level: List[str], player_pos: Tuple[int, int], WIDTH: int, HEIGHT: int, move_interval_frames: int = 15
+        self,
+        level: List[str],
+        player_pos: Tuple[int, int],
+        WIDTH: int,
+        HEIGHT: int,
+        move_interval_frames: int = 15,
+        is_visible=None,
     ):
-        """Update movable entities (currently only Enemy). Returns events list."""
+        """Update movable entities (currently only Enemy). Returns events list.
+
+        is_visible(x, y): 可选的玩家视野判断，视野内的敌人总是使用完整 AI。
+        """
+        events: List[dict] = []
+
+        self._tick += 1
+        tick = self._tick
+        if self.store is not None:
+            return self._update_soa(level, player_pos, WIDTH, HEIGHT, is_visible)
+
+        # 新加入的敌人入轮：冷却累加到 move_interval 的那一帧到期
+        if self._unscheduled:
+            for ent_id, ent in self._unscheduled.items():
+                threshold = ent.enemy_stats.get('move_interval', 6)
+                due = tick + max(0, threshold - ent.move_cooldown - 1)
+                self._due[ent_id] = due
+                self._wheel.schedule(due, ent_id)
+            self._unscheduled.clear()
+        if self.use_ai_lod:
+            self._wake_dormant(player_pos, tick)
+
+        due_enemies = []
+        for ent_id in self._wheel.pop_due(tick):
+            if self._due.get(ent_id) != tick:
+                continue  # 已移除或已重新调度
+            ent = self.entities_by_id.get(ent_id)
+            if ent is None or self.entities_by_pos.get((ent.x, ent.y)) is not ent:
+                # 不在位置索引中的实体原本也不会被遍历到；重新 add 时再入轮
+                del self._due[ent_id]
+                continue
+            due_enemies.append(ent)
+        if not due_enemies:
+            return events
+        if len(due_enemies) > 1:
+            pos_seq = self._pos_seq
+            due_enemies.sort(key=lambda e: pos_seq.get(e.id, 0))
+
+        self._fix_entity_tiles(level, [(ent.x, ent.y) for ent in due_enemies])
+        self._rebuild_walkable(level)
+        self.los.begin_tick(player_pos)
+        self._fov_visible, self._fov_origin = is_visible, player_pos
+
+        # 只处理本帧到期的敌人；行动后按各自的 move_interval 重新入轮
+        for ent in due_enemies:
+            tier = self._classify_lod(ent, player_pos, is_visible)
+            if tier == 'far':
+                self._sleep(ent)
+                continue
+            self._lod_tier[ent.id] = tier
+
+            ent.move_cooldown = 0  # 重置冷却
+            next_due = tick + self._move_interval(ent, tier)
+            self._due[ent.id] = next_due
+            self._wheel.schedule(next_due, ent.id)
+
+            if tier == 'mid':
+                # 远离玩家：跳过状态机与巡逻寻路，只做随机游走
+                ent.path = []
+                action = self._get_random_move(ent, level, WIDTH, HEIGHT)
+            else:
+                # Update AI state and get next action
+                action = self._update_enemy_ai(ent, level, player_pos, WIDTH, HEIGHT)
+            self._apply_action(ent, action, level, WIDTH, HEIGHT, events)
+
+        return events
+
+    def _update_soa(self, level: List[str], player_pos: Tuple[int, int], WIDTH: int, HEIGHT: int, is_visible=None):
+        """结构数组后端的 update：调度与时间轮后端相同（store.due 保存到期帧），到期判断、唤醒、
+        AI 分级、相邻攻击与追击范围对全部敌人向量化，只有到期敌人进入逐个处理
+
+        与时间轮后端行为一致：只在到期时分级；far 休眠直到玩家进入唤醒半径，唤醒当帧即行动；
+        行动后按所在分级的间隔（mid 乘 mid_rate）重新安排到期帧。
+        """
         events: List[dict] = []
+        store = self.store
+        n = store.count
+        if n == 0:
+            return events
+        tick = self._tick
+        px, py = player_pos
+        kind = store.kind_id[:n]
+        due_at = store.due[:n]
+
+        # 新加入的敌人入轮：冷却累加到 move_interval 的那一帧到期
+        new = np.flatnonzero(due_at == store.UNSCHEDULED)
+        if len(new):
+            due_at[new] = tick + np.maximum(0, store.move_interval[kind[new]] - store.move_cd[new] - 1)
+
+        dx = np.abs(store.x[:n] - px)
+        dy = np.abs(store.y[:n] - py)
+        cheb = np.maximum(dx, dy)
+        if self.use_ai_lod and player_pos != self._lod_player_pos:
+            # 玩家移动后唤醒进入唤醒半径的休眠敌人，本帧即行动
+            self._lod_player_pos = player_pos
+            wake = (due_at == store.DORMANT) & (cheb <= store.wake_radius[kind])
+            due_at[wake] = tick
+
+        due = np.flatnonzero(due_at == tick)
+        if len(due) == 0:
+            return events
+        due = due[np.argsort(store.seq[due], kind='stable')]
+        enemies = store.enemies
+        by_pos = self.entities_by_pos
+        # 不在位置索引中的敌人原本也不会被遍历到；重新 add 时再入轮
+        positions = list(zip(store.x[due].tolist(), store.y[due].tolist()))
+        attached = [by_pos.get(pos) is enemies[row] for pos, row in zip(positions, due.tolist())]
+        if not all(attached):
+            attached = np.array(attached)
+            due_at[due[~attached]] = store.DETACHED
+            due = due[attached]
+            positions = [pos for pos, keep in zip(positions, attached) if keep]
+            if len(due) == 0:
+                return events
+
+        self._fix_entity_tiles(level, positions)
+        self._rebuild_walkable(level)
+        self.los.begin_tick(player_pos)
+        self._fov_visible, self._fov_origin = is_visible, player_pos
+
+        # 到期时才分级（视野内总是 near）；far 移出调度休眠
+        due_kind = kind[due]
+        if self.use_ai_lod:
+            due_cheb = cheb[due]
+            tier = np.where(
+                due_cheb <= store.near_radius[due_kind], 0, np.where(due_cheb <= store.wake_radius[due_kind], 1, 2)
+            ).astype(np.int8)
+            if is_visible is not None:
+                for i in np.flatnonzero(tier):
+                    if is_visible(positions[i][0], positions[i][1]):
+                        tier[i] = 0
+            store.tier[due] = tier
+            awake = tier != 2
+            if not awake.all():
+                due_at[due[~awake]] = store.DORMANT
+                due = due[awake]
+                tier = tier[awake]
+                due_kind = due_kind[awake]
+                positions = [pos for pos, keep in zip(positions, awake.tolist()) if keep]
+                if len(due) == 0:
+                    return events
+        else:
+            tier = np.zeros(len(due), dtype=np.int8)
+
+        interval = store.move_interval[due_kind] * np.where(tier == 1, store.mid_rate[due_kind], 1)
+        due_at[due] = tick + interval
+        store.move_cd[due] = 0
+
+        # near 敌人相邻即攻击，其余累加 AI 冷却并判断追击范围；mid 只做随机游走
+        distance = dx[due] + dy[due]
+        mid_due = tier == 1
+        attack = (distance == 1) & ~mid_due
+        think = due[~attack & ~mid_due]
+        ai_cd = store.ai_cd
+        ai_cd[think] += 1
+        ai_ready = np.zeros(n, dtype=bool)
+        ai_ready[think] = ai_cd[think] >= store.ai_interval[store.kind_id[think]]
+        ai_cd[think[ai_ready[think]]] = 0
+        in_range = distance <= store.chase_range[due_kind]
+        due_enemies = [enemies[row] for row in due.tolist()]
+
+        attack_l = attack.tolist()
+        mid_l = mid_due.tolist()
+        in_range_l = in_range.tolist()
+        ready_l = ai_ready[due].tolist()
+        for i, ent in enumerate(due_enemies):
+            if attack_l[i]:
+                action = {'type': 'attack', 'target': (px, py)}
+            elif mid_l[i]:
+                ent.path = []
+                action = self._get_random_move(ent, level, WIDTH, HEIGHT)
+            elif not ready_l[i]:
+                action = self._follow_path(ent)
+            else:
+                action = self._plan_enemy_move(ent, level, player_pos, WIDTH, HEIGHT, in_range_l[i])
+            self._apply_action(ent, action, level, WIDTH, HEIGHT, events)
 
+        return events
+
+    def _fix_entity_tiles(self, level: List[str], positions: List[Tuple[int, int]]) -> None:
         # Ensure map tiles reflect entity positions; fix mismatches where an entity exists but map tile isn't 'E'
+        get_tile = tile_getter(level)
         try:
-            for (ex, ey), ent in list(self.entities_by_pos.items()):
-                if 0 <= ey < len(level) and 0 <= ex < len(level[0]):
-                    if level[ey][ex] != 'E':
+            h = len(level)
+            w = len(level[0]) if h else 0
+            for ex, ey in positions:
+                if 0 <= ey < h and 0 <= ex < w:
+                    cur = get_tile(ex, ey)
+                    if cur != 'E':
                         # diagnostic and fix (use logger if available)
                         try:
-                            log_msg = f'[entity-debug] fixing map tile for entity at ({ex},{ey}) from "{level[ey][ex]}" to "E"'
-                            self._prefer_log(log_msg, level='debug')
+                            self._prefer_log(
+                                '[entity-debug] fixing map tile for entity at (%d,%d) from "%s" to "E"', ex, ey, cur, level='debug'
+                            )
                         except Exception:
                             pass
                         set_tile(level, ex, ey, 'E')
         except Exception:
             pass
 
-        # Update enemies with improved AI - 不再使用全局冷却
-        for (ex, ey), ent in list(self.entities_by_pos.items()):
-            if not isinstance(ent, Enemy):
-                continue
-            
-            # 每个敌人独立的移动冷却
-            ent.move_cooldown += 1
-            move_threshold = ent.enemy_stats.get('move_interval', 6)
-            
-            if ent.move_cooldown < move_threshold:
-                continue  # 还没到这个敌人的移动时间
-            
-            ent.move_cooldown = 0  # 重置冷却
-            
-            # Update AI state and get next action
-            action = self._update_enemy_ai(ent, level, player_pos, WIDTH, HEIGHT)
-            
-            # Process the action
-            if action['type'] == 'attack':
-                events.append({
-                    'type': 'attack', 
-                    'pos': action['target'], 
-                    'damage': ent.enemy_stats['damage'], 
-                    'attacker_id': ent.id
-                })
-            elif action['type'] == 'move':
-                success = self._move_entity(ent, action['target'], level, WIDTH, HEIGHT)
-                if not success:
-                    ent.stuck_counter += 1
-                    if ent.stuck_counter > 3:
-                        # 如果连续卡住，重新规划路径或改变状态
-                        ent.path = []
-                        ent.stuck_counter = 0
-                        if ent.state == 'chase':
-                            ent.state = 'patrol'
-                else:
+    def _apply_action(self, ent: Enemy, action: dict, level: List[str], WIDTH: int, HEIGHT: int, events: List[dict]) -> None:
+        """执行一个敌人的行动决策（攻击事件 / 移动与卡住处理）"""
+        if action['type'] == 'attack':
+            events.append({
+                'type': 'attack', 
+                'pos': action['target'], 
+                'damage': ent.enemy_stats['damage'], 
+                'attacker_id': ent.id
+            })
+        elif action['type'] == 'move':
+            success = self._move_entity(ent, action['target'], level, WIDTH, HEIGHT)
+            if not success:
+                ent.stuck_counter += 1
+                if ent.stuck_counter > 3:
+                    # 如果连续卡住，重新规划路径或改变状态
+                    ent.path = []
                     ent.stuck_counter = 0
-
-        return events
+                    if ent.state == 'chase':
+                        ent.state = 'patrol'
+            else:
+                ent.stuck_counter = 0
 
     def _update_enemy_ai(self, enemy: Enemy, level: List[str], player_pos: Tuple[int, int], WIDTH: int, HEIGHT: int) -> dict:
         """更新敌人AI逻辑，返回行动决策"""
@@ -372,8 +772,7 @@ class EntityManager:
         chase_range = enemy.enemy_stats['chase_range']
         
         # 检查是否能立即攻击玩家（攻击判断优先，无冷却）
-        attack_positions = [(ex + dx, ey + dy) for dx, dy in [(0,1), (0,-1), (1,0), (-1,0)]]
-        if (px, py) in attack_positions:
+        if distance == 1:
             return {'type': 'attack', 'target': (px, py)}
         
         # AI更新间隔控制（仅对移动和规划行为）
@@ -382,21 +781,32 @@ class EntityManager:
         
         if enemy.ai_cooldown < ai_threshold:
             # 没到AI更新时间，执行当前路径
-            if enemy.path:
-                next_pos = enemy.path[0]
-                return {'type': 'move', 'target': next_pos}
-            else:
-                return {'type': 'idle'}
+            return self._follow_path(enemy)
         
         enemy.ai_cooldown = 0
-        
+        return self._plan_enemy_move(enemy, level, player_pos, WIDTH, HEIGHT, distance <= chase_range)
+
+    def _follow_path(self, enemy: Enemy) -> dict:
+        if enemy.path:
+            next_pos = enemy.path[0]
+            return {'type': 'move', 'target': next_pos}
+        else:
+            return {'type': 'idle'}
+
+    def _plan_enemy_move(
+        self, enemy: Enemy, level: List[str], player_pos: Tuple[int, int], WIDTH: int, HEIGHT: int, in_chase_range: bool
+    ) -> dict:
+        """AI 决策帧：状态机切换并取路径的下一步"""
+        px, py = player_pos
+        ex, ey = enemy.x, enemy.y
+
         # 状态机逻辑
-        if distance <= chase_range and self._has_line_of_sight(enemy, player_pos, level, WIDTH, HEIGHT):
+        if in_chase_range and self._has_line_of_sight(enemy, player_pos, level, WIDTH, HEIGHT):
             # 进入追击状态
             enemy.state = 'chase'
             enemy.last_player_pos = (px, py)
-            # 使用寻路算法计算到玩家的路径
-            enemy.path = self._find_path((ex, ey), (px, py), level, WIDTH, HEIGHT)
+            # 沿共享距离场追击玩家（距离场外回退到 A*）
+            enemy.path = self._chase_path((ex, ey), (px, py), level, WIDTH, HEIGHT)
         elif enemy.state == 'chase' and enemy.last_player_pos:
             # 继续追击上次看到玩家的位置
             if (ex, ey) == enemy.last_player_pos:
@@ -423,64 +833,41 @@ class EntityManager:
             return self._get_random_move(enemy, level, WIDTH, HEIGHT)
 
     def _has_line_of_sight(self, enemy: Enemy, target_pos: Tuple[int, int], level: List[str], WIDTH: int, HEIGHT: int) -> bool:
-        """检查敌人到目标是否有视线"""
-        ex, ey = enemy.x, enemy.y
-        tx, ty = target_pos
-        
-        # 简单的直线视线检查
-        dx = abs(tx - ex)
-        dy = abs(ty - ey)
-        steps = max(dx, dy)
-        
-        if steps == 0:
-            return True
-        
-        x_step = (tx - ex) / steps
-        y_step = (ty - ey) / steps
-        
-        for i in range(1, steps):
-            check_x = int(ex + x_step * i)
-            check_y = int(ey + y_step * i)
-            
-            if 0 <= check_x < WIDTH and 0 <= check_y < HEIGHT:
-                if level[check_y][check_x] in ['#', 'E']:  # 墙壁或其他敌人阻挡视线
-                    return False
-            else:
-                return False
-        
-        return True
+        """检查敌人到目标是否有视线（Bresenham + 不透明掩码，墙壁或其他敌人阻挡）
 
+        目标是玩家且敌人所在格在玩家视野内时，墙壁的遮挡已由对称的玩家视野判定；玩家视野不把敌人
+        当作遮挡，因此只需再确认直线上没有其他敌人。
+        """
+        if self._fov_visible is not None and target_pos == self._fov_origin and self._fov_visible(enemy.x, enemy.y):
+            return not tile_between((enemy.x, enemy.y), target_pos, tile_getter(level), 'E')
+        return self.los.check(level, (enemy.x, enemy.y), target_pos, WIDTH, HEIGHT)
+
+    def _rebuild_walkable(self, level: List[str]) -> bytearray:
+        self._walkable = build_walkable_mask(level)
+        self._walkable_width = len(level[0]) if len(level) else 0
+        return self._walkable
+
+    def _chase_path(self, start: Tuple[int, int], player_pos: Tuple[int, int], level: List[str], WIDTH: int, HEIGHT: int) -> List[Tuple[int, int]]:
+        """追击路径：在玩家距离场上下坡行走 O(1)，距离场未覆盖起点时回退到 A*"""
+        field = self.flow_field
+        if field is not None:
+            field.ensure(level, player_pos, WIDTH, HEIGHT)
+            d = field.distance(*start)
+            if d is not None:
+                if d > self.max_path_length:
+                    return []
+                path = field.path_from(start, level, CHASE_LOOKAHEAD)
+                if path is not None:
+                    return path
+        return self._find_path(start, player_pos, level, WIDTH, HEIGHT)
+
+    @profiled('ai.pathfind')
     def _find_path(self, start: Tuple[int, int], goal: Tuple[int, int], level: List[str], WIDTH: int, HEIGHT: int) -> List[Tuple[int, int]]:
-        """使用简单BFS寻路算法"""
-        if start == goal:
-            return []
-        
-        from collections import deque
-        queue = deque([(start, [])])
-        visited = {start}
-        
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        max_path_length = 20  # 限制路径长度避免过长计算
-        
-        while queue:
-            (x, y), path = queue.popleft()
-            
-            if len(path) >= max_path_length:
-                continue
-            
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                
-                if (nx, ny) == goal:
-                    return path + [(nx, ny)]
-                
-                if (nx, ny) not in visited and 0 <= nx < WIDTH and 0 <= ny < HEIGHT:
-                    tile = level[ny][nx]
-                    if tile in ['.', '@']:  # 可以移动的格子
-                        visited.add((nx, ny))
-                        queue.append(((nx, ny), path + [(nx, ny)]))
-        
-        return []  # 没找到路径
+        """A* 寻路（父指针 + 曼哈顿启发式），深度受 max_path_length 限制"""
+        walkable = self._walkable
+        if walkable is None or self._walkable_width != WIDTH or len(walkable) != WIDTH * HEIGHT:
+            walkable = self._rebuild_walkable(level)
+        return find_path(start, goal, walkable, WIDTH, HEIGHT, self.max_path_length, self.max_path_nodes)
 
     def _generate_patrol_path(self, enemy: Enemy, level: List[str], WIDTH: int, HEIGHT: int) -> List[Tuple[int, int]]:
         """生成巡逻路径"""
@@ -488,11 +875,11 @@ class EntityManager:
         patrol_range = enemy.enemy_stats['patrol_range']
         
         # 随机选择一个巡逻目标点
-        import random
+        rng = self.rng
         attempts = 10
         for _ in range(attempts):
-            target_x = ex + random.randint(-patrol_range, patrol_range)
-            target_y = ey + random.randint(-patrol_range, patrol_range)
+            target_x = ex + rng.randint(-patrol_range, patrol_range)
+            target_y = ey + rng.randint(-patrol_range, patrol_range)
             
             if (0 <= target_x < WIDTH and 0 <= target_y < HEIGHT and 
                 level[target_y][target_x] == '.' and (target_x, target_y) != (ex, ey)):
@@ -508,8 +895,7 @@ class EntityManager:
         ex, ey = enemy.x, enemy.y
         directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
         
-        import random
-        random.shuffle(directions)
+        self.rng.shuffle(directions)
         
         for dx, dy in directions:
             nx, ny = ex + dx, ey + dy
@@ -527,16 +913,20 @@ class EntityManager:
         if not (0 <= new_x < WIDTH and 0 <= new_y < HEIGHT):
             return False
         
-        if level[new_y][new_x] != '.':
+        if tile_getter(level)(new_x, new_y) != '.':
             return False
         
         # 更新地图
         set_tile(level, old_x, old_y, '.')
         set_tile(level, new_x, new_y, 'E')
+        walkable = self._walkable
+        if walkable is not None and self._walkable_width == WIDTH and len(walkable) == WIDTH * HEIGHT:
+            walkable[old_y * WIDTH + old_x] = 1
+            walkable[new_y * WIDTH + new_x] = 0
         
         # 更新实体位置
         del self.entities_by_pos[(old_x, old_y)]
         entity.x, entity.y = new_x, new_y
-        self.entities_by_pos[(new_x, new_y)] = entity
+        self._place(entity)
         
         return True
@@ -140,7 +140,7 @@ class ErrorRecoveryManager:
         if self.logger:
             self.logger.warning(
                 f"Error in {context.operation}: {error} | " f"Severity: {severity.value} | Strategy: {strategy.value}",
-                "ERROR_RECOVERY",
+                category="ERROR_RECOVERY",
             )
 
         return strategy
@@ -255,7 +255,7 @@ class ErrorRecoveryManager:
                 if self.logger:
                     self.logger.warning(
                         f"High frequency error detected: {error_key} ({len(recent_timestamps)} times in 1 hour)",
-                        "ERROR_PATTERN",
+                        category="ERROR_PATTERN",
                     )
 
     def get_error_statistics(self) -> Dict[str, Any]:
@@ -329,75 +329,96 @@ class RobustErrorHandler:
         self._decorated_operations = weakref.WeakKeyDictionary()
 
     def safe_operation(self, operation_name: str, severity: ErrorSeverity = ErrorSeverity.MEDIUM, max_retries: int = 3):
-        """安全操作装饰器"""
+        """安全操作装饰器
+
+        正常路径只有一层 try；ErrorContext（含调用栈采集）仅在异常发生后才创建。
+        """
 
         def decorator(func):
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                context = ErrorContext(operation_name, severity)
-                context.max_retries = max_retries
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    return self._recover(func, operation_name, severity, max_retries, e, args, kwargs)
 
-                # 添加函数参数到上下文
-                context.add_system_info(
-                    function_name=func.__name__, args_count=len(args), kwargs_keys=list(kwargs.keys())
-                )
+            return wrapper
 
-                while context.retry_count <= context.max_retries:
-                    try:
-                        result = func(*args, **kwargs)
-
-                        # 如果之前有错误，记录成功恢复
-                        if context.retry_count > 0 and self.logger:
-                            self.logger.info(
-                                f"Operation {operation_name} recovered after {context.retry_count} retries"
-                            )
-
-                        return result
-
-                    except Exception as e:
-                        strategy = self.recovery_manager.handle_error(e, context)
-
-                        if strategy == RecoveryStrategy.TERMINATE:
-                            raise e
-                        elif strategy == RecoveryStrategy.SKIP:
-                            if self.logger:
-                                self.logger.debug(f"Skipping operation {operation_name} due to error: {e}")
-                            return None
-                        elif strategy == RecoveryStrategy.FALLBACK:
-                            fallback = self.recovery_manager.fallback_operations.get(operation_name)
-                            if fallback:
-                                try:
-                                    return fallback(*args, **kwargs)
-                                except Exception as fallback_error:
-                                    if self.logger:
-                                        self.logger.error(f"Fallback failed for {operation_name}: {fallback_error}")
-                                    return None
-                            else:
-                                if self.logger:
-                                    self.logger.warning(f"No fallback available for {operation_name}")
-                                return None
-                        elif strategy == RecoveryStrategy.RETRY:
-                            context.retry_count += 1
-                            if context.retry_count <= context.max_retries:
-                                time.sleep(0.1 * context.retry_count)  # 指数退避
-                                continue
-                            else:
-                                if self.logger:
-                                    self.logger.error(f"Max retries exceeded for {operation_name}")
-                                return None
-                        else:
-                            return None
+        return decorator
 
+    def _recover(
+        self,
+        func: Callable,
+        operation_name: str,
+        severity: ErrorSeverity,
+        max_retries: int,
+        error: Exception,
+        args: tuple,
+        kwargs: dict,
+    ):
+        """异常发生后的恢复流程（慢路径）：创建上下文、选择策略、重试/回退"""
+        context = ErrorContext(operation_name, severity)
+        context.max_retries = max_retries
+
+        # 添加函数参数到上下文
+        context.add_system_info(
+            function_name=getattr(func, '__name__', repr(func)), args_count=len(args), kwargs_keys=list(kwargs.keys())
+        )
+
+        while True:
+            strategy = self.recovery_manager.handle_error(error, context)
+
+            if strategy == RecoveryStrategy.TERMINATE:
+                raise error
+            elif strategy == RecoveryStrategy.SKIP:
+                if self.logger:
+                    self.logger.debug(f"Skipping operation {operation_name} due to error: {error}")
                 return None
+            elif strategy == RecoveryStrategy.FALLBACK:
+                fallback = self.recovery_manager.fallback_operations.get(operation_name)
+                if fallback:
+                    try:
+                        return fallback(*args, **kwargs)
+                    except Exception as fallback_error:
+                        if self.logger:
+                            self.logger.error(f"Fallback failed for {operation_name}: {fallback_error}")
+                        return None
+                else:
+                    if self.logger:
+                        self.logger.warning(f"No fallback available for {operation_name}")
+                    return None
+            elif strategy == RecoveryStrategy.RETRY:
+                context.retry_count += 1
+                if context.retry_count > context.max_retries:
+                    if self.logger:
+                        self.logger.error(f"Max retries exceeded for {operation_name}")
+                    return None
+                time.sleep(0.1 * context.retry_count)  # 指数退避
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    error = e
+                    continue
 
-            return wrapper
-
-        return decorator
+                # 之前有错误，记录成功恢复
+                if self.logger:
+                    self.logger.info(f"Operation {operation_name} recovered after {context.retry_count} retries")
+                return result
+            else:
+                return None
 
     def safe_call(self, func: Callable, operation_name: str, *args, **kwargs):
-        """安全调用函数"""
-        decorated_func = self.safe_operation(operation_name)(func)
-        return decorated_func(*args, **kwargs)
+        """安全调用函数（不再每次构造装饰器，异常时才进入恢复流程）"""
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            return self._recover(func, operation_name, ErrorSeverity.MEDIUM, 3, e, args, kwargs)
+
+    def guard(
+        self, func: Callable, operation_name: str, severity: ErrorSeverity = ErrorSeverity.MEDIUM, max_retries: int = 3
+    ) -> Callable:
+        """预绑定的安全调用：包装器只构建一次，适合在主循环中每帧重复调用"""
+        return self.safe_operation(operation_name, severity, max_retries)(func)
 
     def register_fallback(self, operation_name: str, fallback_func: Callable):
         """注册备用操作"""
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+"""
+下一层预生成 (Floor Prefetch)
+进入第 N 层后立即在后台线程生成第 N+1 层；楼层切换时若参数一致则直接取用结果，
+否则回退到主线程同步生成。生成是纯计算（不写文件），丢弃的任务不等待，由守护线程自行结束。
+"""
+
+
+class _PrefetchJob:
+    """一次后台生成任务"""
+
+    def __init__(self, floor_number: int, params: Dict[str, Any]):
+        self.floor_number = floor_number
+        self.params = dict(params)
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+
+class FloorPrefetcher:
+    """后台生成下一层地图，并统计命中率与等待时间
+
+    同一时间最多一个任务；generate_fn(params) 在工作线程中执行，返回生成好的地图。
+    """
+
+    def __init__(self, generate_fn: Callable[[Dict[str, Any]], Any]):
+        self.generate_fn = generate_fn
+        self._job: Optional[_PrefetchJob] = None
+
+        # 统计
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.waits = 0
+        self.total_wait_ms = 0.0
+        self.last_wait_ms = 0.0
+
+    def start(self, floor_number: int, params: Dict[str, Any]) -> None:
+        """开始预生成 floor_number 层；已有同参数任务时不重复启动"""
+        job = self._job
+        if job is not None and job.floor_number == floor_number and job.params == params:
+            return
+        self.cancel()
+
+        job = _PrefetchJob(floor_number, params)
+        job.thread = threading.Thread(
+            target=self._run, args=(job,), name=f'floor-prefetch-{floor_number}', daemon=True
+        )
+        self._job = job
+        self.started += 1
+        job.thread.start()
+
+    def _run(self, job: _PrefetchJob) -> None:
+        try:
+            job.result = self.generate_fn(job.params)
+        except Exception as e:
+            job.error = e
+        finally:
+            job.done.set()
+
+    def take(self, floor_number: int, params: Dict[str, Any]) -> Optional[Any]:
+        """取出与 (floor_number, params) 匹配的预生成结果；没有可用结果时返回 None（调用方同步生成）
+
+        任务仍在运行时会等待其完成：剩余时间总是短于从头同步生成。
+        """
+        job = self._job
+        self._job = None
+        if job is None or job.floor_number != floor_number or job.params != params:
+            if job is not None:
+                self._discard(job)
+            self.misses += 1
+            return None
+
+        if not job.done.is_set():
+            start = time.perf_counter()
+            job.done.wait()
+            self.last_wait_ms = (time.perf_counter() - start) * 1000
+            self.total_wait_ms += self.last_wait_ms
+            self.waits += 1
+        else:
+            self.last_wait_ms = 0.0
+
+        if job.error is not None or job.result is None:
+            self.failures += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return job.result
+
+    def cancel(self) -> None:
+        """丢弃当前任务（不等待；工作线程的结果随任务对象一起回收）"""
+        job = self._job
+        self._job = None
+        if job is not None:
+            self._discard(job)
+
+    def _discard(self, job: _PrefetchJob) -> None:
+        self.cancelled += 1
+
+    @property
+    def pending_floor(self) -> Optional[int]:
+        return self._job.floor_number if self._job is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """预生成统计，供 PerformanceOptimizer.get_stats 汇总"""
+        total = self.hits + self.misses
+        return {
+            'started': self.started,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+            'failures': self.failures,
+            'cancelled': self.cancelled,
+            'waits': self.waits,
+            'last_wait_ms': self.last_wait_ms,
+            'avg_wait_ms': (self.total_wait_ms / self.waits) if self.waits else 0.0,
+            'pending_floor': self.pending_floor,
+        }
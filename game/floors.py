@@ -3,6 +3,9 @@ import time
 from typing import List, Optional, Tuple
 from game import utils, entities, dialogs as dialogs_mod
 from .log_utils import safe_log
+from .tile_grid import TileGrid, as_tile_grid, find_tiles
+from .floor_prefetch import FloorPrefetcher
+from .artifact_writer import get_artifact_writer
 
 """
 Floor management and generation
@@ -16,12 +19,22 @@ class FloorManager:
     def __init__(self, config, game_state):
         self.config = config
         self.game_state = game_state
-
-    def _prefer_log(self, msg: str, level: str = 'info'):
-        safe_log(getattr(self, 'logger', None), getattr(self, 'game_state', None), msg, level=level, channel='FLOOR')
+        # 下一层后台预生成（config.floor_prefetch 关闭时为 None）
+        self.prefetcher = None
+        if bool(getattr(config, 'floor_prefetch', False)):
+            self.prefetcher = FloorPrefetcher(self._generate_floor)
+        # 为预生成提前确定的楼层种子 {floor_number: seed}
+        self._reserved_seeds = {}
+        # generate_initial_level 的生成结果（敌人放置与种子），由随后的 setup_level 取用
+        self._initial_result = None
+
+    def _prefer_log(self, msg, *args, level: str = 'info'):
+        safe_log(getattr(self, 'logger', None), getattr(self, 'game_state', None), msg, *args, level=level, channel='FLOOR')
 
     def generate_initial_level(self) -> List[str]:
         """Generate the initial level based on configuration"""
+        # 新游戏：丢弃上一局的预生成结果
+        self.cancel_prefetch()
         if self.config.regen:
             try:
                 self._prefer_log('[FloorManager] --regen flag detected: forcing dungeon regeneration', level='info')
@@ -30,33 +43,132 @@ class FloorManager:
                     print('[FloorManager] --regen flag detected: forcing dungeon regeneration')
                 except Exception:
                     pass
-            from .utils import get_seed
-            return utils.generate_dungeon(self.config.map_width, self.config.map_height, seed=get_seed())
+            return self._use_generated(
+                utils.generate_dungeon_data(
+                    self.config.map_width, self.config.map_height, seed=self.floor_seed(1), **self._generator_options()
+                )
+            )
         else:
             # If user specified map dimensions, generate new map
             if hasattr(self.config, 'map_w') or hasattr(self.config, 'map_h'):
-                return utils.generate_dungeon(self.config.map_width, self.config.map_height)
+                return self._use_generated(
+                    utils.generate_dungeon_data(
+                        self.config.map_width,
+                        self.config.map_height,
+                        seed=self.floor_seed(1),
+                        **self._generator_options(),
+                    )
+                )
             else:
                 # Try to load from external file, fallback to generation
-                return utils.load_level(None)
+                level = utils.load_level_file()
+                if level is not None:
+                    # 外部地图：敌人放置来自 data/enemies.json
+                    self._initial_result = None
+                    return level
+                # 与 utils.load_level 的回退尺寸一致；敌人放置直接交给 setup_level，不经过 enemies.json
+                return self._use_generated(
+                    utils.generate_dungeon_data(24, 9, seed=self.floor_seed(1), **self._generator_options())
+                )
+
+    def _use_generated(self, result) -> List[str]:
+        """Keep a generated initial level's result for setup_level and queue its artifacts"""
+        self._initial_result = result
+        utils.write_dungeon_artifacts(result)
+        return result.level
+
+    def _generator_options(self) -> dict:
+        """Generator switches taken from config (carving backend, legacy room connection)"""
+        return {
+            'backend': getattr(self.config, 'generator_backend', 'python') or 'python',
+            'legacy_connect': bool(getattr(self.config, 'legacy_room_connect', False)),
+        }
+
+    def floor_seed(self, floor_number: int) -> int:
+        """Seed for floor_number; reuses the seed reserved by prefetch_next_floor if any"""
+        if floor_number in self._reserved_seeds:
+            return self._reserved_seeds.pop(floor_number)
+        if self.config.seed is None:
+            return utils.get_seed()
+        try:
+            return int(self.config.seed) + floor_number
+        except Exception:
+            return utils.get_seed()
 
-    def setup_level(self, level: List[str]):
-        """Setup a level with entities and NPCs"""
+    def prefetch_next_floor(self):
+        """Start generating the floor after the current one in the background"""
+        if self.prefetcher is None:
+            return
+        try:
+            next_floor = self.game_state.floor_number + 1
+            self._reserved_seeds = {}
+            gen_seed = self.floor_seed(next_floor)
+            self._reserved_seeds[next_floor] = gen_seed
+            self.prefetcher.start(next_floor, self.game_state.floor_params(next_floor, gen_seed))
+        except Exception as e:
+            self._prefer_log(f'[FloorManager] floor prefetch failed to start: {e}', level='warning')
+
+    def cancel_prefetch(self):
+        """Drop any pending prefetch and reserved seeds"""
+        self._reserved_seeds = {}
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+
+    def _generate_floor(self, params: dict) -> utils.DungeonResult:
+        """Generate a floor from transition parameters (runs on the prefetch thread or synchronously)
+
+        Pure: no files are written here, artifacts are queued once the floor is actually used.
+        """
+        result = utils.generate_dungeon_data(
+            params.get('width', self.config.map_width),
+            params.get('height', self.config.map_height),
+            room_attempts=params.get('rooms', self.config.rooms),
+            num_enemies=params.get('enemies', self.config.enemies),
+            seed=params.get('seed'),
+            min_room=params.get('min_room', self.config.min_room),
+            max_room=params.get('max_room', self.config.max_room),
+            corridor_radius=params.get('corridor_radius', self.config.corridor_radius),
+            **self._generator_options(),
+        )
+        return result._replace(level=as_tile_grid(result.level))
+
+    def setup_level(self, level: List[str], enemies: Optional[List[dict]] = None, seed: Optional[int] = None):
+        """Setup a level with entities and NPCs
+
+        enemies: placements from utils.generate_dungeon_data; when omitted, placements kept by
+        generate_initial_level are used, and data/enemies.json only for an external data/level.txt map.
+        seed: floor seed; the enemy AI random stream is derived from it.
+        """
         self.game_state.set_level(level)
+        # 之后的写入都作用在 GameState 持有的 TileGrid 上
+        level = self.game_state.level
+
+        if enemies is None and self._initial_result is not None:
+            enemies, seed = self._initial_result.enemies, self._initial_result.seed
+        self._initial_result = None
 
         # Setup entity manager
-        entity_mgr = entities.EntityManager()
-        enemies_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'enemies.json')
-
-        # Clear existing 'E' marks if enemies file exists
-        if os.path.exists(enemies_path):
-            for y, row in enumerate(level):
-                for x, ch in enumerate(row):
-                    if ch == 'E':
-                        utils.set_tile(level, x, y, '.')
-
-        # Load entities
-        entity_mgr.load_from_file_with_level(enemies_path, level=level)
+        entity_mgr = entities.EntityManager(
+            rng=utils.make_rng(seed, 'ai'),
+            max_path_length=int(getattr(self.config, 'max_path_length', 20) or 20),
+            use_ai_lod=bool(getattr(self.config, 'ai_lod', True)),
+            backend=getattr(self.config, 'enemy_backend', 'objects') or 'objects',
+        )
+
+        if enemies is not None:
+            entity_mgr.load_configs_with_level(enemies, level=level)
+        else:
+            # 排队中的 enemies.json 先落盘再读取
+            get_artifact_writer().flush()
+            enemies_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'enemies.json')
+
+            # Clear existing 'E' marks if enemies file exists
+            if os.path.exists(enemies_path):
+                for x, y in find_tiles(level, 'E'):
+                    utils.set_tile(level, x, y, '.')
+
+            # Load entities
+            entity_mgr.load_from_file_with_level(enemies_path, level=level)
         if not any(isinstance(e, entities.Enemy) for e in entity_mgr.entities_by_id.values()):
             entity_mgr.load_from_level(level)
             entity_mgr.place_entity_near(level, self.game_state.width, self.game_state.height)
@@ -92,6 +204,8 @@ class FloorManager:
 
     def find_player(self, level: List[str]) -> Optional[Tuple[int, int]]:
         """Find player position in level"""
+        if isinstance(level, TileGrid):
+            return level.find('@')
         for y, row in enumerate(level):
             x = row.find("@")
             if x != -1:
@@ -115,30 +229,25 @@ class FloorManager:
             floor_number = params.get('floor', 2)
             gen_width = params.get('width', self.config.map_width)
             gen_height = params.get('height', self.config.map_height)
-            gen_rooms = params.get('rooms', self.config.rooms)
-            gen_enemies = params.get('enemies', self.config.enemies)
-            gen_min_room = params.get('min_room', self.config.min_room)
-            gen_max_room = params.get('max_room', self.config.max_room)
-            gen_corridor_radius = params.get('corridor_radius', self.config.corridor_radius)
-
-            self.game_state.write_exit_log(
-                f'Generating floor {floor_number} with seed {gen_seed}, size {gen_width}x{gen_height}'
-            )
 
-            # Generate new level
-            level = utils.generate_dungeon(
-                gen_width,
-                gen_height,
-                room_attempts=gen_rooms,
-                num_enemies=gen_enemies,
-                seed=gen_seed,
-                min_room=gen_min_room,
-                max_room=gen_max_room,
-                corridor_radius=gen_corridor_radius,
-            )
+            result = None
+            if self.prefetcher is not None:
+                result = self.prefetcher.take(floor_number, params)
+            if result is not None:
+                self.game_state.write_exit_log(
+                    f'Using prefetched floor {floor_number} with seed {gen_seed} '
+                    f'(waited {self.prefetcher.last_wait_ms:.1f} ms)'
+                )
+            else:
+                self.game_state.write_exit_log(
+                    f'Generating floor {floor_number} with seed {gen_seed}, size {gen_width}x{gen_height}'
+                )
+                result = self._generate_floor(params)
+            utils.write_dungeon_artifacts(result)
 
             # Setup the level
-            entity_mgr, npcs = self.setup_level(level)
+            entity_mgr, npcs = self.setup_level(result.level, enemies=result.enemies, seed=result.seed)
+            level = self.game_state.level
 
             # Write debug snapshots
             self._write_floor_snapshots(level, floor_number)
@@ -148,6 +257,7 @@ class FloorManager:
 
             # Complete transition
             self.game_state.complete_floor_transition()
+            self.prefetch_next_floor()
 
             return level, entity_mgr, npcs, new_pos
 
@@ -157,47 +267,33 @@ class FloorManager:
             return None, None, None, None
 
     def _write_floor_snapshots(self, level: List[str], floor_number: int):
-        """Write debug snapshots for the floor"""
+        """Queue debug snapshots for the floor on the background artifact writer"""
+        writer = get_artifact_writer()
+        if not writer.enabled:
+            return
         # Find player position
         new_pos = self.find_player(level)
-
-        try:
-            dbg_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'debug', 'maps')
-            os.makedirs(dbg_dir, exist_ok=True)
-
-            # Pre-entities snapshot
-            dbg_path = os.path.join(dbg_dir, f'last_level_floor_{floor_number}.txt')
-            with open(dbg_path, 'w', encoding='utf-8') as df:
-                df.write('\n'.join(level))
-                df.write('\n\n')
-                df.write(f'floor={floor_number} exit_pos={self.game_state.exit_pos} player_pos={new_pos}\n')
-            self.game_state.write_exit_log(f'Wrote floor snapshot: {dbg_path}')
-
-        except Exception as e:
-            self.game_state.write_exit_log(f'Failed to write floor snapshot: {e}')
-
-        try:
-            # Post-entities snapshot
-            dbg_path2 = os.path.join(dbg_dir, f'last_level_floor_{floor_number}_after_entities.txt')
-            with open(dbg_path2, 'w', encoding='utf-8') as df2:
-                df2.write('\n'.join(level))
-                df2.write('\n\n')
-                df2.write(f'floor={floor_number} exit_pos={self.game_state.exit_pos} player_pos={new_pos}\n')
-            self.game_state.write_exit_log(f'Wrote post-entity floor snapshot: {dbg_path2}')
-
-        except Exception as e:
-            self.game_state.write_exit_log(f'Failed to write post-entity floor snapshot: {e}')
+        # 快照内容在主线程捕获，之后地图的修改不影响写出的内容
+        snapshot = '\n'.join(level) + '\n\n'
+        footer = f'floor={floor_number} exit_pos={self.game_state.exit_pos} player_pos={new_pos}\n'
+
+        dbg_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'debug', 'maps')
+        # Pre-entities snapshot
+        dbg_path = os.path.join(dbg_dir, f'last_level_floor_{floor_number}.txt')
+        writer.write_text(dbg_path, snapshot + footer)
+        # Post-entities snapshot
+        dbg_path2 = os.path.join(dbg_dir, f'last_level_floor_{floor_number}_after_entities.txt')
+        writer.write_text(dbg_path2, snapshot + footer)
+        self.game_state.write_exit_log(f'Queued floor snapshots: {dbg_path}, {dbg_path2}')
 
     def write_initial_snapshot(self, level: List[str]):
-        """Write snapshot for the initial floor"""
+        """Queue the snapshot for the initial floor"""
         try:
             player_pos = self.find_player(level)
             dbg_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'debug', 'maps')
-            os.makedirs(dbg_dir, exist_ok=True)
-            dbg_path = os.path.join(dbg_dir, f'last_level_floor_1.txt')
-            with open(dbg_path, 'w', encoding='utf-8') as df:
-                df.write('\n'.join(level))
-                df.write('\n\n')
-                df.write(f'exit_pos={self.game_state.exit_pos} player_pos={player_pos}\n')
+            get_artifact_writer().write_text(
+                os.path.join(dbg_dir, 'last_level_floor_1.txt'),
+                '\n'.join(level) + '\n\n' + f'exit_pos={self.game_state.exit_pos} player_pos={player_pos}\n',
+            )
         except Exception:
             pass
@@ -0,0 +1,161 @@
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from .pathfinding import build_walkable_mask
+from .tile_grid import tile_getter
+from .utils import add_tile_listener
+
+"""
+玩家距离场 (Flow Field)
+以玩家位置为源做一次有界 BFS（均匀权重的 Dijkstra），所有追击中的敌人沿距离递减方向走，
+每个敌人只需 O(路径长度) 的下坡行走，而不是各自做一次搜索。
+仅在玩家移动或地形（墙/地面）变化时重算。
+"""
+
+
+Position = Tuple[int, int]
+
+# 距离场内可通过的瓦片：敌人只是暂时占位，不视为地形
+FLOW_PASSABLE_TILES = '.@E'
+# 下坡行走时优先选择的实时空闲格
+_FREE_TILES = ('.', '@')
+_DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+class FlowField:
+    """以 origin 为源、半径 max_distance 的距离场"""
+
+    def __init__(self, max_distance: int, passable: str = FLOW_PASSABLE_TILES):
+        self.max_distance = max_distance
+        self.passable = passable
+        self.origin: Optional[Position] = None
+        self.width = 0
+        self.height = 0
+        self._level: Any = None
+        self._dist: Dict[int, int] = {}
+        self._valid = False
+
+        # 统计
+        self.recomputes = 0
+        self.invalidations = 0
+
+        # 地形变化时失效（弱引用，随本对象回收）
+        add_tile_listener(self.on_tile_changed)
+
+    def ensure(self, level, origin: Position, width: int, height: int) -> bool:
+        """保证距离场以 origin 为源且与当前地形一致；发生重算时返回 True"""
+        if self._valid and origin == self.origin and level is self._level and width == self.width:
+            return False
+        self._compute(level, origin, width, height)
+        return True
+
+    def invalidate(self) -> None:
+        if self._valid:
+            self._valid = False
+            self.invalidations += 1
+
+    def on_tile_changed(self, level, x: int, y: int) -> None:
+        """set_tile 监听：半径内某格在“可通过/不可通过”之间切换时失效"""
+        if not self._valid or level is not self._level or self.origin is None:
+            return
+        ox, oy = self.origin
+        if abs(x - ox) + abs(y - oy) > self.max_distance:
+            return
+        passable = tile_getter(level)(x, y) in self.passable
+        if passable != ((y * self.width + x) in self._dist):
+            self.invalidate()
+
+    def _compute(self, level, origin: Position, width: int, height: int) -> None:
+        self._level = level
+        self.origin = origin
+        self.width = width
+        self.height = height
+        self.recomputes += 1
+        self._valid = True
+
+        ox, oy = origin
+        dist: Dict[int, int] = {}
+        self._dist = dist
+        if not (0 <= ox < width and 0 <= oy < height):
+            return
+        mask = build_walkable_mask(level, self.passable)
+        start = oy * width + ox
+        dist[start] = 0
+        max_distance = self.max_distance
+        queue = deque([start])
+        while queue:
+            idx = queue.popleft()
+            d = dist[idx]
+            if d >= max_distance:
+                continue
+            x = idx % width
+            y = idx // width
+            nd = d + 1
+            if y + 1 < height:
+                n = idx + width
+                if mask[n] and n not in dist:
+                    dist[n] = nd
+                    queue.append(n)
+            if y > 0:
+                n = idx - width
+                if mask[n] and n not in dist:
+                    dist[n] = nd
+                    queue.append(n)
+            if x + 1 < width:
+                n = idx + 1
+                if mask[n] and n not in dist:
+                    dist[n] = nd
+                    queue.append(n)
+            if x > 0:
+                n = idx - 1
+                if mask[n] and n not in dist:
+                    dist[n] = nd
+                    queue.append(n)
+
+    def distance(self, x: int, y: int) -> Optional[int]:
+        """(x, y) 到源点的步数；超出半径或不可达时为 None"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        return self._dist.get(y * self.width + x)
+
+    def path_from(self, start: Position, level, max_steps: Optional[int] = None) -> Optional[List[Position]]:
+        """沿距离递减方向从 start 走到源点，返回不含起点、含源点的路径
+
+        每一步在距离减一的邻格中优先选择当前空闲的格子；start 不在距离场内时返回 None。
+        """
+        dist = self._dist
+        width = self.width
+        height = self.height
+        x, y = start
+        if not (0 <= x < width and 0 <= y < height):
+            return None
+        d = dist.get(y * width + x)
+        if d is None:
+            return None
+        get_tile = tile_getter(level)
+        path: List[Position] = []
+        limit = d if max_steps is None else min(d, max_steps)
+        while d > 0 and len(path) < limit:
+            best = None
+            for dx, dy in _DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and dist.get(ny * width + nx) == d - 1:
+                    if get_tile(nx, ny) in _FREE_TILES:
+                        best = (nx, ny)
+                        break
+                    if best is None:
+                        best = (nx, ny)
+            if best is None:
+                return None  # 距离场已过期
+            x, y = best
+            d -= 1
+            path.append(best)
+        return path
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'origin': self.origin,
+            'cells': len(self._dist),
+            'recomputes': self.recomputes,
+            'invalidations': self.invalidations,
+        }
@@ -1,15 +1,129 @@
-import math
-from typing import List, Set, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Set, Tuple
+
+from .profiler import profiled
+from .tile_grid import tile_getter
+from .utils import add_tile_listener
 
 """
-基础视野系统 (Field of View)
-实现简单的圆形视野计算，后续可以扩展为更复杂的视线系统
+视野系统 (Field of View)
+对称递归阴影投射（symmetric shadowcasting）：四个象限各覆盖两个八分区，逐行扫描并以整数分数表示斜率；
+墙壁遮挡视线，两块地面互相可见当且仅当对称。视野圆的每行半宽按半径预先计算，不在逐格循环中开方。
+结果按 (地图, 玩家位置, 视野半径, 地形版本) 缓存；重算时顺带得出进入/离开视野的格子（FOVDelta），
+渲染层据此增量更新雾化。
 """
 
 
+# 阻挡玩家视线的瓦片
+OPAQUE_TILES = '#'
+
+# 状态网格取值（与 TileVisibility 一致）
+_EXPLORED = 1
+_VISIBLE = 2
+# 重算过程中的临时标记：本次已可见
+_REVEALED = 3
+
+# 象限变换：(col 对 x 的系数, depth 对 x 的系数, col 对 y 的系数, depth 对 y 的系数)
+_QUADRANTS = (
+    (1, 0, 0, -1),  # 北
+    (1, 0, 0, 1),  # 南
+    (0, 1, 1, 0),  # 东
+    (0, -1, 1, 0),  # 西
+)
+
+
+@lru_cache(maxsize=32)
+def circle_extents(radius: int) -> Tuple[int, ...]:
+    """ext[d] = 满足 d² + c² <= r² 的最大 |c|（d = 0..r），即半径 r 的圆在第 d 行的半宽"""
+    r2 = radius * radius
+    ext = []
+    c = radius
+    for d in range(radius + 1):
+        while c > 0 and d * d + c * c > r2:
+            c -= 1
+        ext.append(c)
+    return tuple(ext)
+
+
+def shadowcast(
+    origin: Tuple[int, int],
+    radius: int,
+    is_opaque: Callable[[int, int], bool],
+    reveal: Callable[[int, int], None],
+) -> None:
+    """从 origin 出发做对称阴影投射，对半径内每个可见格调用 reveal(x, y)
+
+    is_opaque 对越界坐标应返回 True；reveal 负责过滤越界坐标。
+    """
+    ox, oy = origin
+    reveal(ox, oy)
+    if radius <= 0:
+        return
+    ext = circle_extents(radius)
+    for cx, rx, cy, ry in _QUADRANTS:
+        # 行: (深度, 起始斜率分子, 分母, 结束斜率分子, 分母)
+        rows = [(1, -1, 1, 1, 1)]
+        while rows:
+            depth, sn, sd, en, ed = rows.pop()
+            lim = ext[depth]
+            # round_ties_up(depth * start) / round_ties_down(depth * end)，截到视野圆内
+            min_col = max(-lim, (2 * depth * sn + sd) // (2 * sd))
+            max_col = min(lim, -((ed - 2 * depth * en) // (2 * ed)))
+            if min_col > max_col:
+                continue
+            bx = ox + depth * rx
+            by = oy + depth * ry
+            prev_wall = None
+            for col in range(min_col, max_col + 1):
+                x = bx + col * cx
+                y = by + col * cy
+                wall = is_opaque(x, y)
+                # 墙总是可见；地面仅当格心落在可见斜率范围内（保证对称）
+                if wall or (col * sd >= depth * sn and col * ed <= depth * en):
+                    reveal(x, y)
+                if prev_wall and not wall:
+                    sn, sd = 2 * col - 1, 2 * depth
+                elif prev_wall is False and wall and depth < radius:
+                    rows.append((depth + 1, sn, sd, 2 * col - 1, 2 * depth))
+                prev_wall = wall
+            if prev_wall is False and depth < radius:
+                rows.append((depth + 1, sn, sd, en, ed))
+
+
+class FOVDelta(NamedTuple):
+    """一次视野重算相对上一次的变化"""
+
+    entered: List[Tuple[int, int]]  # 新进入视野
+    left: List[Tuple[int, int]]  # 离开视野（变为已探索）
+
+
+class ExploredTiles:
+    """已探索格的只读视图：直接读取 FOVSystem 的状态网格，不复制"""
+
+    __slots__ = ('_fov',)
+
+    def __init__(self, fov_system: 'FOVSystem'):
+        self._fov = fov_system
+
+    def __len__(self) -> int:
+        return self._fov.explored_count
+
+    def __contains__(self, pos) -> bool:
+        return self._fov.is_explored(*pos)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        width = self._fov.width
+        for i, state in enumerate(self._fov.tile_state):
+            if state:
+                yield i % width, i // width
+
 
 class FOVSystem:
-    """基础视野系统类"""
+    """基础视野系统类
+
+    探索记录保存在与地图同尺寸的 uint8 网格 tile_state 中（取值同 TileVisibility：
+    0 未探索 / 1 已探索 / 2 当前可见），400x200 的地图只占 80KB。
+    """
 
     def __init__(self, sight_radius: int = 6):
         """
@@ -19,12 +133,64 @@ class FOVSystem:
             sight_radius: 玩家视野半径（以瓦片为单位）
         """
         self.sight_radius = sight_radius
+        # 当前可见格（每次重算替换为新集合，不原地修改）
         self.visible_tiles: Set[Tuple[int, int]] = set()
-        self.previously_seen: Set[Tuple[int, int]] = set()
-
+        self.tile_state = bytearray()
+        self.width = 0
+        self.height = 0
+        self.explored_count = 0
+        self._visible_indices: List[int] = []
+        self._explored_view = ExploredTiles(self)
+
+        # 变更跟踪：version 每次视野实际变化时加一，last_delta 为最近一次的变化
+        self.version = 0
+        self.last_delta = FOVDelta([], [])
+        self.terrain_version = 0
+        self._level: Any = None
+        self._key = None
+        self._visible_walls: Set[int] = set()
+
+        # 统计
+        self.hits = 0
+        self.recomputes = 0
+
+        # 墙体变化时使缓存失效（弱引用，随本对象回收）
+        add_tile_listener(self.on_tile_changed)
+
+    @property
+    def previously_seen(self) -> ExploredTiles:
+        """已探索格（只读视图）"""
+        return self._explored_view
+
+    def _resize(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.tile_state = bytearray(width * height)
+        self.explored_count = 0
+        self._visible_indices = []
+        self._key = None
+
+    def on_tile_changed(self, level, x: int, y: int) -> None:
+        """set_tile 监听：上次视野半径方框内某格在透明/不透明之间切换时提升地形版本
+
+        对称规则下，扫描到但未显示的地面格变成墙后也会显示并投下阴影，因此不能只看当前可见格。
+        _visible_walls 记录上次扫描到的全部墙，方框内未扫描的格子新砌墙时会多重算一次，结果仍正确。
+        """
+        key = self._key
+        if key is None or level is not self._level or not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        ox, oy, radius = key[0], key[1], key[2]
+        if abs(x - ox) > radius or abs(y - oy) > radius:
+            return
+        if (tile_getter(level)(x, y) in OPAQUE_TILES) != (y * self.width + x in self._visible_walls):
+            self.terrain_version += 1
+
+    @profiled('fov.calculate')
     def calculate_fov(self, player_x: int, player_y: int, level: List[str]) -> Set[Tuple[int, int]]:
         """
-        计算玩家当前可见的所有瓦片
+        计算玩家当前可见的所有瓦片（墙壁遮挡视线）
+
+        位置、半径与地形均未变化时直接返回上次结果；否则重算并在 last_delta 中记录进出视野的格子。
 
         Args:
             player_x: 玩家X坐标
@@ -34,30 +200,71 @@ class FOVSystem:
         Returns:
             可见瓦片坐标的集合
         """
-        visible = set()
+        height = len(level) if level else 0
+        width = len(level[0]) if height else 0
+        if width != self.width or height != self.height:
+            self._resize(width, height)
+        if level is not self._level:
+            self._level = level
+            self._key = None
+
+        key = (player_x, player_y, self.sight_radius, self.terrain_version)
+        if key == self._key:
+            self.hits += 1
+            return self.visible_tiles
+        self._key = key
+        self.recomputes += 1
+
+        state = self.tile_state
+        entered: List[Tuple[int, int]] = []
+        visible: Set[Tuple[int, int]] = set()
+        indices: List[int] = []
+        walls: Set[int] = set()
+        newly_explored = 0
+        get_tile = tile_getter(level)
+
+        def is_opaque(x: int, y: int) -> bool:
+            if not (0 <= x < width and 0 <= y < height):
+                return True
+            if get_tile(x, y) in OPAQUE_TILES:
+                walls.add(y * width + x)
+                return True
+            return False
+
+        def reveal(x: int, y: int) -> None:
+            nonlocal newly_explored
+            if 0 <= x < width and 0 <= y < height:
+                i = y * width + x
+                s = state[i]
+                if s == _REVEALED:
+                    return
+                if s != _VISIBLE:
+                    if not s:
+                        newly_explored += 1
+                    entered.append((x, y))
+                state[i] = _REVEALED
+                indices.append(i)
+                visible.add((x, y))
+
+        if 0 <= player_x < width and 0 <= player_y < height:
+            shadowcast((player_x, player_y), self.sight_radius, is_opaque, reveal)
+
+        # 上一步可见、本次未被标记的格子离开视野
+        left: List[Tuple[int, int]] = []
+        for i in self._visible_indices:
+            if state[i] == _VISIBLE:
+                state[i] = _EXPLORED
+                left.append((i % width, i // width))
+        for i in indices:
+            state[i] = _VISIBLE
 
-        # 简单的圆形视野计算
-        for dy in range(-self.sight_radius, self.sight_radius + 1):
-            for dx in range(-self.sight_radius, self.sight_radius + 1):
-                x = player_x + dx
-                y = player_y + dy
-
-                # 检查是否在地图边界内
-                if not self._is_valid_position(x, y, level):
-                    continue
-
-                # 计算距离
-                distance = math.sqrt(dx * dx + dy * dy)
-
-                # 在视野半径内
-                if distance <= self.sight_radius:
-                    visible.add((x, y))
-
-        # 更新可见瓦片集合
         self.visible_tiles = visible
-
-        # 将当前可见的瓦片加入已探索区域
-        self.previously_seen.update(visible)
+        self._visible_indices = indices
+        self._visible_walls = walls
+        self.explored_count += newly_explored
+        if entered or left:
+            self.version += 1
+            self.last_delta = FOVDelta(entered, left)
 
         return visible
 
@@ -67,24 +274,55 @@ class FOVSystem:
 
     def is_visible(self, x: int, y: int) -> bool:
         """检查特定坐标是否在当前视野内"""
-        return (x, y) in self.visible_tiles
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.tile_state[y * self.width + x] == _VISIBLE
+        return False
 
     def is_explored(self, x: int, y: int) -> bool:
         """检查特定坐标是否已被探索过"""
-        return (x, y) in self.previously_seen
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.tile_state[y * self.width + x] != 0
+        return False
+
+    def get_visibility_grid(self) -> memoryview:
+        """状态网格的只读视图（下标 y * width + x，取值同 TileVisibility）"""
+        return memoryview(self.tile_state).toreadonly()
+
+    def get_visibility_rows(self, x0: int, y0: int, x1: int, y1: int) -> List[bytes]:
+        """视口矩形 [x0, x1) x [y0, y1) 的可见性状态，每行一个 bytes（取值同 TileVisibility，越界为 HIDDEN）"""
+        n = max(0, x1 - x0)
+        state = self.tile_state
+        w = self.width
+        cx0 = max(0, x0)
+        cx1 = min(w, x1)
+        pad_l = bytes(cx0 - x0)
+        pad_r = bytes(max(0, x1 - cx1))
+        hidden = bytes(n)
+        rows = []
+        for y in range(y0, y1):
+            if 0 <= y < self.height and cx0 < cx1:
+                base = y * w
+                row = bytes(state[base + cx0:base + cx1])
+                rows.append(pad_l + row + pad_r if pad_l or pad_r else row)
+            else:
+                rows.append(hidden)
+        return rows
 
     def get_visible_tiles(self) -> Set[Tuple[int, int]]:
-        """获取当前可见的瓦片"""
-        return self.visible_tiles.copy()
+        """获取当前可见的瓦片（不复制，调用方不应修改）"""
+        return self.visible_tiles
 
-    def get_explored_tiles(self) -> Set[Tuple[int, int]]:
-        """获取所有已探索的瓦片"""
-        return self.previously_seen.copy()
+    def get_explored_tiles(self) -> ExploredTiles:
+        """获取所有已探索的瓦片（只读视图）"""
+        return self._explored_view
 
     def clear_exploration(self):
         """清除探索记录（用于换层时）"""
-        self.visible_tiles.clear()
-        self.previously_seen.clear()
+        self.visible_tiles = set()
+        self._visible_walls = set()
+        self._resize(self.width, self.height)
+        self.version += 1
+        self.last_delta = FOVDelta([], [])
 
     def set_sight_radius(self, radius: int):
         """设置视野半径"""
@@ -94,6 +332,17 @@ class FOVSystem:
         """获取当前视野半径"""
         return self.sight_radius
 
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.recomputes
+        return {
+            'hits': self.hits,
+            'recomputes': self.recomputes,
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+            'terrain_version': self.terrain_version,
+            'visible': len(self.visible_tiles),
+            'explored': self.explored_count,
+        }
+
 
 class TileVisibility:
     """瓦片可见性状态"""
@@ -11,10 +11,14 @@ from game.renderer import Renderer
 from game.player import Player
 from game.logger import Logger, ErrorHandler
 from game.performance import PerformanceOptimizer
+from game.profiler import get_profiler, profiled
+from game.telemetry import COL_INPUT_MS, COL_TRANSITION_MS
 from game.debug_controls import toggle_debug_mode, toggle_panel
 from game.perf_controller import log_performance_stats
 from game.memory import MemoryOptimizer, MemoryMonitor, SmartCacheManager
 from game.error_handling import get_global_error_handler
+from game.artifact_writer import get_artifact_writer
+from game.log_sink import get_log_writer
 from game import entities
 from game.audio_controller import initialize_audio
 from game.session_controller import (
@@ -43,7 +47,8 @@ class Game:
         self.logger = Logger(self.config)
         self.error_handler = ErrorHandler(self.logger)
 
-        self.logger.info("Initializing game systems", "GAME")
+        self.logger.info("Initializing game systems", category="GAME")
+        get_artifact_writer().enabled = bool(self.config.write_artifacts)
 
         try:
             self.game_state = GameState(self.config)
@@ -53,7 +58,7 @@ class Game:
 
             # Initialize pygame
             pygame.init()
-            self.logger.debug("Pygame initialized", "GAME")
+            self.logger.debug("Pygame initialized", category="GAME")
 
             # Initialize level and entities (delay until game starts)
             # _initialize_game_world() will be called when user starts game
@@ -65,8 +70,26 @@ class Game:
             self._initialize_audio()
 
             # Initialize performance optimization system
-            self.performance_optimizer = PerformanceOptimizer()
-            self.logger.debug("Performance optimizer initialized", "GAME")
+            self.performance_optimizer = PerformanceOptimizer(telemetry_capacity=self.config.telemetry_frames)
+            glyph_atlas = getattr(self.renderer, 'glyph_atlas', None)
+            if glyph_atlas is not None:
+                self.performance_optimizer.register_stats_provider('glyph_atlas', glyph_atlas.get_stats)
+            terrain_layer = getattr(self.renderer, 'terrain_layer', None)
+            if terrain_layer is not None:
+                self.performance_optimizer.register_stats_provider('terrain_layer', terrain_layer.get_stats)
+            if self.floor_manager.prefetcher is not None:
+                self.performance_optimizer.register_stats_provider(
+                    'floor_prefetch', self.floor_manager.prefetcher.get_stats
+                )
+            self.performance_optimizer.register_stats_provider('artifact_writer', get_artifact_writer().get_stats)
+            self.performance_optimizer.register_stats_provider('log_writer', get_log_writer().get_stats)
+            # 区段分析（--profile）：整局记录，退出时写出 trace 与汇总表
+            profiler = get_profiler()
+            if getattr(self.config, 'profile_path', None):
+                profiler.reset()
+                profiler.enable()
+            self.performance_optimizer.register_stats_provider('profiler', profiler.get_stats)
+            self.logger.debug("Performance optimizer initialized", category="GAME")
 
             # Initialize memory management system
             self.memory_monitor = MemoryMonitor(logger=self.logger)
@@ -74,13 +97,13 @@ class Game:
             self.memory_optimizer = MemoryOptimizer(
                 memory_monitor=self.memory_monitor, cache_manager=self.cache_manager, logger=self.logger
             )
-            self.logger.debug("Memory management system initialized", "GAME")
+            self.logger.debug("Memory management system initialized", category="GAME")
 
             # Initialize global error handling
             self.global_error_handler = get_global_error_handler()
             if self.global_error_handler:
                 self.global_error_handler.logger = self.logger
-            self.logger.debug("Global error handler initialized", "GAME")
+            self.logger.debug("Global error handler initialized", category="GAME")
 
             # Game loop variables
             self.clock = pygame.time.Clock()
@@ -103,14 +126,14 @@ class Game:
             self.sprint_sound: Optional[pygame.mixer.Sound]
             self.sprint_ready_sound: Optional[pygame.mixer.Sound]
 
-            self.logger.info("Game initialization completed successfully", "GAME")
+            self.logger.info("Game initialization completed successfully", category="GAME")
 
         except Exception as e:
             self.logger.error("Failed to initialize game", "GAME", e)
             raise
 
-    def _prefer_log(self, msg: str, level: str = 'info') -> None:
-        safe_log(getattr(self, 'logger', None), getattr(self, 'game_state', None), msg, level=level, channel='GAME')
+    def _prefer_log(self, msg, *args, level: str = 'info') -> None:
+        safe_log(getattr(self, 'logger', None), getattr(self, 'game_state', None), msg, *args, level=level, channel='GAME')
 
     def _initialize_game_world(self):
         """Initialize the game world (level, player, etc.) via session controller."""
@@ -141,11 +164,25 @@ class Game:
 
     def run(self):
         """Main game loop with enhanced monitoring and error handling"""
-        self.logger.info("Starting main game loop", "GAME")
+        self.logger.info("Starting main game loop", category="GAME")
         frame_count = 0
 
+        # 预绑定每帧调用的安全包装器：只构建一次，异常时才进入恢复流程
+        handle_events = self.error_handler.guard(self.input_handler.handle_events, "input_events")
+        process_input = self.error_handler.guard(self._process_input_results, "input_processing")
+        continuous_input_fn = self.error_handler.guard(self.input_handler.handle_continuous_input, "continuous_input")
+        process_continuous = self.error_handler.guard(self._process_continuous_input, "continuous_processing")
+        update_systems = self.error_handler.guard(self._update_game_systems, "game_systems")
+        process_transitions = self.error_handler.guard(self._process_floor_transitions, "floor_transitions")
+        render_frame = self.error_handler.guard(self.renderer.render_frame, "rendering")
+
+        from game.state import GameStateEnum
+
+        monitor = self.performance_optimizer.monitor
+        profiler = get_profiler()
         try:
             while self.running:
+                profiler.begin_frame()
                 # Start performance monitoring for this frame
                 self.performance_optimizer.start_frame()
 
@@ -155,63 +192,59 @@ class Game:
                 dt = self.clock.tick(self.config.fps)
 
                 # Handle events
+                input_start = time.perf_counter()
                 events = pygame.event.get()
-                input_results = self.error_handler.safe_call(self.input_handler.handle_events, "input_events", events)
+                input_results = handle_events(events)
 
                 if input_results and input_results.get('quit'):
-                    self.logger.info("Quit requested by user", "GAME")
+                    self.logger.info("Quit requested by user", category="GAME")
                     self.running = False
                     continue
 
                 # Process input results
                 if input_results:
-                    self.error_handler.safe_call(self._process_input_results, "input_processing", input_results, dt)
+                    process_input(input_results, dt)
 
                 # Handle continuous input
-                continuous_input = self.error_handler.safe_call(
-                    self.input_handler.handle_continuous_input, "continuous_input"
-                )
+                continuous_input = continuous_input_fn()
                 if continuous_input:
-                    self.error_handler.safe_call(
-                        self._process_continuous_input, "continuous_processing", continuous_input, dt
-                    )
+                    process_continuous(continuous_input, dt)
 
                 # Update game systems
                 update_start = time.perf_counter()
-                self.error_handler.safe_call(self._update_game_systems, "game_systems", dt)
-                update_time = (time.perf_counter() - update_start) * 1000
-                self.performance_optimizer.monitor.record_update_time(update_time)
+                monitor.record_sample(COL_INPUT_MS, (update_start - input_start) * 1000)
+                update_systems(dt)
+                transition_start = time.perf_counter()
+                monitor.record_update_time((transition_start - update_start) * 1000)
+                self._record_frame_counts(monitor)
 
                 # Process floor transitions
-                self.error_handler.safe_call(self._process_floor_transitions, "floor_transitions")
+                process_transitions()
 
                 # Render frame
                 render_frame_start = time.perf_counter()
+                monitor.record_sample(COL_TRANSITION_MS, (render_frame_start - transition_start) * 1000)
                 # 在主菜单状态下，不传递player和entity参数
-                from game.state import GameStateEnum
                 if self.game_state.current_state == GameStateEnum.MAIN_MENU:
-                    self.error_handler.safe_call(
-                        self.renderer.render_frame,
-                        "rendering",
+                    render_frame(
                         None,  # player
                         None,  # entity_mgr
                         [],    # floating_texts
                         None,  # npcs
                     )
                 else:
-                    self.error_handler.safe_call(
-                        self.renderer.render_frame,
-                        "rendering",
+                    render_frame(
                         self.player,
                         self.entity_mgr,
                         self.game_state.floating_texts,
                         self.npcs,
                     )
                 render_time = (time.perf_counter() - render_frame_start) * 1000
-                self.performance_optimizer.monitor.record_render_time(render_time)
+                monitor.record_render_time(render_time)
 
                 # End performance monitoring for this frame
                 self.performance_optimizer.end_frame()
+                profiler.end_frame()
 
                 frame_count += 1
 
@@ -220,14 +253,55 @@ class Game:
                     log_performance_stats(self.performance_optimizer, self.logger, self.config, self.game_state)
 
         except KeyboardInterrupt:
-            self.logger.info("Game interrupted by user (Ctrl+C)", "GAME")
+            self.logger.info("Game interrupted by user (Ctrl+C)", category="GAME")
         except Exception as e:
             self.logger.error("Unhandled exception in main game loop", "GAME", e)
+            # 崩溃时把仅保存在内存中的 game/exit 日志写盘
+            self.game_state.dump_logs()
             raise
         finally:
-            self.logger.info("Shutting down game systems", "GAME")
+            self.logger.info("Shutting down game systems", category="GAME")
+            self.floor_manager.cancel_prefetch()
+            get_artifact_writer().flush(timeout=5.0)
+            self._dump_telemetry()
+            self._write_profile()
+            self.logger.flush(timeout=5.0)
             pygame.quit()
 
+    def _write_profile(self):
+        """配置了 --profile 时写出 Chrome trace JSON 与区段汇总表"""
+        path = getattr(self.config, 'profile_path', None)
+        profiler = get_profiler()
+        if not path or not profiler.enabled:
+            return
+        profiler.end_frame()
+        profiler.disable()
+        try:
+            table = profiler.write_report(path)
+            self.logger.info("Profile written: %s (%d frames)\n%s", path, profiler.frames, table, category="PERFORMANCE")
+        except Exception as e:
+            self.logger.warning(f"Profile export failed: {e}", category="PERFORMANCE")
+
+    def _record_frame_counts(self, monitor):
+        """本帧敌人数量与玩家视野格数写入遥测"""
+        entity_mgr = self.entity_mgr
+        fov_system = getattr(self.player, 'fov_system', None)
+        monitor.record_counts(
+            len(entity_mgr.entities_by_id) if entity_mgr is not None else 0,
+            len(fov_system.visible_tiles) if fov_system is not None else 0,
+        )
+
+    def _dump_telemetry(self):
+        """配置了 --telemetry 时把帧遥测环写盘（正常退出与崩溃都会执行）"""
+        path = getattr(self.config, 'telemetry_path', None)
+        if not path:
+            return
+        try:
+            rows = self.performance_optimizer.monitor.dump_telemetry(path)
+            self.logger.info("Telemetry written: %s (%d frames)", path, rows, category="PERFORMANCE")
+        except Exception as e:
+            self.logger.warning(f"Telemetry dump failed: {e}", category="PERFORMANCE")
+
     def _process_input_results(self, input_results, dt):
         """Process discrete input events"""
         # Handle pause/resume game
@@ -365,21 +439,13 @@ class Game:
         
         # 记录楼层完成
         if self.logger:
-            self.logger.info(f"完成第 {self.game_state.floor_number} 层, 获得 {floor_exp} 经验, 当前等级: {self.player.level}", "FLOOR")
+            self.logger.info(f"完成第 {self.game_state.floor_number} 层, 获得 {floor_exp} 经验, 当前等级: {self.player.level}", category="FLOOR")
         
         self.game_state.floor_number += 1
 
         self.game_state.game_log(f'Starting floor transition to {self.game_state.floor_number}')
 
-        if self.config.seed is None:
-            from game.utils import get_seed
-            gen_seed = get_seed()
-        else:
-            try:
-                gen_seed = int(self.config.seed) + self.game_state.floor_number
-            except Exception:
-                from game.utils import get_seed
-                gen_seed = get_seed()
+        gen_seed = self.floor_manager.floor_seed(self.game_state.floor_number)
 
         self.game_state.start_floor_transition(self.game_state.floor_number, gen_seed)
         # 统一记录楼层转换触发日志
@@ -438,7 +504,7 @@ class Game:
                         self.game_state.game_log(f'你攻击了敌人 ({nx},{ny})，剩余HP={ent.hp} id={ent.id}')
                 except Exception:
                     pass
-                self._prefer_log(f'你攻击了敌人 ({nx},{ny})，剩余HP={ent.hp} id={ent.id}', level='info')
+                self._prefer_log('你攻击了敌人 (%d,%d)，剩余HP=%s id=%s', nx, ny, ent.hp, ent.id, level='info')
 
                 # Add floating text
                 self.game_state.floating_texts.append(
@@ -515,7 +581,7 @@ class Game:
                         loot_summary = ', '.join(f'{k}x{v}' for k, v in drops) if drops else 'no loot'
                         self.logger.info(
                             f"击败敌人 {enemy_type}, 经验 +{exp_reward}, 掉落: {loot_summary}, 等级: {self.player.level}",
-                            "COMBAT",
+                            category="COMBAT",
                         )
                     
                     # Remove entity
@@ -550,7 +616,7 @@ class Game:
                     f'  id={ent.id} pos=({ex},{ey}) hp={getattr(ent,"hp",None)} dir={getattr(ent,"dir",None)} tile={ch} neigh={neigh}'
                 )
                 if self.logger:
-                    self.logger.debug(msg, 'DEBUG')
+                    self.logger.debug(msg)
                 elif getattr(self, 'game_state', None):
                     try:
                         self.game_state.game_log(msg)
@@ -559,6 +625,7 @@ class Game:
                 else:
                     print(msg)
 
+    @profiled('game.update')
     def _update_game_systems(self, dt):
         """Update all game systems"""
         # 只在PLAYING状态下更新游戏系统，暂停状态下不更新
@@ -578,7 +645,11 @@ class Game:
         # Update entities
         if self.entity_mgr:
             evts = self.entity_mgr.update(
-                self.game_state.level, (self.player.x, self.player.y), self.game_state.width, self.game_state.height
+                self.game_state.level,
+                (self.player.x, self.player.y),
+                self.game_state.width,
+                self.game_state.height,
+                is_visible=self.player.is_tile_visible if self.config.enable_fov else None,
             )
             self._process_entity_events(evts)
 
@@ -612,7 +683,7 @@ class Game:
                                 self.game_state.game_log(f'敌人攻击了你！ 你的HP={self.player.hp}')
                         except Exception:
                             pass
-                        self._prefer_log(f'敌人攻击了你！ 你的HP={self.player.hp}', level='info')
+                        self._prefer_log('敌人攻击了你！ 你的HP=%s', self.player.hp, level='info')
 
                         # Add floating text
                         if attacker_id is not None:
@@ -679,7 +750,7 @@ class Game:
     def _handle_restart_game(self):
         """处理游戏重新开始"""
         try:
-            self.logger.info("重新开始游戏", "GAME")
+            self.logger.info("重新开始游戏", category="GAME")
             from game.state import GameStateEnum
             self.game_state.set_game_state(GameStateEnum.PLAYING)
             # 使用会话控制器进行完整重启
@@ -693,7 +764,7 @@ class Game:
     def _handle_start_game(self):
         """处理从主菜单开始游戏"""
         try:
-            self.logger.info("从主菜单开始游戏", "GAME")
+            self.logger.info("从主菜单开始游戏", category="GAME")
             
             # 通过会话控制器确保初始化并进入游戏
             player, entity_mgr, npcs = start_game_if_needed(
@@ -707,7 +778,7 @@ class Game:
                     self.entity_mgr = entity_mgr
                 # 保证为字典类型
                 self.npcs = npcs or {}
-            self.logger.info("游戏开始成功", "GAME")
+            self.logger.info("游戏开始成功", category="GAME")
             
         except Exception as e:
             self.logger.error("开始游戏失败", "GAME", e)
@@ -717,17 +788,17 @@ class Game:
         from game.state import GameStateEnum
         if self.game_state.current_state == GameStateEnum.PLAYING:
             self.game_state.set_game_state(GameStateEnum.PAUSED)
-            self.logger.info("游戏已暂停", "GAME")
+            self.logger.info("游戏已暂停", category="GAME")
 
     def _handle_resume_game(self):
         """处理恢复游戏"""
         from game.state import GameStateEnum
         if self.game_state.current_state == GameStateEnum.PAUSED:
             self.game_state.set_game_state(GameStateEnum.PLAYING)
-            self.logger.info("游戏已恢复", "GAME")
+            self.logger.info("游戏已恢复", category="GAME")
 
     def _handle_goto_main_menu(self):
         """处理返回主菜单"""
         from game.state import GameStateEnum
         self.game_state.set_game_state(GameStateEnum.MAIN_MENU)
-        self.logger.info("返回主菜单", "GAME")
+        self.logger.info("返回主菜单", category="GAME")
@@ -0,0 +1,131 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+"""
+字形图集缓存 (Glyph Atlas)
+每个 (字形, 颜色) 组合只光栅化一次，地图绘制阶段只做 blit
+"""
+
+
+Color = Tuple[int, int, int]
+
+# 地图基础字形的正常颜色（与 Renderer._get_tile_color 保持一致）
+TILE_COLORS: Dict[str, Color] = {
+    '#': (100, 100, 100),
+    '@': (255, 215, 0),
+    'X': (150, 255, 150),
+    'N': (180, 150, 255),
+    'E': (220, 100, 100),
+    '.': (200, 200, 200),
+}
+PLAYER_FLASH_COLOR: Color = (255, 255, 255)
+ENEMY_FLASH_COLOR: Color = (255, 180, 180)
+
+# 敌人种类外观
+ENEMY_KIND_GLYPHS: Dict[str, str] = {
+    'basic': 'e',
+    'guard': 'G',
+    'scout': 's',
+    'brute': 'B',
+}
+ENEMY_KIND_COLORS: Dict[str, Color] = {
+    'basic': (220, 100, 100),
+    'guard': (240, 160, 80),
+    'scout': (180, 140, 240),
+    'brute': (255, 80, 80),
+}
+
+# 雾化（已探索但不可见）亮度系数
+FOG_FACTOR = 0.3
+
+
+def dim_color(color: Color, factor: float = FOG_FACTOR) -> Color:
+    """按系数调暗颜色（雾化效果）"""
+    return (int(color[0] * factor), int(color[1] * factor), int(color[2] * factor))
+
+
+class GlyphAtlas:
+    """按 (glyph, color) 缓存预渲染的字形 Surface
+
+    缓存与 (font, tile_size) 绑定，字体或瓦片尺寸变化时自动失效。
+    """
+
+    def __init__(self, font: Any = None, tile_size: int = 0, max_entries: int = 1024):
+        self.font = font
+        self.tile_size = tile_size
+        self.max_entries = max_entries
+        self._surfaces: Dict[Tuple[str, Color], Any] = {}
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def ensure(self, font: Any, tile_size: int) -> None:
+        """确认缓存对应当前字体与瓦片尺寸，不一致时清空"""
+        if font is not self.font or tile_size != self.tile_size:
+            self.font = font
+            self.tile_size = tile_size
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """清空所有缓存的字形"""
+        if self._surfaces:
+            self.invalidations += 1
+        self._surfaces.clear()
+
+    def get(self, glyph: str, color: Color) -> Any:
+        """获取字形 Surface；未命中时光栅化一次并缓存"""
+        key = (glyph, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.font.render(glyph, True, color)
+        if len(self._surfaces) >= self.max_entries:
+            # 颜色组合异常增多时整体重建，防止无限增长
+            self._surfaces.clear()
+        self._surfaces[key] = surf
+        return surf
+
+    def prewarm(self, entries: Optional[Iterable[Tuple[str, Color]]] = None) -> int:
+        """预渲染常用字形（正常色、雾化色、闪烁色与敌人种类外观），返回新渲染数量"""
+        if self.font is None:
+            return 0
+        if entries is None:
+            entries = self.default_entries()
+        rendered = 0
+        for glyph, color in entries:
+            key = (glyph, color)
+            if key in self._surfaces:
+                continue
+            self._surfaces[key] = self.font.render(glyph, True, color)
+            rendered += 1
+        return rendered
+
+    @staticmethod
+    def default_entries():
+        """地图绘制阶段可能用到的全部 (glyph, color) 组合"""
+        entries = []
+        for ch, color in TILE_COLORS.items():
+            entries.append((ch, color))
+            entries.append((ch, dim_color(color)))
+        entries.append(('@', PLAYER_FLASH_COLOR))
+        entries.append(('@', dim_color(PLAYER_FLASH_COLOR)))
+        entries.append(('E', ENEMY_FLASH_COLOR))
+        for kind, glyph in ENEMY_KIND_GLYPHS.items():
+            entries.append((glyph, ENEMY_KIND_COLORS[kind]))
+            entries.append((glyph, ENEMY_FLASH_COLOR))
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """命中/未命中统计，供 PerformanceOptimizer.get_stats 汇总"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+            'invalidations': self.invalidations,
+            'tile_size': self.tile_size,
+        }
@@ -229,7 +229,7 @@ class InputHandler:
             # Currently showing indicator, hide it
             self.game_state.pending_target = None
             if hasattr(self.game_state, 'logger') and self.game_state.logger:
-                self.game_state.logger.debug("Tab pressed: exit indicator hidden", "TAB")
+                self.game_state.logger.debug("Tab pressed: exit indicator hidden", category="TAB")
         else:
             # Currently hidden, show indicator
             # Force recompute exit_pos if it's None but level has 'X'
@@ -237,7 +237,7 @@ class InputHandler:
                 x_count = sum(row.count('X') for row in self.game_state.level)
                 if x_count > 0:
                     if hasattr(self.game_state, 'logger') and self.game_state.logger:
-                        self.game_state.logger.info(f"Recomputing exit_pos on Tab (found {x_count} 'X')", "TAB")
+                        self.game_state.logger.info(f"Recomputing exit_pos on Tab (found {x_count} 'X')", category="TAB")
                     self.game_state.compute_exit_pos()
             
             if self.game_state.exit_pos is not None:
@@ -245,11 +245,11 @@ class InputHandler:
                 tile_size = self.config.tile_size
                 self.game_state.pending_target = (ex * tile_size + tile_size // 2, ey * tile_size + tile_size // 2)
                 if hasattr(self.game_state, 'logger') and self.game_state.logger:
-                    self.game_state.logger.debug(f"Tab pressed: exit indicator shown at {self.game_state.pending_target}", "TAB")
+                    self.game_state.logger.debug(f"Tab pressed: exit indicator shown at {self.game_state.pending_target}", category="TAB")
             else:
                 self.game_state.pending_target = None
                 if hasattr(self.game_state, 'logger') and self.game_state.logger:
-                    self.game_state.logger.warning("Tab pressed but no exit_pos available", "TAB")
+                    self.game_state.logger.warning("Tab pressed but no exit_pos available", category="TAB")
         
         return {}
 
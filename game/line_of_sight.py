@@ -0,0 +1,180 @@
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .pathfinding import build_walkable_mask
+from .tile_grid import tile_getter
+from .utils import add_tile_listener
+
+"""
+视线判定 (Line of Sight)
+整数 Bresenham 直线在一维不透明掩码上检查遮挡；结果按 (起点格, 终点格) 缓存，
+并记下每条直线实际检查过的格子。某格透明/不透明切换（墙体改变或敌人移动）时只丢弃经过该格的结果，
+玩家移动时整体清空。
+"""
+
+
+Position = Tuple[int, int]
+
+# 阻挡视线的瓦片：墙壁与其他敌人
+OPAQUE_TILES = '#E'
+
+
+def bresenham(start: Position, goal: Position) -> Iterator[Position]:
+    """start 到 goal 的整数 Bresenham 直线（含两端点）"""
+    x0, y0 = start
+    x1, y1 = goal
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+    while True:
+        yield x0, y0
+        if x0 == x1 and y0 == y1:
+            return
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+
+
+def tile_between(start: Position, goal: Position, get_tile, tiles: str) -> bool:
+    """start 到 goal 的 Bresenham 直线上（不含端点）有 tiles 中的瓦片时返回 True"""
+    for pos in bresenham(start, goal):
+        if pos != start and pos != goal and get_tile(*pos) in tiles:
+            return True
+    return False
+
+
+def has_line_of_sight(
+    start: Position, goal: Position, opaque: bytearray, width: int, height: int, cells: Optional[List[int]] = None
+) -> bool:
+    """两点之间（不含端点）没有不透明格时返回 True；端点越界返回 False
+
+    cells: 可选，追加检查过的格子下标（遇到遮挡即停止），供缓存按格失效。
+    """
+    x0, y0 = start
+    x1, y1 = goal
+    if not (0 <= x0 < width and 0 <= y0 < height and 0 <= x1 < width and 0 <= y1 < height):
+        return False
+    if start == goal:
+        return True
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+    while True:
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+        if x0 == x1 and y0 == y1:
+            return True
+        idx = y0 * width + x0
+        if cells is not None:
+            cells.append(idx)
+        if opaque[idx]:
+            return False
+
+
+class LineOfSightCache:
+    """某一层地图上的视线查询：维护不透明掩码并缓存结果"""
+
+    def __init__(self, opaque_tiles: str = OPAQUE_TILES):
+        self.opaque_tiles = opaque_tiles
+        self._level: Any = None
+        self._opaque: Optional[bytearray] = None
+        self.width = 0
+        self.height = 0
+        self._cache: Dict[Tuple[Position, Position], bool] = {}
+        # 格子下标 -> 经过该格的缓存键；缓存键 -> 它检查过的格子
+        self._by_cell: Dict[int, Set[Tuple[Position, Position]]] = {}
+        self._cells: Dict[Tuple[Position, Position], List[int]] = {}
+        self._goal: Optional[Position] = None
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.invalidations = 0
+
+        # 遮挡变化时失效（弱引用，随本对象回收）
+        add_tile_listener(self.on_tile_changed)
+
+    def _ensure(self, level, width: int, height: int) -> None:
+        if self._opaque is not None and level is self._level and width == self.width and height == self.height:
+            return
+        self._level = level
+        self.width = width
+        self.height = height
+        self._opaque = build_walkable_mask(level, self.opaque_tiles)
+        self._clear()
+        self.rebuilds += 1
+
+    def _clear(self) -> None:
+        self._cache.clear()
+        self._by_cell.clear()
+        self._cells.clear()
+
+    def on_tile_changed(self, level, x: int, y: int) -> None:
+        """set_tile 监听：某格在透明/不透明之间切换时更新掩码，只丢弃经过该格的缓存结果"""
+        opaque = self._opaque
+        if opaque is None or level is not self._level or not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        idx = y * self.width + x
+        now = 1 if tile_getter(level)(x, y) in self.opaque_tiles else 0
+        if opaque[idx] != now:
+            opaque[idx] = now
+            keys = self._by_cell.pop(idx, None)
+            if keys:
+                by_cell = self._by_cell
+                for key in keys:
+                    del self._cache[key]
+                    for cell in self._cells.pop(key):
+                        if cell != idx:
+                            by_cell[cell].discard(key)
+                self.invalidations += 1
+
+    def begin_tick(self, goal: Position) -> None:
+        """每个 AI tick 开始时调用：目标（玩家）移动后旧结果不会再命中，直接丢弃"""
+        if goal != self._goal:
+            self._goal = goal
+            self._clear()
+
+    def check(self, level, start: Position, goal: Position, width: int, height: int) -> bool:
+        self._ensure(level, width, height)
+        key = (start, goal)
+        result = self._cache.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        cells: List[int] = []
+        result = has_line_of_sight(start, goal, self._opaque, width, height, cells)
+        self._cache[key] = result
+        self._cells[key] = cells
+        by_cell = self._by_cell
+        for cell in cells:
+            keys = by_cell.get(cell)
+            if keys is None:
+                by_cell[cell] = {key}
+            else:
+                keys.add(key)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+            'rebuilds': self.rebuilds,
+            'invalidations': self.invalidations,
+            'cached': len(self._cache),
+        }
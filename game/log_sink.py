@@ -0,0 +1,287 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+"""
+异步日志写入 (Log Sink)
+游戏线程只把记录追加到有界队列（deque.append 本身线程安全，不加锁）；后台线程按条数或时间批量取出，
+格式化时间戳后写入各自常开的文件句柄。文件大小在内存中累计，不再逐条 stat()。
+- 队列满时普通记录直接丢弃并计数，重要记录（错误）等待后台线程腾出空间
+- flush() 等待已排队记录落盘；进程退出时自动 flush 并关闭句柄
+- 环形通道只把记录保留在内存中，dump() 时（按需或崩溃时）才交给后台线程写出
+"""
+
+
+# 队列中的一条记录：(通道, 已格式化文本) 或 (通道, (时间, pygame ticks, 级别, 分类, 消息))
+Record = Tuple['LogChannel', Any]
+
+
+class LogChannel:
+    """写入同一个文件的日志通道（由后台线程持有文件句柄）"""
+
+    __slots__ = ('path', 'time_format', 'max_bytes', 'rotate', 'size', 'ring', '_fh', '_writer')
+
+    def __init__(self, writer: 'LogWriter', path: str, time_format: str, max_bytes: int, rotate: Optional[Callable[[], None]]):
+        self._writer = writer
+        self.path = path
+        self.time_format = time_format
+        self.max_bytes = max_bytes
+        self.rotate = rotate
+        self.size = -1  # 首次写入时读取一次现有大小
+        # 非 None 时为内存环形缓冲：记录只保留最近 maxlen 条，dump() 时才写出
+        self.ring: Optional[Deque[Any]] = None
+        self._fh = None
+
+    def log(self, level: str, category: str, msg: str, ticks: int = 0) -> bool:
+        """排队一条结构化记录，时间戳由后台线程格式化"""
+        record = (time.time(), ticks, level, category, msg)
+        if self.ring is not None:
+            self.ring.append(record)
+            return True
+        return self._writer.put(self, record, level in IMPORTANT_LEVELS)
+
+    def write(self, text: str, important: bool = False) -> bool:
+        """排队一段已格式化文本（原样写入，需自带换行）"""
+        if self.ring is not None:
+            self.ring.append(text)
+            return True
+        return self._writer.put(self, text, important)
+
+    def dump(self) -> int:
+        """把环形缓冲中的记录交给后台线程写出并清空，返回条数"""
+        ring = self.ring
+        if not ring:
+            return 0
+        count = 0
+        while ring:
+            self._writer.put(self, ring.popleft(), True)
+            count += 1
+        return count
+
+    def format(self, record) -> str:
+        if record.__class__ is str:
+            return record
+        t, ticks, level, category, msg = record
+        stamp = datetime.fromtimestamp(t).strftime(self.time_format)[:-3]
+        return f"[{stamp}][{ticks:06d}][{level}][{category}] {msg}\n"
+
+    def _emit(self, text: str) -> None:
+        """后台线程：写入并在超出大小上限时轮转"""
+        fh = self._fh
+        if fh is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fh = self._fh = open(self.path, 'a', encoding='utf-8')
+            if self.size < 0:
+                try:
+                    self.size = os.path.getsize(self.path)
+                except OSError:
+                    self.size = 0
+        if self.max_bytes and self.size > self.max_bytes:
+            self._close()
+            if self.rotate is not None:
+                try:
+                    self.rotate()
+                except Exception:
+                    pass
+            self.size = 0
+            fh = self._fh = open(self.path, 'a', encoding='utf-8')
+        fh.write(text)
+        self.size += len(text.encode('utf-8')) if not text.isascii() else len(text)
+
+    def _flush(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+
+    def _close(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+
+
+# 队列满时不丢弃、而是等待后台线程的级别
+IMPORTANT_LEVELS = frozenset(('ERROR', 'CRITICAL'))
+
+
+class LogWriter:
+    """单个后台线程、有界队列、按条数或时间批量写入的日志写入器"""
+
+    def __init__(self, max_pending: int = 10000, batch_size: int = 256, flush_interval: float = 0.25):
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Deque[Record] = deque()
+        self._channels: Dict[str, LogChannel] = {}
+        self._wake = threading.Event()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.batches = 0
+        self.errors = 0
+
+    def channel(
+        self,
+        path,
+        time_format: str = "%H:%M:%S.%f",
+        max_bytes: int = 0,
+        rotate: Optional[Callable[[], None]] = None,
+        ring_size: int = 0,
+    ) -> LogChannel:
+        """获取（或创建）写入 path 的通道；同一路径共用一个文件句柄
+
+        ring_size > 0 时通道只在内存中保留最近 ring_size 条记录，由 dump()/dump_rings() 写出。
+        """
+        path = os.path.normpath(str(path))
+        with self._cond:
+            chan = self._channels.get(path)
+            if chan is None:
+                chan = self._channels[path] = LogChannel(self, path, time_format, max_bytes, rotate)
+            else:
+                chan.time_format = time_format
+                chan.max_bytes = max_bytes
+                chan.rotate = rotate
+        if ring_size > 0:
+            if chan.ring is None or chan.ring.maxlen != ring_size:
+                chan.ring = deque(chan.ring or (), maxlen=ring_size)
+        elif chan.ring is not None:
+            chan.dump()
+            chan.ring = None
+        return chan
+
+    def dump_rings(self) -> int:
+        """写出所有环形通道（按需或崩溃时调用），返回记录条数"""
+        with self._cond:
+            channels = list(self._channels.values())
+        return sum(chan.dump() for chan in channels if chan.ring is not None)
+
+    def put(self, chan: LogChannel, record, important: bool = False) -> bool:
+        """游戏线程：排队一条记录；队列满且不重要时丢弃并返回 False"""
+        queue = self._queue
+        if len(queue) >= self.max_pending:
+            if not important:
+                self.dropped += 1
+                return False
+            # 背压：错误记录等待后台线程腾出空间（最多 1 秒，之后仍然入队）
+            self.blocked += 1
+            self._wake.set()
+            with self._cond:
+                self._ensure_thread()
+                self._cond.wait_for(lambda: len(queue) < self.max_pending, 1.0)
+        queue.append((chan, record))
+        self.submitted += 1
+        if self._thread is None:
+            with self._cond:
+                self._ensure_thread()
+        if len(queue) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self) -> None:
+        queue = self._queue
+        with self._cond:
+            if not queue:
+                return
+            self._busy = True
+        touched: List[LogChannel] = []
+        try:
+            while queue:
+                # 每批按通道拼接后一次写入
+                pending: Dict[LogChannel, List[str]] = {}
+                for _ in range(min(len(queue), self.batch_size * 4)):
+                    chan, record = queue.popleft()
+                    try:
+                        text = chan.format(record)
+                    except Exception:
+                        self.errors += 1
+                        continue
+                    lines = pending.get(chan)
+                    if lines is None:
+                        lines = pending[chan] = []
+                        touched.append(chan)
+                    lines.append(text)
+                for chan, lines in pending.items():
+                    try:
+                        chan._emit(''.join(lines))
+                        self.written += len(lines)
+                    except Exception:
+                        self.errors += 1
+                self.batches += 1
+                with self._cond:
+                    self._cond.notify_all()
+        finally:
+            for chan in set(touched):
+                try:
+                    chan._flush()
+                except Exception:
+                    self.errors += 1
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待所有已排队记录写入文件；超时返回 False"""
+        with self._cond:
+            if not self._queue and not self._busy:
+                return True
+            self._ensure_thread()
+        self._wake.set()
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """写完剩余记录并关闭所有文件句柄（之后再写入会重新打开）"""
+        self.flush(timeout)
+        with self._cond:
+            for chan in self._channels.values():
+                try:
+                    chan._close()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """写入统计，供 PerformanceOptimizer.get_stats 汇总"""
+        return {
+            'submitted': self.submitted,
+            'written': self.written,
+            'dropped': self.dropped,
+            'blocked': self.blocked,
+            'batches': self.batches,
+            'errors': self.errors,
+            'pending': len(self._queue),
+            'channels': len(self._channels),
+        }
+
+
+# 进程内共享实例（工作线程在首次写入时才启动）
+_log_writer = LogWriter()
+# 工作线程是守护线程：解释器退出（包括未捕获异常导致的退出）前写完并关闭句柄
+atexit.register(_log_writer.close, 5.0)
+
+
+def get_log_writer() -> LogWriter:
+    """进程内共享的日志写入器"""
+    return _log_writer
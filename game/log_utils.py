@@ -1,31 +1,53 @@
 from typing import Any, Optional
 
-def safe_log(logger: Optional[Any], game_state: Optional[Any], msg: str, *, level: str = 'info', channel: str = 'GAME') -> None:
+# safe_log 级别 -> Logger 级别名（用于 is_enabled 预检）
+_LEVEL_NAMES = {'debug': 'DEBUG', 'info': 'INFO', 'warning': 'WARN', 'error': 'ERROR'}
+
+
+def _render(msg: Any, args: tuple) -> str:
+    if callable(msg):
+        return str(msg())
+    if args:
+        return msg % args
+    return msg
+
+
+def safe_log(logger: Optional[Any], game_state: Optional[Any], msg: Any, *args: Any, level: str = 'info', channel: str = 'GAME') -> None:
+    """记录一条日志，logger 不可用时退回 game_state.game_log / print。
+
+    msg 可以是带 %-占位符的格式串（配合 args）或无参可调用对象；
+    logger 提供 is_enabled 且该级别/分类被过滤时不做任何格式化。
+    """
     try:
         if logger is not None:
             try:
+                is_enabled = getattr(logger, 'is_enabled', None)
+                if is_enabled is not None and not is_enabled(_LEVEL_NAMES.get(level, 'INFO'), channel):
+                    return
+                text = _render(msg, args)
                 if level == 'debug' and hasattr(logger, 'debug'):
-                    logger.debug(msg, channel)
+                    logger.debug(text, category=channel)
                     return
                 if level == 'warning' and hasattr(logger, 'warning'):
-                    logger.warning(msg, channel)
+                    logger.warning(text, category=channel)
                     return
                 if level == 'error' and hasattr(logger, 'error'):
-                    logger.error(msg, channel)
+                    logger.error(text, channel)
                     return
                 if hasattr(logger, 'info'):
-                    logger.info(msg, channel)
+                    logger.info(text, category=channel)
                     return
             except Exception:
                 pass
+        text = _render(msg, args)
         if game_state is not None and hasattr(game_state, 'game_log'):
             try:
-                game_state.game_log(msg)
+                game_state.game_log(text)
                 return
             except Exception:
                 pass
         try:
-            print(msg)
+            print(text)
         except Exception:
             pass
     except Exception:
@@ -7,6 +7,9 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
 
+from .log_sink import get_log_writer
+from .profiler import profile_zone
+
 """
 Enhanced logging and error handling utilities
 """
@@ -56,6 +59,12 @@ class Logger:
         # Clean up old logs on startup
         self._cleanup_old_logs()
 
+        # Background log sink: one persistent handle per file, sizes tracked in memory
+        writer = get_log_writer()
+        self._session_channel = writer.channel(self.log_file, "%H:%M:%S.%f", self.max_log_size, self._rotate_log_file)
+        self._error_channel = writer.channel(self.error_log, "%Y-%m-%d %H:%M:%S.%f")
+        self._performance_channel = writer.channel(self.performance_log) if self.performance_log is not None else None
+
         # Legacy debug directory for compatibility
         self.debug_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'debug')
 
@@ -78,7 +87,7 @@ class Logger:
         except Exception as e:
             # Use internal warning method; if that fails fall back to a minimal print
             try:
-                self.warning(f"Could not create debug directory: {e}", "LOGGER")
+                self.warning(f"Could not create debug directory: {e}", category="LOGGER")
             except Exception:
                 # keep only a minimal console message to aid debugging in very early init
                 print(f"Warning: Could not create debug directory: {e}")
@@ -97,11 +106,11 @@ class Logger:
 
             self.auto_maintenance = get_auto_maintenance(self)
             self.auto_maintenance.start_maintenance()
-            self.debug("Auto folder maintenance started", "LOGGER")
+            self.debug("Auto folder maintenance started", category="LOGGER")
         except ImportError:
-            self.debug("Auto maintenance not available", "LOGGER")
+            self.debug("Auto maintenance not available", category="LOGGER")
         except Exception as e:
-            self.debug(f"Failed to start auto maintenance: {e}", "LOGGER")
+            self.debug(f"Failed to start auto maintenance: {e}", category="LOGGER")
 
         self.info(f"Logger initialized with session ID: {self.session_id}")
 
@@ -127,7 +136,7 @@ class Logger:
                         if file_time < cutoff_time:
                             log_file.unlink()
                             try:
-                                self.info(f"Removed old log: {log_file}", "LOGGER")
+                                self.info(f"Removed old log: {log_file}", category="LOGGER")
                             except Exception:
                                 # minimal fallback
                                 print(f"Removed old log: {log_file}")
@@ -144,7 +153,7 @@ class Logger:
                         try:
                             old_file.unlink()
                             try:
-                                self.info(f"Removed excess log: {old_file}", "LOGGER")
+                                self.info(f"Removed excess log: {old_file}", category="LOGGER")
                             except Exception:
                                 print(f"Removed excess log: {old_file}")
                         except Exception:
@@ -152,7 +161,7 @@ class Logger:
 
         except Exception as e:
             try:
-                self.warning(f"Failed to cleanup old logs: {e}", "LOGGER")
+                self.warning(f"Failed to cleanup old logs: {e}", category="LOGGER")
             except Exception:
                 print(f"Warning: Failed to cleanup old logs: {e}")
 
@@ -171,19 +180,48 @@ class Logger:
 
         return True
 
-    def debug(self, msg: str, category: str = "DEBUG"):
-        """Log debug message"""
+    def is_enabled(self, level: str = "DEBUG", category: str = "DEBUG") -> bool:
+        """Cheap check whether a message at level/category would be written; guard expensive log arguments with it"""
+        level = level.upper()
+        if level == "DEBUG" and not self.debug_enabled:
+            return False
+        if level == "WARNING":
+            level = "WARN"
+        return self._should_log(level, category)
+
+    @staticmethod
+    def _render(msg, args) -> str:
+        """Build the final message: msg % args, or msg() for a callable; only runs for messages that pass the filters"""
+        if callable(msg):
+            return str(msg())
+        if args:
+            return msg % args
+        return msg
+
+    def debug(self, msg, *args, category: str = "DEBUG"):
+        """Log debug message
+
+        msg may be a %-format string with args (logger.debug("x=%d", x, category="AI")) or a
+        zero-argument callable; formatting is skipped entirely when debug logging is off.
+        """
         if not self.debug_enabled:
             return
 
-        self._log(msg, "DEBUG", category)
+        self._log(msg, "DEBUG", category, args)
 
-    def info(self, msg: str, category: str = "INFO"):
+    def info(self, msg, *args, category: str = "INFO"):
         """Log info message"""
-        self._log(msg, "INFO", category)
+        self._log(msg, "INFO", category, args)
 
-    def warning(self, msg: str, category: str = "WARN"):
+    def warning(self, msg, *args, category: str = "WARN"):
         """Log warning message"""
+        if not self._should_log("WARN", category):
+            return
+        # Render once for both the log file and the console
+        try:
+            msg = self._render(msg, args)
+        except Exception:
+            return
         self._log(msg, "WARN", category)
         # Also print minimally to console for visibility in early stages
         try:
@@ -235,35 +273,29 @@ class Logger:
             except Exception:
                 pass
 
-    def _log(self, msg: str, level: str, category: str):
-        """Internal logging method with filtering and size control"""
+        # Critical errors often precede a crash: get them on disk now
+        self.flush(timeout=1.0)
+
+    def _log(self, msg, level: str, category: str, args: tuple = ()):
+        """Internal logging method with filtering; the file write happens on the log sink thread"""
         try:
             # Check if this message should be logged
             if not self._should_log(level, category):
                 return
+            if args or msg.__class__ is not str:
+                msg = self._render(msg, args)
 
-            # Check log file size and rotate if necessary
-            if self.log_file.exists() and self.log_file.stat().st_size > self.max_log_size:
-                self._rotate_log_file()
-
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
             pygame_time = pygame.time.get_ticks() if pygame.get_init() else 0
 
-            # Format log entry
-            entry = f"[{timestamp}][{pygame_time:06d}][{level}][{category}] {msg}"
-
             # Add to in-game log buffer
             if self.debug_enabled:
-                self.game_logs.append(entry)
+                timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                self.game_logs.append(f"[{timestamp}][{pygame_time:06d}][{level}][{category}] {msg}")
                 if len(self.game_logs) > self.max_game_logs:
                     self.game_logs.pop(0)
 
-            # Write to file
-            try:
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    f.write(entry + "\n")
-            except Exception:
-                pass  # Silently fail file logging to avoid recursion
+            # Queue for the session log file (rotation is handled by the sink)
+            self._session_channel.log(level, category, msg, pygame_time)
 
         except Exception:
             pass  # Silently fail logging to avoid recursion
@@ -325,7 +357,7 @@ class Logger:
                     for key, value in metadata.items():
                         f.write(f"{key}={value}\n")
 
-            self.debug(f"Wrote debug snapshot: {filename}", "SNAPSHOT")
+            self.debug(f"Wrote debug snapshot: {filename}", category="SNAPSHOT")
             return filepath
 
         except Exception as e:
@@ -345,53 +377,55 @@ class Logger:
                     file_age = current_time - os.path.getmtime(filepath)
                     if file_age > (max_age_days * 24 * 3600):  # Convert days to seconds
                         os.remove(filepath)
-                        self.debug(f"Removed old debug file: {filename}", "CLEANUP")
+                        self.debug(f"Removed old debug file: {filename}", category="CLEANUP")
         except Exception as e:
-            self.warning(f"Failed to clean old logs: {e}", "CLEANUP")
+            self.warning(f"Failed to clean old logs: {e}", category="CLEANUP")
 
     def _log_to_error_file(self, msg: str, level: str, category: str, exception: Optional[Exception] = None):
         """Log to dedicated error file"""
-        with self.log_lock:
-            try:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                pygame_time = pygame.time.get_ticks() if pygame.get_init() else 0
-
-                entry = f"[{timestamp}][{pygame_time:06d}][{level}][{category}] {msg}"
-
-                with open(self.error_log, 'a', encoding='utf-8') as f:
-                    f.write(entry + "\n")
-
-                    if exception:
-                        f.write(f"Exception type: {type(exception).__name__}\n")
-                        f.write(f"Exception args: {exception.args}\n")
-                        tb = traceback.format_exception(type(exception), exception, exception.__traceback__)
-                        f.write("".join(tb) + "\n")
-                        f.write("-" * 50 + "\n")
+        try:
+            pygame_time = pygame.time.get_ticks() if pygame.get_init() else 0
+            channel = self._error_channel
+            channel.log(level, category, msg, pygame_time)
+
+            if exception:
+                tb = traceback.format_exception(type(exception), exception, exception.__traceback__)
+                channel.write(
+                    f"Exception type: {type(exception).__name__}\n"
+                    f"Exception args: {exception.args}\n"
+                    + "".join(tb)
+                    + "\n"
+                    + "-" * 50
+                    + "\n",
+                    important=True,
+                )
 
-            except Exception:
-                pass  # Silently fail to avoid recursion
+        except Exception:
+            pass  # Silently fail to avoid recursion
 
     def log_performance_detailed(self, operation: str, duration_ms: float, context: Optional[Dict[str, Any]] = None):
         """Log detailed performance data"""
-        if not self.enable_performance_logging or self.performance_log is None:
+        if not self.enable_performance_logging or self._performance_channel is None:
             return
 
-        with self.log_lock:
-            try:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        try:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
 
-                perf_data = {
-                    'timestamp': timestamp,
-                    'operation': operation,
-                    'duration_ms': duration_ms,
-                    'context': context or {},
-                }
+            perf_data = {
+                'timestamp': timestamp,
+                'operation': operation,
+                'duration_ms': duration_ms,
+                'context': context or {},
+            }
 
-                with open(self.performance_log, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(perf_data) + "\n")
+            self._performance_channel.write(json.dumps(perf_data) + "\n")
 
-            except Exception:
-                pass
+        except Exception:
+            pass
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until every queued log line has been written to disk"""
+        return get_log_writer().flush(timeout)
 
     def get_error_statistics(self) -> Dict[str, Any]:
         """Get error statistics for this session"""
@@ -459,7 +493,7 @@ class ErrorHandler:
 
         # Log context if provided
         if context:
-            self.logger.debug(f"Error context for {operation}: {context}", operation)
+            self.logger.debug(f"Error context for {operation}: {context}", category=operation)
 
         # Some operations can be safely retried
         if operation in ['audio_playback', 'sprite_particles', 'floating_text']:
@@ -472,13 +506,33 @@ class ErrorHandler:
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            if self.handle_exception(operation, e):
-                self.logger.debug(f"Retrying {operation} after error", operation)
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e2:
-                    self.logger.error(f"Retry failed for {operation}: {e2}", operation)
-            return None
+            return self._recover(func, operation, e, args, kwargs)
+
+    def guard(self, func, operation: str):
+        """Return a pre-bound safe wrapper for func.
+
+        The wrapper is built once and reused every frame; the normal path is a single
+        try block, logging/retry bookkeeping only runs after an exception is raised.
+        """
+
+        def guarded(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return self._recover(func, operation, e, args, kwargs)
+
+        guarded.__name__ = getattr(func, '__name__', 'guarded')
+        return guarded
+
+    def _recover(self, func, operation: str, exception: Exception, args, kwargs):
+        """Slow path shared by guarded calls: same retry-once semantics as safe_call"""
+        if self.handle_exception(operation, exception):
+            self.logger.debug(f"Retrying {operation} after error", category=operation)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e2:
+                self.logger.error(f"Retry failed for {operation}: {e2}", operation)
+        return None
 
 
 def create_performance_timer(logger: Logger, operation: str):
@@ -487,12 +541,15 @@ def create_performance_timer(logger: Logger, operation: str):
     class PerformanceTimer:
         def __init__(self):
             self.start_time = None
+            self.zone = profile_zone(operation)
 
         def __enter__(self):
+            self.zone.__enter__()
             self.start_time = pygame.time.get_ticks()
             return self
 
         def __exit__(self, exc_type, exc_val, exc_tb):
+            self.zone.__exit__(exc_type, exc_val, exc_tb)
             if self.start_time is not None:
                 duration = pygame.time.get_ticks() - self.start_time
                 logger.log_performance(operation, duration)
@@ -78,7 +78,7 @@ class MemoryMonitor:
 
             # 记录日志
             if self.logger:
-                self.logger.debug(f"MEMORY_DATA|rss|{memory_mb:.2f}|vms|{memory_info.vms/1024/1024:.2f}")
+                self.logger.debug("MEMORY_DATA|rss|%.2f|vms|%.2f", memory_mb, memory_info.vms / 1024 / 1024)
 
             self.last_check = current_time
 
@@ -0,0 +1,108 @@
+import heapq
+from typing import List, Optional, Tuple
+
+from .tile_grid import TileGrid
+
+"""
+网格寻路 (Pathfinding)
+基于父指针的 A*（曼哈顿启发式，四方向），在一维可行走掩码上运行；
+深度上限 max_depth 对应原 BFS 的 max_path_length，节点上限 max_nodes 限制单次搜索的展开数。
+"""
+
+
+Position = Tuple[int, int]
+
+# 敌人寻路可通过的瓦片（玩家所在格可作为终点/途经点）
+PATH_WALKABLE_TILES = '.@'
+
+DEFAULT_MAX_DEPTH = 20
+
+
+def build_walkable_mask(level, walkable: str = PATH_WALKABLE_TILES) -> bytearray:
+    """返回一维可行走掩码（下标 y * width + x，可行走为 1）；支持 TileGrid 与 list[str]"""
+    if isinstance(level, TileGrid):
+        return level.walkable_mask(walkable)
+    table = bytearray(256)
+    for ch in walkable:
+        table[ord(ch)] = 1
+    width = len(level[0]) if len(level) else 0
+    # 行长不一致时按首行宽度截断/补墙，保证下标计算正确
+    data = b''.join(
+        (row if isinstance(row, str) else ''.join(row))[:width].ljust(width, '#').encode('latin-1', 'replace')
+        for row in level
+    )
+    return bytearray(data.translate(table))
+
+
+def find_path(
+    start: Position,
+    goal: Position,
+    walkable: bytearray,
+    width: int,
+    height: int,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    max_nodes: Optional[int] = None,
+) -> List[Position]:
+    """A* 寻路，返回不含起点、含终点的路径；找不到（或超出深度/节点上限）时返回 []
+
+    终点本身不要求可行走（例如玩家所在格）；路径长度不超过 max_depth。
+    """
+    if start == goal:
+        return []
+    sx, sy = start
+    gx, gy = goal
+    if not (0 <= sx < width and 0 <= sy < height and 0 <= gx < width and 0 <= gy < height):
+        return []
+    if abs(gx - sx) + abs(gy - sy) > max_depth:
+        return []
+
+    start_idx = sy * width + sx
+    goal_idx = gy * width + gx
+    parent = {start_idx: -1}
+    g_cost = {start_idx: 0}
+    # (f, -g, idx)：f 相同时优先展开更深的节点，更快抵达终点
+    open_heap = [(abs(gx - sx) + abs(gy - sy), 0, start_idx)]
+    expanded = 0
+
+    while open_heap:
+        _, neg_g, idx = heapq.heappop(open_heap)
+        g = -neg_g
+        if g != g_cost.get(idx):
+            continue  # 过期条目
+        if idx == goal_idx:
+            return _reconstruct(parent, idx, width)
+        if g >= max_depth:
+            continue
+        expanded += 1
+        if max_nodes is not None and expanded > max_nodes:
+            break
+
+        x = idx % width
+        y = idx // width
+        ng = g + 1
+        for nx, ny in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            nidx = ny * width + nx
+            if nidx != goal_idx and not walkable[nidx]:
+                continue
+            old = g_cost.get(nidx)
+            if old is not None and old <= ng:
+                continue
+            f = ng + abs(gx - nx) + abs(gy - ny)
+            if f > max_depth:
+                continue  # 启发式可采纳：经此节点的路径必然超出深度上限
+            g_cost[nidx] = ng
+            parent[nidx] = idx
+            heapq.heappush(open_heap, (f, -ng, nidx))
+
+    return []
+
+
+def _reconstruct(parent, idx: int, width: int) -> List[Position]:
+    path = []
+    while parent[idx] != -1:
+        path.append((idx % width, idx // width))
+        idx = parent[idx]
+    path.reverse()
+    return path
@@ -1,7 +1,20 @@
 import pygame
 import time
 from typing import Dict, List, Set, Any
-from collections import defaultdict, deque
+from collections import defaultdict
+
+from .telemetry import (
+    COL_ENTITIES,
+    COL_FPS,
+    COL_FRAME,
+    COL_FRAME_MS,
+    COL_MEMORY_MB,
+    COL_RENDER_MS,
+    COL_TIME,
+    COL_UPDATE_MS,
+    COL_VISIBLE_TILES,
+    TelemetryRing,
+)
 
 """
 Performance optimization utilities
@@ -20,15 +33,13 @@ except ImportError:
 class PerformanceMonitor:
     """Real-time performance monitoring and data collection"""
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, telemetry_capacity: int = 4096):
         self.logger = logger
         self.enabled = False
 
-        # Performance data storage
-        self.frame_times = deque(maxlen=120)  # Last 2 seconds at 60fps
-        self.render_times = deque(maxlen=120)
-        self.update_times = deque(maxlen=120)
-        self.memory_usage = deque(maxlen=60)  # Last 1 second
+        # Performance data storage: one preallocated row per frame (see game/telemetry.py)
+        self.telemetry = TelemetryRing(telemetry_capacity)
+        self.stats_window = 120  # Last 2 seconds at 60fps
 
         # Frame timing
         self.last_frame_time = time.perf_counter()
@@ -66,20 +77,20 @@ class PerformanceMonitor:
             return
 
         current_time = time.perf_counter()
+        telemetry = self.telemetry
+        telemetry.begin_row()
+        telemetry.set(COL_FRAME, self.stats['total_frames'])
+        telemetry.set(COL_TIME, current_time)
 
         # Calculate frame time from previous frame
         if self.last_frame_time > 0:
             frame_time = (current_time - self.last_frame_time) * 1000  # Convert to ms
-            self.frame_times.append(frame_time)
+            telemetry.set(COL_FRAME_MS, frame_time)
 
             # Check for dropped frames
             if frame_time > self.thresholds['frame_time_ms'] * 1.5:
                 self.stats['dropped_frames'] += 1
 
-            # Log performance data to file
-            if self.logger:
-                self.logger.debug(f"PERF_DATA|frame_time|{frame_time:.2f}")
-
         self.frame_start_time = current_time
         self.last_frame_time = current_time
         self.stats['total_frames'] += 1
@@ -92,26 +103,20 @@ class PerformanceMonitor:
                 (self.stats['avg_fps'] + self.current_fps) / 2 if self.stats['avg_fps'] > 0 else self.current_fps
             )
 
-            # Log FPS data
-            if self.logger:
-                self.logger.debug(f"PERF_DATA|fps|{self.current_fps}")
-
             self.fps_counter = 0
             self.fps_timer = current_time
+        telemetry.set(COL_FPS, self.current_fps)
 
         # Update memory usage every second (simplified)
         if current_time - self.memory_timer >= 1.0:
             try:
                 # Use a simple memory estimation
                 memory_mb = len(str(pygame.display.get_surface())) / 1024 if pygame.display.get_surface() else 0
-                self.memory_usage.append(memory_mb)
+                telemetry.set(COL_MEMORY_MB, memory_mb)
 
                 if memory_mb > self.stats['peak_memory']:
                     self.stats['peak_memory'] = memory_mb
 
-                if self.logger:
-                    self.logger.debug(f"PERF_DATA|memory|{memory_mb:.1f}")
-
                 self.memory_timer = current_time
             except Exception:
                 pass  # Ignore memory monitoring errors
@@ -132,43 +137,84 @@ class PerformanceMonitor:
     def record_render_time(self, render_time_ms: float):
         """Record rendering time"""
         if self.enabled:
-            self.render_times.append(render_time_ms)
-            if self.logger:
-                self.logger.debug(f"PERF_DATA|render_time|{render_time_ms:.2f}")
+            self.record_sample(COL_RENDER_MS, render_time_ms)
 
     def record_update_time(self, update_time_ms: float):
         """Record game update time"""
         if self.enabled:
-            self.update_times.append(update_time_ms)
-            if self.logger:
-                self.logger.debug(f"PERF_DATA|update_time|{update_time_ms:.2f}")
+            self.record_sample(COL_UPDATE_MS, update_time_ms)
+
+    def record_sample(self, col: int, value: float):
+        """Write one telemetry column (COL_* from game.telemetry) of the current frame row.
+
+        A second sample for the same column before the next start_frame() opens a new row,
+        so samples recorded outside the frame loop are not overwritten.
+        """
+        if not self.enabled:
+            return
+        telemetry = self.telemetry
+        current = telemetry.get(col)
+        if current == current:
+            telemetry.begin_row()
+        telemetry.set(col, value)
+
+    def record_counts(self, entities: int, visible_tiles: int):
+        """Record the entity count and the player's visible tile count for this frame"""
+        if self.enabled:
+            self.telemetry.set(COL_ENTITIES, entities)
+            self.telemetry.set(COL_VISIBLE_TILES, visible_tiles)
+
+    @property
+    def frame_times(self):
+        """Recent frame times (ms), oldest first"""
+        return self.telemetry.recent('frame_ms', self.stats_window)
+
+    @property
+    def render_times(self):
+        return self.telemetry.recent('render_ms', self.stats_window)
+
+    @property
+    def update_times(self):
+        return self.telemetry.recent('update_ms', self.stats_window)
+
+    @property
+    def memory_usage(self):
+        return self.telemetry.recent('memory_mb')[-60:]
+
+    def dump_telemetry(self, path: str) -> int:
+        """Write the telemetry ring to path (.npz or binary .tlm); returns the number of rows"""
+        return self.telemetry.dump(path)
 
     def get_current_stats(self) -> Dict[str, Any]:
         """Get current performance statistics"""
         if not self.enabled:
             return {}
 
+        memory_usage = self.memory_usage
         stats = {
             'fps': self.current_fps,
             'avg_fps': self.stats['avg_fps'],
             'total_frames': self.stats['total_frames'],
             'dropped_frames': self.stats['dropped_frames'],
             'drop_rate': (self.stats['dropped_frames'] / max(1, self.stats['total_frames'])) * 100,
-            'memory_mb': self.memory_usage[-1] if self.memory_usage else 0,
+            'memory_mb': memory_usage[-1] if memory_usage else 0,
             'peak_memory_mb': self.stats['peak_memory'],
         }
 
         # Add timing statistics
-        if self.frame_times:
-            stats['avg_frame_time'] = sum(self.frame_times) / len(self.frame_times)
-            stats['min_frame_time'] = min(self.frame_times)
-            stats['max_frame_time'] = max(self.frame_times)
+        frame_times = self.frame_times
+        if frame_times:
+            stats['avg_frame_time'] = sum(frame_times) / len(frame_times)
+            stats['min_frame_time'] = min(frame_times)
+            stats['max_frame_time'] = max(frame_times)
 
-        if self.render_times:
-            stats['avg_render_time'] = sum(self.render_times) / len(self.render_times)
+        render_times = self.render_times
+        if render_times:
+            stats['avg_render_time'] = sum(render_times) / len(render_times)
 
-        if self.update_times:
-            stats['avg_update_time'] = sum(self.update_times) / len(self.update_times)
+        update_times = self.update_times
+        if update_times:
+            stats['avg_update_time'] = sum(update_times) / len(update_times)
 
         return stats
 
@@ -196,9 +242,9 @@ class PerformanceMonitor:
 class PerformanceOptimizer:
     """Analyzes and optimizes game performance"""
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, telemetry_capacity: int = 4096):
         self.logger = logger
-        self.monitor = PerformanceMonitor(logger)
+        self.monitor = PerformanceMonitor(logger, telemetry_capacity)
 
         # Enhanced cache management
         if MEMORY_SYSTEM_AVAILABLE:
@@ -232,6 +278,9 @@ class PerformanceOptimizer:
         self.cache_cleanup_interval = 300  # frames
         self.frame_count = 0
 
+        # 外部子系统的统计提供者（如渲染器字形图集），在 get_stats 中汇总
+        self.stats_providers: Dict[str, Any] = {}
+
     def start_frame(self):
         """Start frame performance monitoring"""
         self.monitor.start_frame()
@@ -273,8 +322,19 @@ class PerformanceOptimizer:
             cache_stats = self.cache_manager.get_cache_stats()
             stats['cache_stats'] = cache_stats
 
+        # Add registered subsystem statistics
+        for name, provider in self.stats_providers.items():
+            try:
+                stats[name] = provider()
+            except Exception:
+                pass
+
         return stats
 
+    def register_stats_provider(self, name: str, provider) -> None:
+        """注册子系统统计提供者，provider() 返回的字典会以 name 为键并入 get_stats()"""
+        self.stats_providers[name] = provider
+
     def check_performance_issues(self, performance_data: Dict[str, List[float]]) -> List[str]:
         """Analyze performance data and return list of issues"""
         issues = []
@@ -353,7 +413,7 @@ class PerformanceOptimizer:
             return surface
         except Exception as e:
             if self.logger:
-                self.logger.warning(f"Font rendering failed: {e}", "PERFORMANCE")
+                self.logger.warning(f"Font rendering failed: {e}", category="PERFORMANCE")
             return None
 
     def _cleanup_font_cache(self):
@@ -363,7 +423,7 @@ class PerformanceOptimizer:
         for key in items_to_remove:
             del self.font_cache[key]
 
-        self.logger.debug(f"Cleaned font cache, removed {len(items_to_remove)} items", "PERFORMANCE")
+        self.logger.debug(f"Cleaned font cache, removed {len(items_to_remove)} items", category="PERFORMANCE")
 
     def suggest_optimizations(self, config, performance_data: Dict[str, List[float]]) -> List[str]:
         """Suggest specific optimizations based on performance data"""
@@ -1,5 +1,6 @@
 import random
 from .fov import FOVSystem
+from .utils import set_tile
 from .experience import (
     calculate_exp_required, 
     calculate_exp_to_next_level, 
@@ -206,8 +207,8 @@ class Player:
             return result
 
         # perform move
-        level[self.y] = level[self.y][: self.x] + '.' + level[self.y][self.x + 1 :]
-        level[ny] = level[ny][:nx] + '@' + level[ny][nx + 1 :]
+        set_tile(level, self.x, self.y, '.', force=True)
+        set_tile(level, nx, ny, '@', force=True)
         self.x = nx
         self.y = ny
         result['moved'] = True
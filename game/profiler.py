@@ -0,0 +1,232 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+"""
+分层区段性能分析 (Zone Profiler)
+with profile_zone('ai.pathfind'): 或 @profiled('ai.pathfind') 标记一段代码；区段可以嵌套，
+每个区段同时计总耗时与自身耗时（扣除子区段）。
+- 关闭时 profile_zone 返回共享的空上下文，@profiled 只多一次标志判断，不计时、不分配
+- 开启后记录每次进入/退出（有界队列），可导出 Chrome trace_event JSON（chrome://tracing / Perfetto）
+  与按区段汇总的表格
+"""
+
+
+# 一条区段记录：(名称, 开始 ns, 持续 ns, 线程 id, 帧号)
+Event = Tuple[str, int, int, int, int]
+
+
+class _NullZone:
+    """关闭时使用的空上下文"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_ZONE = _NullZone()
+
+
+class _Zone:
+    __slots__ = ('profiler', 'name', 'start', 'child', 'stack')
+
+    def __init__(self, profiler: 'ZoneProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.stack = self.profiler._stack()
+        stack.append(self)
+        self.child = 0
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = time.perf_counter_ns() - self.start
+        stack = self.stack
+        stack.pop()
+        if stack:
+            stack[-1].child += duration
+        self.profiler._record(self.name, self.start, duration, duration - self.child)
+        return False
+
+
+class ZoneProfiler:
+    """收集嵌套区段耗时：按区段汇总，并保留最近 max_events 条记录用于导出 trace"""
+
+    def __init__(self, max_events: int = 200000):
+        self.enabled = False
+        self.events: Deque[Event] = deque(maxlen=max_events)
+        # 区段名 -> [调用次数, 总 ns, 自身 ns, 最大 ns]
+        self.totals: Dict[str, List[int]] = {}
+        self.frame = 0
+        self.frames = 0
+        self._frame_zone: Optional[_Zone] = None
+        self._origin = time.perf_counter_ns()
+        self._local = threading.local()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        self.events.clear()
+        self.totals.clear()
+        self.frame = 0
+        self.frames = 0
+        self._frame_zone = None
+        self._origin = time.perf_counter_ns()
+        self._local = threading.local()
+
+    def zone(self, name: str):
+        """区段上下文；关闭时为共享的空上下文"""
+        if not self.enabled:
+            return _NULL_ZONE
+        return _Zone(self, name)
+
+    def _stack(self) -> List[_Zone]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name: str, start: int, duration: int, self_time: int) -> None:
+        total = self.totals.get(name)
+        if total is None:
+            total = self.totals[name] = [0, 0, 0, 0]
+        total[0] += 1
+        total[1] += duration
+        total[2] += self_time
+        if duration > total[3]:
+            total[3] = duration
+        self.events.append((name, start, duration, threading.get_ident(), self.frame))
+
+    def begin_frame(self) -> None:
+        """主循环每帧开始时调用；到 end_frame 为止记为最外层的 'frame' 区段"""
+        if self._frame_zone is not None:
+            # 上一帧提前 continue 没有走到 end_frame
+            self.end_frame()
+        if self.enabled:
+            zone = self._frame_zone = _Zone(self, 'frame')
+            zone.__enter__()
+
+    def end_frame(self) -> None:
+        zone = self._frame_zone
+        if zone is not None:
+            self._frame_zone = None
+            zone.__exit__(None, None, None)
+            self.frames += 1
+        self.frame += 1
+
+    def get_table(self) -> List[Dict[str, Any]]:
+        """按总耗时降序的区段汇总（毫秒）"""
+        frames = max(1, self.frames)
+        rows = []
+        for name, (calls, total, self_time, peak) in self.totals.items():
+            rows.append(
+                {
+                    'zone': name,
+                    'calls': calls,
+                    'total_ms': total / 1e6,
+                    'self_ms': self_time / 1e6,
+                    'avg_ms': total / calls / 1e6,
+                    'max_ms': peak / 1e6,
+                    'per_frame_ms': total / frames / 1e6,
+                }
+            )
+        rows.sort(key=lambda r: -r['total_ms'])
+        return rows
+
+    def format_table(self) -> str:
+        lines = [
+            f"{'zone':<22} | {'calls':>7} | {'total ms':>9} | {'self ms':>9} | {'avg ms':>7} | {'max ms':>7} | {'ms/frame':>8}",
+            '-' * 88,
+        ]
+        for row in self.get_table():
+            lines.append(
+                f"{row['zone']:<22} | {row['calls']:7d} | {row['total_ms']:9.2f} | {row['self_ms']:9.2f} | "
+                f"{row['avg_ms']:7.3f} | {row['max_ms']:7.2f} | {row['per_frame_ms']:8.3f}"
+            )
+        return '\n'.join(lines)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace_event 格式（'X' 完整事件，时间单位微秒）"""
+        pid = os.getpid()
+        origin = self._origin
+        trace = []
+        for name, start, duration, tid, frame in self.events:
+            trace.append(
+                {
+                    'name': name,
+                    'cat': name.split('.', 1)[0],
+                    'ph': 'X',
+                    'ts': (start - origin) / 1000,
+                    'dur': duration / 1000,
+                    'pid': pid,
+                    'tid': tid,
+                    'args': {'frame': frame},
+                }
+            )
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def write_report(self, path: str) -> str:
+        """写出 trace JSON 到 path，汇总表写到同名 .txt；返回表格文本"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+        table = self.format_table()
+        with open(os.path.splitext(path)[0] + '.txt', 'w', encoding='utf-8') as f:
+            f.write(table + '\n')
+        return table
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'frames': self.frames,
+            'zones': len(self.totals),
+            'events': len(self.events),
+        }
+
+
+# 进程内共享实例（默认关闭）
+_profiler = ZoneProfiler()
+
+
+def get_profiler() -> ZoneProfiler:
+    """进程内共享的区段分析器"""
+    return _profiler
+
+
+def profile_zone(name: str):
+    """with profile_zone('render.tiles'): ...；关闭时几乎没有开销"""
+    if not _profiler.enabled:
+        return _NULL_ZONE
+    return _Zone(_profiler, name)
+
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """把整个函数记为一个区段的装饰器"""
+
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _profiler.enabled:
+                return fn(*args, **kwargs)
+            with _Zone(_profiler, name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
@@ -3,12 +3,28 @@ from typing import Set, Tuple
 from game import ui, utils
 from game.debug import DebugOverlay
 from game.fov import TileVisibility
+from game.glyph_atlas import (
+    GlyphAtlas,
+    TILE_COLORS,
+    PLAYER_FLASH_COLOR,
+    ENEMY_FLASH_COLOR,
+    ENEMY_KIND_GLYPHS,
+    ENEMY_KIND_COLORS,
+    dim_color,
+)
+from game.profiler import profiled
+from game.terrain_layer import TerrainLayer, DYNAMIC_TILES
+from game.tile_grid import row_codes, tile_getter
 
 """
 Rendering management for the game
 """
 
 
+# 查找表标记：该 (字符, 可见性) 需要逐格决定字形与颜色
+_DYNAMIC_GLYPH = object()
+
+
 
 class Renderer:
     """Manages all rendering operations"""
@@ -66,6 +82,18 @@ class Renderer:
             else:
                 logger.info("使用系统默认字体")
 
+        # Glyph atlas: each (glyph, color) is rasterized once, the tile pass only blits
+        self.glyph_atlas = GlyphAtlas(self.font, config.tile_size)
+        self.glyph_atlas.prewarm()
+        self._glyph_table = None
+        self._glyph_table_key = None
+
+        # Static terrain layer: chunks are blitted whole, only dirty cells are re-rasterized
+        self.terrain_layer = None
+        if getattr(config, 'terrain_cache', True):
+            self.terrain_layer = TerrainLayer(self.glyph_atlas, config.tile_size)
+            utils.add_tile_listener(self.terrain_layer.mark_dirty)
+
         # Initialize debug overlay - always create it but enable/disable based on config
         if logger:
             self.debug_overlay = DebugOverlay(config, logger)
@@ -89,6 +117,7 @@ class Renderer:
             self.view_px_h = new_view_px_h
             self.screen = pygame.display.set_mode((self.view_px_w, self.view_px_h))
 
+    @profiled('render.frame')
     def render_frame(self, player, entity_mgr, floating_texts, npcs=None):
         """Render a complete frame"""
         from game.state import GameStateEnum
@@ -123,7 +152,10 @@ class Renderer:
         self.screen.fill((0, 0, 0))
 
         # Render level tiles
-        self._render_level_tiles(x0, y0, x1, y1, entity_mgr, player, ox, oy)
+        if self.terrain_layer is not None:
+            self._render_terrain(x0, y0, x1, y1, entity_mgr, player, ox, oy)
+        else:
+            self._render_level_tiles(x0, y0, x1, y1, entity_mgr, player, ox, oy)
 
         # Render UI elements
         self._render_ui(player, floating_texts, entity_mgr, ox, oy)
@@ -292,103 +324,165 @@ class Renderer:
         
         # 不在这里调用 flip()，让主渲染方法统一处理
 
+    def _tile_glyph_table(self):
+        """(字符码, 可见性) -> 字形 Surface 的查找表，下标 code * 4 + visibility
+
+        HIDDEN 为 None（跳过）；玩家与可见敌人的颜色/外观逐帧变化，标记为 _DYNAMIC_GLYPH 走逐格路径。
+        """
+        atlas = self.glyph_atlas
+        key = (atlas.font, atlas.tile_size, atlas.invalidations)
+        if self._glyph_table_key == key:
+            return self._glyph_table
+        table = [_DYNAMIC_GLYPH] * (256 * 4)
+        for code in range(256):
+            table[code * 4 + TileVisibility.HIDDEN] = None
+        for ch, color in TILE_COLORS.items():
+            code = ord(ch)
+            if ch != '@':
+                # 雾中的敌人只显示为已探索地面
+                fog_ch = '.' if ch == 'E' else ch
+                table[code * 4 + TileVisibility.EXPLORED] = atlas.get(fog_ch, dim_color(TILE_COLORS[fog_ch]))
+            if ch not in ('@', 'E'):
+                table[code * 4 + TileVisibility.VISIBLE] = atlas.get(ch, color)
+        self._glyph_table = table
+        self._glyph_table_key = key
+        return table
+
+    @profiled('render.tiles')
     def _render_level_tiles(self, x0: int, y0: int, x1: int, y1: int, entity_mgr, player, ox: int, oy: int):
-        """Render the level tiles with FOV support"""
-        for y in range(y0, y1):
-            if y >= len(self.game_state.level):
-                continue
-            row = self.game_state.level[y]
-
-            for x in range(x0, x1):
-                if x >= len(row):
+        """Render the level tiles with FOV support
+
+        每帧一次取出视口的可见性数组，静态瓦片查表后批量 blit；玩家/可见敌人单独绘制。
+        """
+        # Invalidate cached glyphs if the font or tile size changed
+        glyph_atlas = self.glyph_atlas
+        glyph_atlas.ensure(self.font, self.config.tile_size)
+        get_glyph = glyph_atlas.get
+        table = self._tile_glyph_table()
+
+        level = self.game_state.level
+        y1 = min(y1, len(level))
+        if x1 <= x0 or y1 <= y0:
+            return
+        fov_system = getattr(player, 'fov_system', None) if getattr(self.config, 'enable_fov', False) else None
+        if fov_system is not None:
+            vis_rows = fov_system.get_visibility_rows(x0, y0, x1, y1)
+        else:
+            vis_rows = [bytes([TileVisibility.VISIBLE]) * (x1 - x0)] * (y1 - y0)
+
+        ts = self.config.tile_size
+        cam_x = self.game_state.cam_x
+        cam_y = self.game_state.cam_y
+        xs = range(x0, x1)
+        cols = [int(x * ts - cam_x + ox) for x in xs]
+        blits = []
+        dynamic = []
+        for y, vis_row in zip(range(y0, y1), vis_rows):
+            codes = row_codes(level, y, x0, x1)
+            py = int(y * ts - cam_y + oy)
+            for x, px, code, vis in zip(xs, cols, codes, vis_row):
+                surf = table[code * 4 + vis]
+                if surf is None:
                     continue
-
-                ch = row[x]
-                # If this is an enemy tile, capture entity for glyph/color customization
-                ent_here_for_glyph = None
-                if ch == 'E' and entity_mgr:
-                    try:
-                        ent_here_for_glyph = entity_mgr.get_entity_at(x, y)
-                    except Exception:
-                        ent_here_for_glyph = None
-
-                # Check if FOV is enabled in config
+                if surf is _DYNAMIC_GLYPH:
+                    dynamic.append((x, y, vis))
+                    continue
+                blits.append((surf, (px, py)))
+        if blits:
+            self.screen.blits(blits, doreturn=False)
+
+        for x, y, visibility in dynamic:
+            ch = chr(row_codes(level, y, x, x + 1)[0])
+            # If this is an enemy tile, capture entity for glyph/color customization
+            ent_here_for_glyph = None
+            if ch == 'E' and entity_mgr:
+                try:
+                    ent_here_for_glyph = entity_mgr.get_entity_at(x, y)
+                except Exception:
+                    ent_here_for_glyph = None
+            if visibility == TileVisibility.EXPLORED:
+                # 对于雾中的敌人：不显示敌人本身，只显示地面（避免“敌人离开视野仍可见”）
+                if ch == 'E':
+                    ch = '.'
+                color = self._get_explored_tile_color(ch, x, y, entity_mgr, player)
+            else:
+                color = self._get_tile_color(ch, x, y, entity_mgr, player)
+            if fov_system is None:
                 visibility = None
-                if hasattr(self.config, 'enable_fov') and self.config.enable_fov:
-                    visibility = TileVisibility.get_visibility_state(x, y, player.fov_system)
-                    if visibility == TileVisibility.HIDDEN:
-                        # 未探索直接跳过
-                        continue
-                    if visibility == TileVisibility.EXPLORED:
-                        # 对于雾中的敌人：不显示敌人本身，只显示地面（避免“敌人离开视野仍可见”）
-                        ch_for_render = ch
-                        if ch == 'E':
-                            ch_for_render = '.'  # 显示成已探索地面
-                        color = self._get_explored_tile_color(ch_for_render, x, y, entity_mgr, player)
-                        # 覆盖 ch 供后续 glyph 渲染使用（保持与颜色一致）
-                        ch = ch_for_render
-                    else:  # VISIBLE
-                        color = self._get_tile_color(ch, x, y, entity_mgr, player)
-                else:
-                    color = self._get_tile_color(ch, x, y, entity_mgr, player)
-
-                # Decide glyph+color override for enemies by kind
-                render_ch = ch
-                render_color = color
-                # 仅在敌人当前可见时才渲染其种类特殊外观（EXPLORED 状态下已转成 floor）
-                if ch == 'E' and ent_here_for_glyph and (visibility is None or visibility == TileVisibility.VISIBLE):
-                    try:
-                        kind = getattr(ent_here_for_glyph, 'kind', 'basic')
-                        glyph_map = {
-                            'basic': 'e',
-                            'guard': 'G',
-                            'scout': 's',
-                            'brute': 'B',
-                        }
-                        kind_color_map = {
-                            'basic': (220, 100, 100),
-                            'guard': (240, 160, 80),
-                            'scout': (180, 140, 240),
-                            'brute': (255, 80, 80),
-                        }
-                        render_ch = glyph_map.get(kind, 'E')
-                        # If enemy flash active, keep flash color priority
-                        if not (ent_here_for_glyph and self.game_state.enemy_flash.get(getattr(ent_here_for_glyph, 'id', None), 0) > 0):
-                            render_color = kind_color_map.get(kind, color)
-                    except Exception:
-                        render_ch = 'E'
-                surf = self.font.render(render_ch, True, render_color)
-                px = x * self.config.tile_size - self.game_state.cam_x + ox
-                py = y * self.config.tile_size - self.game_state.cam_y + oy
-                self.screen.blit(surf, (int(px), int(py)))
+            self._blit_tile(x, y, ch, color, visibility, ent_here_for_glyph, ox, oy, get_glyph)
+
+    @profiled('render.terrain')
+    def _render_terrain(self, x0: int, y0: int, x1: int, y1: int, entity_mgr, player, ox: int, oy: int):
+        """Blit the cached terrain layer, then draw dynamic glyphs (player, enemies, NPCs) on top"""
+        layer = self.terrain_layer
+        self.glyph_atlas.ensure(self.font, self.config.tile_size)
+        fov_enabled = bool(getattr(self.config, 'enable_fov', False))
+        fov_system = getattr(player, 'fov_system', None) if fov_enabled else None
+        level = self.game_state.level
+        layer.bind(level, self.config.tile_size, fov_enabled)
+        layer.draw(self.screen, x0, y0, x1, y1, self.game_state.cam_x, self.game_state.cam_y, ox, oy, fov_system)
+
+        # 动态层：只有当前可见的动态字形需要逐格绘制（雾中的已由地形层绘制）
+        get_glyph = self.glyph_atlas.get
+        get_tile = tile_getter(level)
+        for x, y in list(layer.dynamic_cells):
+            if not (x0 <= x < x1 and y0 <= y < y1):
+                continue
+            ch = get_tile(x, y)
+            if ch not in DYNAMIC_TILES:
+                continue
+            visibility = None
+            if fov_system is not None:
+                visibility = TileVisibility.get_visibility_state(x, y, fov_system)
+                if visibility != TileVisibility.VISIBLE:
+                    continue
+            ent_here_for_glyph = None
+            if ch == 'E' and entity_mgr:
+                try:
+                    ent_here_for_glyph = entity_mgr.get_entity_at(x, y)
+                except Exception:
+                    ent_here_for_glyph = None
+            color = self._get_tile_color(ch, x, y, entity_mgr, player)
+            self._blit_tile(x, y, ch, color, visibility, ent_here_for_glyph, ox, oy, get_glyph)
+
+    def _blit_tile(self, x: int, y: int, ch: str, color, visibility, ent_here_for_glyph, ox: int, oy: int, get_glyph):
+        """Blit one tile glyph, applying the enemy-kind glyph/color override"""
+        # Decide glyph+color override for enemies by kind
+        render_ch = ch
+        render_color = color
+        # 仅在敌人当前可见时才渲染其种类特殊外观（EXPLORED 状态下已转成 floor）
+        if ch == 'E' and ent_here_for_glyph and (visibility is None or visibility == TileVisibility.VISIBLE):
+            try:
+                kind = getattr(ent_here_for_glyph, 'kind', 'basic')
+                render_ch = ENEMY_KIND_GLYPHS.get(kind, 'E')
+                # If enemy flash active, keep flash color priority
+                if not (ent_here_for_glyph and self.game_state.enemy_flash.get(getattr(ent_here_for_glyph, 'id', None), 0) > 0):
+                    render_color = ENEMY_KIND_COLORS.get(kind, color)
+            except Exception:
+                render_ch = 'E'
+        surf = get_glyph(render_ch, render_color)
+        px = x * self.config.tile_size - self.game_state.cam_x + ox
+        py = y * self.config.tile_size - self.game_state.cam_y + oy
+        self.screen.blit(surf, (int(px), int(py)))
 
     def _get_tile_color(self, ch: str, x: int, y: int, entity_mgr, player) -> Tuple[int, int, int]:
         """Get the color for a tile character"""
-        if ch == '#':
-            return (100, 100, 100)
-        elif ch == '@':
+        if ch == '@':
             if player.flash_time > 0:
-                return (255, 255, 255)
-            return (255, 215, 0)
-        elif ch == 'X':
-            return (150, 255, 150)
-        elif ch == 'N':
-            return (180, 150, 255)
+                return PLAYER_FLASH_COLOR
+            return TILE_COLORS['@']
         elif ch == 'E':
             ent_here = entity_mgr.get_entity_at(x, y) if entity_mgr else None
             if ent_here and self.game_state.enemy_flash.get(getattr(ent_here, 'id', None), 0) > 0:
-                return (255, 180, 180)
-            return (220, 100, 100)
-        else:  # '.' or other
-            return (200, 200, 200)
+                return ENEMY_FLASH_COLOR
+            return TILE_COLORS['E']
+        # '#', 'X', 'N', '.' or other
+        return TILE_COLORS.get(ch, TILE_COLORS['.'])
 
     def _get_explored_tile_color(self, ch: str, x: int, y: int, entity_mgr, player) -> Tuple[int, int, int]:
         """Get the color for an explored but not currently visible tile (fog of war)"""
-        # 获取正常颜色然后调暗
-        normal_color = self._get_tile_color(ch, x, y, entity_mgr, player)
-        # 应用雾化效果：显著降低亮度
-        fog_factor = 0.3
-        return (int(normal_color[0] * fog_factor), int(normal_color[1] * fog_factor), int(normal_color[2] * fog_factor))
+        # 获取正常颜色然后调暗（雾化效果：显著降低亮度）
+        return dim_color(self._get_tile_color(ch, x, y, entity_mgr, player))
 
     def _render_ui(self, player, floating_texts, entity_mgr, ox: int, oy: int):
         """Render UI elements"""
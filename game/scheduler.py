@@ -0,0 +1,49 @@
+from typing import Any, Dict, List, Tuple
+
+"""
+时间轮调度器 (Timing Wheel)
+按 tick 分桶保存到期项目；每个 tick 只访问当前槽位，代价与到期项目数成正比，与总数无关。
+间隔超过槽位数的项目留在槽中等待下一圈。
+"""
+
+
+class TimingWheel:
+    """哈希时间轮：槽位 = due_tick % slots"""
+
+    def __init__(self, slots: int = 64):
+        # 槽位数取 2 的幂，用位与代替取模
+        size = 1
+        while size < max(1, slots):
+            size <<= 1
+        self._slots: List[List[Tuple[int, Any]]] = [[] for _ in range(size)]
+        self._mask = size - 1
+        self._count = 0
+
+    def schedule(self, due_tick: int, item: Any) -> None:
+        """在 due_tick 到期时返回 item"""
+        self._slots[due_tick & self._mask].append((due_tick, item))
+        self._count += 1
+
+    def pop_due(self, tick: int) -> List[Any]:
+        """取出所有在 tick 到期的项目（按入队顺序）"""
+        slot = self._slots[tick & self._mask]
+        if not slot:
+            return []
+        due = [item for t, item in slot if t == tick]
+        if len(due) == len(slot):
+            slot.clear()
+        else:
+            slot[:] = [(t, item) for t, item in slot if t != tick]
+        self._count -= len(due)
+        return due
+
+    def clear(self) -> None:
+        for slot in self._slots:
+            slot.clear()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'slots': len(self._slots), 'scheduled': self._count}
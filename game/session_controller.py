@@ -42,6 +42,7 @@ def setup_initial_level(
     """Setup entities/NPCs and initialize camera/FOV; returns (entity_mgr, npcs)."""
     entity_mgr, npcs = floor_manager.setup_level(game_state.level)
     floor_manager.write_initial_snapshot(game_state.level)
+    floor_manager.prefetch_next_floor()
 
     # Initialize camera
     game_state.cam_x = player.x * config.tile_size - renderer.view_px_w // 2
@@ -2,6 +2,8 @@ import pygame
 import os
 from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING, Tuple
 from enum import Enum
+from game.log_sink import get_log_writer
+from game.tile_grid import as_tile_grid, find_tiles
 
 """
 Game state management
@@ -12,6 +14,10 @@ if TYPE_CHECKING:
     from game.logger import Logger
 
 
+# Repository root: game.log and logs/ live here
+_ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+
 class GameStateEnum(Enum):
     """游戏状态枚举"""
     MAIN_MENU = "main_menu"     # 主菜单状态
@@ -58,19 +64,25 @@ class GameState:
 
         # Game logs for debug display
         self.game_logs = []
+        # Disk channels for game.log / exit_log.txt (created on first write, shared buffered sink)
+        self._game_log_channel = None
+        self._exit_log_channel = None
 
         # Camera state
         self.cam_x = 0
         self.cam_y = 0
 
-    def set_level(self, level: List[str]):
-        """Set the current level and update dimensions"""
-        self.level = level
-        # Accept list-of-strings or list-of-list-of-chars
+    def set_level(self, level):
+        """Set the current level and update dimensions
+
+        list-of-strings / list-of-list-of-chars 会被转换为 TileGrid；已是 TileGrid 时保持同一对象。
+        """
         try:
-            self.width = len(level[0]) if level else 0
-            self.height = len(level)
+            self.level = as_tile_grid(level)
+            self.width = self.level.width
+            self.height = self.level.height
         except Exception:
+            self.level = level
             self.width = 0
             self.height = 0
 
@@ -93,25 +105,21 @@ class GameState:
             # Debug log for troubleshooting
             if hasattr(self, 'logger') and self.logger:
                 level_info = f"{self.width}x{self.height}" if self.level else "empty"
-                self.logger.debug(f"Computing exit_pos for level {level_info}", "EXIT")
+                self.logger.debug(f"Computing exit_pos for level {level_info}", category="EXIT")
             
             # Look for 'X' in the level
-            found_exits = []
-            for y, row in enumerate(self.level):
-                for x, ch in enumerate(row):
-                    if ch == 'X':
-                        found_exits.append((x, y))
+            found_exits = find_tiles(self.level, 'X')
             
             if found_exits:
                 # Use the first exit found
                 self.exit_pos = found_exits[0]
                 if hasattr(self, 'logger') and self.logger:
-                    self.logger.debug(f"Found exit at {self.exit_pos}, total exits: {len(found_exits)}", "EXIT")
+                    self.logger.debug(f"Found exit at {self.exit_pos}, total exits: {len(found_exits)}", category="EXIT")
             else:
                 self.exit_pos = None
                 if hasattr(self, 'logger') and self.logger:
                     x_count = sum(row.count('X') for row in self.level) if self.level else 0
-                    self.logger.warning(f"No exit found in level! X count: {x_count}", "EXIT")
+                    self.logger.warning(f"No exit found in level! X count: {x_count}", category="EXIT")
                     
         except Exception as e:
             self.exit_pos = None
@@ -126,7 +134,13 @@ class GameState:
         self.floor_number = floor_number
 
         # Set pending floor parameters
-        self.pending_floor = {
+        self.pending_floor = self.floor_params(floor_number, gen_seed)
+
+        self.floor_transition = {'time': 1100, 'text': f'第 {floor_number} 层'}
+
+    def floor_params(self, floor_number: int, gen_seed: int) -> dict:
+        """Generation parameters for a floor (also used to match prefetched floors)"""
+        return {
             'seed': gen_seed,
             'floor': floor_number,
             'width': self.config.map_width,
@@ -138,8 +152,6 @@ class GameState:
             'corridor_radius': self.config.corridor_radius,
         }
 
-        self.floor_transition = {'time': 1100, 'text': f'第 {floor_number} 层'}
-
     def increment_floor(self):
         """Increment the floor number (compatibility for tests)."""
         self.floor_number += 1
@@ -285,29 +297,36 @@ class GameState:
         if len(self.game_logs) > self.config.game_log_max:
             del self.game_logs[0]
 
-        # Also append to disk log
+        # Also append to disk log (buffered, written by the log sink thread)
         try:
-            log_path = os.path.join(os.path.dirname(__file__), '..', 'game.log')
-            with open(log_path, 'a', encoding='utf-8') as lf:
-                lf.write(entry + "\n")
+            if self._game_log_channel is None:
+                self._game_log_channel = self._open_log_channel(os.path.join(_ROOT_DIR, 'game.log'))
+            self._game_log_channel.write(entry + "\n")
         except Exception:
             pass
 
     def write_exit_log(self, msg: str):
         """Write to the persistent exit log"""
         try:
-            dbg_dir = os.path.join(os.path.dirname(__file__), '..', 'logs', 'session')
-            try:
-                os.makedirs(dbg_dir, exist_ok=True)
-            except Exception:
-                pass
-            p = os.path.join(dbg_dir, 'exit_log.txt')
-            with open(p, 'a', encoding='utf-8') as lf:
-                ts = pygame.time.get_ticks() if 'pygame' in globals() else 0
-                lf.write(f'[{ts}] {msg}\n')
+            if self._exit_log_channel is None:
+                self._exit_log_channel = self._open_log_channel(os.path.join(_ROOT_DIR, 'logs', 'session', 'exit_log.txt'))
+            ts = pygame.time.get_ticks() if pygame.get_init() else 0
+            self._exit_log_channel.write(f'[{ts}] {msg}\n')
         except Exception:
             pass
 
+    def _open_log_channel(self, path: str):
+        """Append-only channel on the shared log sink; with config.log_ring set it stays in memory until dump_logs()"""
+        return get_log_writer().channel(path, ring_size=int(getattr(self.config, 'log_ring', 0) or 0))
+
+    def dump_logs(self) -> int:
+        """Write in-memory (ring) game/exit logs to disk now; returns the number of lines queued"""
+        return sum(chan.dump() for chan in (self._game_log_channel, self._exit_log_channel) if chan is not None)
+
+    def flush_logs(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until queued game/exit log lines are on disk"""
+        return get_log_writer().flush(timeout)
+
     def update_camera(self, player_x: int, player_y: int, view_px_w: int, view_px_h: int):
         """Update camera position with smooth following"""
         tile_size = self.config.tile_size
@@ -359,7 +378,7 @@ class GameState:
         old_state = self.current_state
         self.current_state = new_state
         if self.logger:
-            self.logger.info(f"游戏状态切换: {old_state.value} -> {new_state.value}", "STATE")
+            self.logger.info(f"游戏状态切换: {old_state.value} -> {new_state.value}", category="STATE")
 
     def is_main_menu(self) -> bool:
         """检查是否在主菜单"""
@@ -395,12 +414,12 @@ class GameState:
             ex, ey = self.exit_pos
             self.pending_target = (ex * tile_size + tile_size // 2, ey * tile_size + tile_size // 2)
             if self.logger:
-                self.logger.debug(f"方位指示器已刷新，指向新出口位置: {self.exit_pos}", "INDICATOR")
+                self.logger.debug(f"方位指示器已刷新，指向新出口位置: {self.exit_pos}", category="INDICATOR")
         else:
             # 如果新楼层没有出口，隐藏指示器
             self.pending_target = None
             if self.logger:
-                self.logger.warning("新楼层没有出口，已隐藏方位指示器", "INDICATOR")
+                self.logger.warning("新楼层没有出口，已隐藏方位指示器", category="INDICATOR")
 
     def toggle_exit_indicator(self):
         """API expected by tests to toggle the exit indicator on/off."""
@@ -0,0 +1,173 @@
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+"""
+帧遥测环形缓冲 (Telemetry Ring)
+每帧一行、每列一个指标，全部存放在预先分配的 array('d') 中：录制只做下标赋值，游戏循环里不创建列表/字符串。
+- 新的一行先整体填成 NaN（未记录），由各子系统写入自己的列
+- dump() 写出紧凑二进制（.tlm：小文件头 + 原始 float64）或 .npz（需要 numpy）
+- load_telemetry() 读回 {列名: 按时间排序的数组}，供离线分析工具使用
+"""
+
+
+# 列定义（顺序即二进制文件中的列顺序）
+FIELDS: Tuple[str, ...] = (
+    'frame',          # 帧序号
+    'time',           # 帧开始时刻（perf_counter 秒）
+    'frame_ms',       # 距上一帧开始的间隔
+    'input_ms',       # 事件与输入处理
+    'update_ms',      # 游戏系统更新
+    'transition_ms',  # 楼层切换处理
+    'render_ms',      # 渲染
+    'entities',       # 敌人数量
+    'visible_tiles',  # 玩家视野格数
+    'fps',
+    'memory_mb',      # 只在每秒采样的那一帧写入
+)
+
+(
+    COL_FRAME,
+    COL_TIME,
+    COL_FRAME_MS,
+    COL_INPUT_MS,
+    COL_UPDATE_MS,
+    COL_TRANSITION_MS,
+    COL_RENDER_MS,
+    COL_ENTITIES,
+    COL_VISIBLE_TILES,
+    COL_FPS,
+    COL_MEMORY_MB,
+) = range(len(FIELDS))
+
+NAN = float('nan')
+
+# 二进制文件头：魔数、字节序、列数、行数，随后是以 \n 连接的列名
+_MAGIC = b'TLM1'
+_HEADER = struct.Struct('<4scxII')
+
+
+class TelemetryRing:
+    """固定容量的逐帧指标环形缓冲，写满后覆盖最旧的行"""
+
+    def __init__(self, capacity: int = 4096, fields: Sequence[str] = FIELDS):
+        self.fields = tuple(fields)
+        self.stride = len(self.fields)
+        self.capacity = max(1, int(capacity))
+        self.columns: Dict[str, int] = {name: i for i, name in enumerate(self.fields)}
+        self._data = array('d', [NAN]) * (self.capacity * self.stride)
+        self._blank = array('d', [NAN]) * self.stride
+        # 已开始的总行数（含被覆盖的）；当前行在 _data 中的起始下标
+        self.count = 0
+        self.base = -self.stride
+
+    def begin_row(self) -> int:
+        """开始新的一行（全部列置为 NaN），返回该行起始下标"""
+        base = (self.count % self.capacity) * self.stride
+        self._data[base:base + self.stride] = self._blank
+        self.count += 1
+        self.base = base
+        return base
+
+    def set(self, col: int, value: float) -> None:
+        """写入当前行的第 col 列（没有当前行时先开始一行）"""
+        if self.count == 0:
+            self.begin_row()
+        self._data[self.base + col] = value
+
+    def get(self, col: int) -> float:
+        """当前行第 col 列的值（未记录为 NaN）"""
+        if self.count == 0:
+            return NAN
+        return self._data[self.base + col]
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def recent(self, name: str, limit: Optional[int] = None) -> List[float]:
+        """某列最近 limit 行中已记录的值（按时间顺序，跳过 NaN）；用于统计，不在录制路径上"""
+        col = self.columns[name]
+        rows = len(self)
+        if limit is not None:
+            rows = min(rows, limit)
+        data = self._data
+        stride = self.stride
+        capacity = self.capacity
+        out = []
+        for n in range(self.count - rows, self.count):
+            v = data[(n % capacity) * stride + col]
+            if v == v:
+                out.append(v)
+        return out
+
+    def snapshot(self) -> array:
+        """按时间顺序复制全部有效行（行优先的 float64 数组）"""
+        rows = len(self)
+        split = (self.count % self.capacity) * self.stride
+        if self.count <= self.capacity:
+            return self._data[:rows * self.stride]
+        return self._data[split:] + self._data[:split]
+
+    def dump(self, path: str) -> int:
+        """写出到 path（.npz 使用 numpy，其余写 .tlm 二进制），返回行数"""
+        data = self.snapshot()
+        rows = len(data) // self.stride
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith('.npz'):
+            import numpy as np
+
+            table = np.frombuffer(data, dtype=np.float64).reshape(rows, self.stride)
+            np.savez(path, **{name: table[:, i] for i, name in enumerate(self.fields)})
+            return rows
+        names = '\n'.join(self.fields).encode('utf-8')
+        order = b'<' if sys.byteorder == 'little' else b'>'
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, order, self.stride, rows))
+            f.write(struct.pack('<I', len(names)))
+            f.write(names)
+            data.tofile(f)
+        return rows
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'rows': len(self),
+            'capacity': self.capacity,
+            'recorded': self.count,
+            'bytes': self._data.itemsize * len(self._data),
+        }
+
+
+def load_telemetry(path: str) -> Dict[str, Any]:
+    """读取 dump() 写出的文件，返回 {列名: 数组}；有 numpy 时为 ndarray（零拷贝视图），否则为 array('d')"""
+    if path.endswith('.npz'):
+        import numpy as np
+
+        with np.load(path) as npz:
+            return {name: npz[name] for name in npz.files}
+
+    with open(path, 'rb') as f:
+        magic, order, stride, rows = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f'not a telemetry file: {path}')
+        (names_len,) = struct.unpack('<I', f.read(4))
+        fields = f.read(names_len).decode('utf-8').split('\n')
+        payload = f.read(rows * stride * 8)
+    swap = order != (b'<' if sys.byteorder == 'little' else b'>')
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        table = np.frombuffer(payload, dtype=np.dtype('<f8' if order == b'<' else '>f8')).reshape(rows, stride)
+        return {name: table[:, i] for i, name in enumerate(fields)}
+
+    data = array('d')
+    data.frombytes(payload)
+    if swap:
+        data.byteswap()
+    return {name: data[i::stride] for i, name in enumerate(fields)}
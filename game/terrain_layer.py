@@ -0,0 +1,232 @@
+import pygame
+from typing import Any, Dict, List, Optional, Set, Tuple
+from game.fov import TileVisibility
+from game.glyph_atlas import TILE_COLORS, dim_color
+from game.tile_grid import find_tiles, tile_getter
+
+"""
+静态地形层 (Terrain Layer)
+墙、地面、出口等几乎不变的瓦片预渲染到分块 Surface 中，每帧只按相机位置整块 blit；
+通过 utils.set_tile 改变的格子以及视野变化的格子被标记为脏格子，只重绘这些格子。
+敌人/玩家/NPC 等动态字形由 Renderer 在其上单独绘制。
+"""
+
+
+# 由动态层绘制的字形（可见时地形层留空）
+DYNAMIC_TILES = frozenset('@EN')
+
+_DIM_COLORS: Dict[str, Tuple[int, int, int]] = {ch: dim_color(color) for ch, color in TILE_COLORS.items()}
+
+
+def terrain_key(ch: str, visibility: int) -> Optional[Tuple[str, Tuple[int, int, int]]]:
+    """返回地形层在该格子上应绘制的 (glyph, color)，None 表示留空"""
+    if visibility == TileVisibility.HIDDEN:
+        return None
+    if visibility == TileVisibility.EXPLORED:
+        # 雾中的敌人只显示为已探索地面
+        if ch == 'E':
+            ch = '.'
+        return (ch, _DIM_COLORS.get(ch, _DIM_COLORS['.']))
+    if ch in DYNAMIC_TILES:
+        return None
+    return (ch, TILE_COLORS.get(ch, TILE_COLORS['.']))
+
+
+class TerrainLayer:
+    """分块缓存的静态地形层"""
+
+    def __init__(self, glyph_atlas, tile_size: int, chunk_size: int = 16):
+        self.glyph_atlas = glyph_atlas
+        self.tile_size = tile_size
+        self.chunk_size = chunk_size
+
+        self.level: Optional[List[str]] = None
+        self.width = 0
+        self.height = 0
+        self.fov_enabled: Optional[bool] = None
+
+        self._chunks: Dict[Tuple[int, int], Any] = {}
+        self._cell_keys: List[Optional[Tuple[str, Tuple[int, int, int]]]] = []
+        self._dirty: Set[Tuple[int, int]] = set()
+        self._last_visible: Set[Tuple[int, int]] = set()
+        self._explored_count = 0
+        self._fov_version: Optional[int] = None
+        self._fov_source: Any = None
+        self._atlas_generation = getattr(glyph_atlas, 'invalidations', 0)
+
+        # 当前地图上的动态字形位置，供动态层遍历
+        self.dynamic_cells: Set[Tuple[int, int]] = set()
+
+        # 统计
+        self.rebuilds = 0
+        self.chunks_built = 0
+        self.cells_redrawn = 0
+        self.delta_syncs = 0
+
+    def bind(self, level: List[str], tile_size: int, fov_enabled: bool) -> None:
+        """绑定当前关卡；关卡对象、尺寸、瓦片大小、字体或 FOV 开关变化时整体重建"""
+        width = len(level[0]) if level else 0
+        if (
+            level is not self.level
+            or len(level) != self.height
+            or width != self.width
+            or tile_size != self.tile_size
+            or fov_enabled != self.fov_enabled
+            or getattr(self.glyph_atlas, 'invalidations', 0) != self._atlas_generation
+        ):
+            self.reset(level, tile_size, fov_enabled)
+
+    def reset(self, level: List[str], tile_size: int, fov_enabled: bool) -> None:
+        """丢弃所有分块并重新扫描动态字形"""
+        self.level = level
+        self.height = len(level)
+        self.width = len(level[0]) if level else 0
+        self.tile_size = tile_size
+        self.fov_enabled = fov_enabled
+        self._atlas_generation = getattr(self.glyph_atlas, 'invalidations', 0)
+
+        self._chunks.clear()
+        self._cell_keys = [None] * (self.width * self.height)
+        self._dirty.clear()
+        self._last_visible = set()
+        self._explored_count = 0
+        self._fov_version = None
+        self._fov_source = None
+
+        dynamic = set()
+        for ch in DYNAMIC_TILES:
+            dynamic.update(find_tiles(level, ch))
+        self.dynamic_cells = dynamic
+        self.rebuilds += 1
+
+    def mark_dirty(self, level, x: int, y: int) -> None:
+        """utils.set_tile 监听回调：标记单个格子需要重绘"""
+        if level is self.level:
+            self._dirty.add((x, y))
+
+    def sync_visibility(self, fov_system) -> None:
+        """把视野变化的格子标记为脏格子
+
+        视野系统只前进了一个版本时直接使用其 last_delta（进入/离开视野的格子），
+        否则退回到与上次可见集合做对称差。
+        """
+        if fov_system is None:
+            return
+        explored = len(fov_system.previously_seen)
+        if explored < self._explored_count:
+            # 探索记录被清空（换层/重置），整体重建
+            self.reset(self.level, self.tile_size, self.fov_enabled)
+        self._explored_count = explored
+
+        visible = fov_system.visible_tiles
+        version = getattr(fov_system, 'version', None)
+        tracked = version is not None and fov_system is self._fov_source
+        if tracked and version == self._fov_version:
+            return
+        if tracked and version == self._fov_version + 1:
+            entered, left = fov_system.last_delta
+            self._dirty.update(entered)
+            self._dirty.update(left)
+            self.delta_syncs += 1
+        elif visible != self._last_visible:
+            self._dirty.update(visible ^ self._last_visible)
+        # 视野系统每次重算都替换集合而不原地修改，保留引用即可
+        self._last_visible = visible if version is not None else set(visible)
+        self._fov_version = version
+        self._fov_source = fov_system
+
+    def draw(self, screen, x0: int, y0: int, x1: int, y1: int, cam_x: float, cam_y: float, ox: int, oy: int, fov_system=None) -> None:
+        """把 [x0, x1) x [y0, y1) 范围的地形按分块 blit 到屏幕"""
+        if x1 <= x0 or y1 <= y0:
+            return
+        if self.fov_enabled:
+            self.sync_visibility(fov_system)
+        else:
+            fov_system = None
+        if self._dirty:
+            self._flush_dirty(fov_system)
+
+        ts = self.tile_size
+        cs = self.chunk_size
+        span = cs * ts
+
+        prev_clip = screen.get_clip()
+        view = pygame.Rect(int(x0 * ts - cam_x + ox), int(y0 * ts - cam_y + oy), (x1 - x0) * ts, (y1 - y0) * ts)
+        screen.set_clip(view.clip(prev_clip))
+        try:
+            for cy in range(y0 // cs, (y1 - 1) // cs + 1):
+                for cx in range(x0 // cs, (x1 - 1) // cs + 1):
+                    chunk = self._chunks.get((cx, cy))
+                    if chunk is None:
+                        chunk = self._build_chunk(cx, cy, fov_system)
+                    screen.blit(chunk, (int(cx * span - cam_x + ox), int(cy * span - cam_y + oy)))
+        finally:
+            screen.set_clip(prev_clip)
+
+    def _visibility(self, x: int, y: int, fov_system) -> int:
+        if fov_system is None:
+            return TileVisibility.VISIBLE
+        return TileVisibility.get_visibility_state(x, y, fov_system)
+
+    def _flush_dirty(self, fov_system) -> None:
+        """只重绘脏格子"""
+        get_tile = tile_getter(self.level)
+        cs = self.chunk_size
+        for x, y in self._dirty:
+            if not (0 <= y < self.height and 0 <= x < self.width):
+                continue
+            ch = get_tile(x, y)
+            if ch in DYNAMIC_TILES:
+                self.dynamic_cells.add((x, y))
+            else:
+                self.dynamic_cells.discard((x, y))
+            chunk = self._chunks.get((x // cs, y // cs))
+            if chunk is not None:
+                self._draw_cell(chunk, x, y, ch, fov_system)
+        self._dirty.clear()
+
+    def _build_chunk(self, cx: int, cy: int, fov_system):
+        """首次进入视野时光栅化整个分块"""
+        cs = self.chunk_size
+        span = cs * self.tile_size
+        chunk = pygame.Surface((span, span))
+        try:
+            chunk = chunk.convert()
+        except Exception:
+            pass
+        chunk.fill((0, 0, 0))
+        level = self.level
+        for y in range(cy * cs, min(self.height, (cy + 1) * cs)):
+            row = level[y]
+            for x in range(cx * cs, min(self.width, (cx + 1) * cs)):
+                self._cell_keys[y * self.width + x] = None
+                self._draw_cell(chunk, x, y, row[x], fov_system)
+        self._chunks[(cx, cy)] = chunk
+        self.chunks_built += 1
+        return chunk
+
+    def _draw_cell(self, chunk, x: int, y: int, ch: str, fov_system) -> None:
+        idx = y * self.width + x
+        key = terrain_key(ch, self._visibility(x, y, fov_system))
+        if key == self._cell_keys[idx]:
+            return
+        ts = self.tile_size
+        cs = self.chunk_size
+        px = (x % cs) * ts
+        py = (y % cs) * ts
+        chunk.fill((0, 0, 0), (px, py, ts, ts))
+        if key is not None:
+            chunk.blit(self.glyph_atlas.get(*key), (px, py))
+        self._cell_keys[idx] = key
+        self.cells_redrawn += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """地形层统计，供 PerformanceOptimizer.get_stats 汇总"""
+        return {
+            'chunks': len(self._chunks),
+            'chunks_built': self.chunks_built,
+            'cells_redrawn': self.cells_redrawn,
+            'rebuilds': self.rebuilds,
+            'dynamic_cells': len(self.dynamic_cells),
+            'delta_syncs': self.delta_syncs,
+        }
@@ -0,0 +1,199 @@
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+"""
+瓦片网格 (TileGrid)
+以一维 bytearray（每格一个 uint8 字符码）存储地图，提供 O(1) 的读写和批量查询；
+同时保留 level[y][x] / level[y] = row / for row in level 等 list[str] 兼容接口。
+"""
+
+
+Position = Tuple[int, int]
+
+# 默认可行走的瓦片
+WALKABLE_TILES = '.'
+
+_EXIT_CODE = ord('X')
+
+
+class TileGrid:
+    """基于 uint8 字节数组的二维瓦片网格"""
+
+    __slots__ = ('width', 'height', '_data', '_rows')
+
+    def __init__(self, width: int, height: int, fill: str = '#'):
+        self.width = max(0, int(width))
+        self.height = max(0, int(height))
+        self._data = bytearray(fill.encode('latin-1')) * (self.width * self.height)
+        # 行字符串缓存：兼容 level[y] 读取，写入对应行时失效
+        self._rows: List[Optional[str]] = [None] * self.height
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Union[str, Sequence[str]]]) -> 'TileGrid':
+        """由 list[str] 或 list[list[str]] 构造；行长不一致时按首行宽度截断/补墙"""
+        lines = [row if isinstance(row, str) else ''.join(row) for row in rows]
+        grid = cls(len(lines[0]) if lines else 0, len(lines))
+        w = grid.width
+        for y, line in enumerate(lines):
+            line = line[:w].ljust(w, '#')
+            grid._data[y * w:(y + 1) * w] = line.encode('latin-1')
+        return grid
+
+    def to_rows(self) -> List[str]:
+        """导出为 list[str]"""
+        return [self[y] for y in range(self.height)]
+
+    def copy(self) -> 'TileGrid':
+        grid = TileGrid(0, 0)
+        grid.width = self.width
+        grid.height = self.height
+        grid._data = bytearray(self._data)
+        grid._rows = list(self._rows)
+        return grid
+
+    # ---- 单格读写 ----
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x: int, y: int) -> str:
+        """读取 (x, y) 处字符（调用方负责边界检查）"""
+        return chr(self._data[y * self.width + x])
+
+    def set(self, x: int, y: int, ch: str) -> None:
+        """O(1) 写入 (x, y) 处字符"""
+        self._data[y * self.width + x] = ord(ch)
+        self._rows[y] = None
+
+    def put(self, x: int, y: int, ch: str, force: bool = False) -> bool:
+        """带边界检查和出口保护的写入（utils.set_tile 的快速路径），返回是否写入"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        data = self._data
+        idx = y * self.width + x
+        if data[idx] == _EXIT_CODE and ch != 'X' and not force:
+            return False
+        data[idx] = ord(ch)
+        self._rows[y] = None
+        return True
+
+    # ---- 批量查询 ----
+
+    def find(self, ch: str) -> Optional[Position]:
+        """返回第一个 ch 的位置"""
+        idx = self._data.find(ord(ch))
+        if idx < 0:
+            return None
+        return idx % self.width, idx // self.width
+
+    def find_all(self, ch: str) -> List[Position]:
+        """返回所有 ch 的位置（按行优先顺序）"""
+        data = self._data
+        w = self.width
+        code = ord(ch)
+        out = []
+        idx = data.find(code)
+        while idx >= 0:
+            out.append((idx % w, idx // w))
+            idx = data.find(code, idx + 1)
+        return out
+
+    def count(self, ch: str) -> int:
+        return self._data.count(ord(ch))
+
+    def floor_cells(self) -> List[Position]:
+        """所有地面格子"""
+        return self.find_all('.')
+
+    def walkable_mask(self, walkable: str = WALKABLE_TILES) -> bytearray:
+        """返回与网格同尺寸的一维掩码，可行走为 1，否则为 0（下标 y * width + x）"""
+        table = bytearray(256)
+        for ch in walkable:
+            table[ord(ch)] = 1
+        return self._data.translate(table)
+
+    # ---- list[str] 兼容接口 ----
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __bool__(self) -> bool:
+        return self.height > 0
+
+    def __getitem__(self, y):
+        if isinstance(y, slice):
+            return [self[i] for i in range(*y.indices(self.height))]
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError('TileGrid row index out of range')
+        row = self._rows[y]
+        if row is None:
+            w = self.width
+            row = self._data[y * w:(y + 1) * w].decode('latin-1')
+            self._rows[y] = row
+        return row
+
+    def __setitem__(self, y: int, row: Union[str, Sequence[str]]) -> None:
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError('TileGrid row index out of range')
+        if not isinstance(row, str):
+            row = ''.join(row)
+        w = self.width
+        if len(row) != w:
+            raise ValueError(f'row width {len(row)} != grid width {w}')
+        self._data[y * w:(y + 1) * w] = row.encode('latin-1')
+        self._rows[y] = row
+
+    def __iter__(self) -> Iterator[str]:
+        for y in range(self.height):
+            yield self[y]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TileGrid):
+            return self.width == other.width and self._data == other._data
+        try:
+            rows = [row if isinstance(row, str) else ''.join(row) for row in other]
+        except TypeError:
+            return NotImplemented
+        return rows == self.to_rows()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f'TileGrid({self.width}x{self.height})'
+
+
+def as_tile_grid(level) -> TileGrid:
+    """确保得到 TileGrid（已是 TileGrid 时原样返回）"""
+    if isinstance(level, TileGrid):
+        return level
+    return TileGrid.from_rows(level or [])
+
+
+def tile_getter(level) -> Callable[[int, int], str]:
+    """返回 (x, y) -> ch 的读取函数，TileGrid 直接读字节数组，list 地图按行索引"""
+    if isinstance(level, TileGrid):
+        return level.get
+    return lambda x, y: level[y][x]
+
+
+def row_codes(level, y: int, x0: int, x1: int) -> bytes:
+    """第 y 行 [x0, x1) 的字符码（uint8），TileGrid 直接切字节数组"""
+    if isinstance(level, TileGrid):
+        base = y * level.width
+        return bytes(level._data[base + x0:base + x1])
+    return level[y][x0:x1].encode('latin-1')
+
+
+def find_tiles(level, ch: str) -> List[Position]:
+    """查找地图中所有 ch 的位置，支持 TileGrid 与 list 地图"""
+    if isinstance(level, TileGrid):
+        return level.find_all(ch)
+    out = []
+    for y, row in enumerate(level):
+        for x, c in enumerate(row):
+            if c == ch:
+                out.append((x, y))
+    return out
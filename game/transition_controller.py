@@ -65,7 +65,7 @@ def apply_floor_transition(
 def log_transition_triggered(logger, next_floor: int, seed: int) -> None:
     """Log that a floor transition has been triggered."""
     try:
-        logger.info(f"Floor transition triggered: floor {next_floor}, seed {seed}", "FLOOR")
+        logger.info(f"Floor transition triggered: floor {next_floor}, seed {seed}", category="FLOOR")
     except Exception:
         pass
 
@@ -83,7 +83,7 @@ def log_transition_summary(logger, game_state, entity_mgr: Optional[entities.Ent
             )
         logger.info(
             f"楼层转换完成：第 {game_state.floor_number} 层 | 地图 {width}x{height} | 敌人 {enemy_count} | 实体 {total_entities}",
-            "FLOOR",
+            category="FLOOR",
         )
     except Exception:
         pass
@@ -2,6 +2,8 @@ import pygame
 import math
 from typing import Dict, Optional, Tuple, Callable, Any
 
+from game.profiler import profiled
+
 
 def add_floating_text(game_state, text: str, x_px: int, y_px: int, time_ms: int = 1000, alpha: int = 255, **flags):
     """Add a generic floating text entry with optional flags (damage, experience, level_up, floor_complete, etc.)."""
@@ -169,6 +171,7 @@ def draw_stamina_bar(surface, x, y, width, height, stamina, max_stamina, font=No
         pass
 
 
+@profiled('ui.hud')
 def draw_player_hud(surface, player, ox, oy, view_px_w, font_path=None, tile_size=24):
     """Draw a small HUD showing HP, stamina bar, level and experience at top.
     player: Player instance with hp, stamina, max_stamina, sprint_cooldown, level, experience
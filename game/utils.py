@@ -1,9 +1,27 @@
 import os
 import json
+import random
 import pygame
-from typing import Optional
+import weakref
+from typing import List, NamedTuple, Optional, Tuple
 import time
 from pathlib import Path
+from .tile_grid import TileGrid
+
+
+# set_tile 变更监听者（弱引用），用于渲染缓存等标记脏格子
+_tile_listeners = []
+
+
+def make_rng(seed: Optional[int] = None, stream: str = '') -> random.Random:
+    """由楼层种子派生独立的 random.Random 实例。
+
+    stream 区分同一种子下的不同用途（如地图生成与敌人 AI），互不消耗对方的随机序列；
+    seed 为 None 时使用系统熵。
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f'{seed}:{stream}' if stream else seed)
 
 
 def get_seed() -> int:
@@ -31,6 +49,8 @@ def write_json_atomic(path: str, data, *, encoding: str = 'utf-8', indent: int =
     os.replace(temp_name, str(p))
 
 def find_player(level):
+    if isinstance(level, TileGrid):
+        return level.find('@')
     for y, row in enumerate(level):
         x = row.find("@")
         if x != -1:
@@ -38,7 +58,47 @@ def find_player(level):
     return None
 
 
-def set_tile(level, x, y, ch):
+def add_tile_listener(callback):
+    """注册 set_tile 变更监听者，回调签名为 callback(level, x, y)。
+
+    绑定方法以弱引用保存，监听者对象被回收后自动失效。
+    """
+    try:
+        ref = weakref.WeakMethod(callback)
+    except TypeError:
+        ref = weakref.ref(callback)
+    _tile_listeners.append(ref)
+
+
+def remove_tile_listener(callback):
+    """移除 set_tile 变更监听者"""
+    _tile_listeners[:] = [r for r in _tile_listeners if r() is not None and r() != callback]
+
+
+def notify_tile_changed(level, x, y):
+    """通知监听者 level 上 (x, y) 已改变"""
+    if not _tile_listeners:
+        return
+    dead = False
+    for ref in _tile_listeners:
+        cb = ref()
+        if cb is None:
+            dead = True
+            continue
+        try:
+            cb(level, x, y)
+        except Exception:
+            pass
+    if dead:
+        _tile_listeners[:] = [r for r in _tile_listeners if r() is not None]
+
+
+def set_tile(level, x, y, ch, force: bool = False):
+    # TileGrid: O(1) in-place write instead of rebuilding the row string
+    if isinstance(level, TileGrid):
+        if level.put(x, y, ch, force) and _tile_listeners:
+            notify_tile_changed(level, x, y)
+        return
     # defensive: avoid accidentally overwriting an exit 'X' unless caller explicitly forces it
     try:
         row = level[y]
@@ -49,9 +109,10 @@ def set_tile(level, x, y, ch):
     except Exception:
         return
     # if there's an exit here, don't overwrite it by default
-    if cur == 'X' and ch != 'X':
+    if cur == 'X' and ch != 'X' and not force:
         return
     level[y] = row[:x] + ch + row[x + 1 :]
+    notify_tile_changed(level, x, y)
 
 
 def load_preferred_font(tile_size):
@@ -196,8 +257,8 @@ def load_chinese_font(tile_size):
     return font, used_path
 
 
-def load_level(fallback_level):
-    """尝试从 data/level.txt 加载地图；若不存在则返回 fallback_level（list of str）。"""
+def load_level_file():
+    """读取外部地图 data/level.txt；不存在或为空时返回 None"""
     path = os.path.join(os.path.dirname(__file__), '..', 'data', 'level.txt')
     if os.path.exists(path):
         try:
@@ -207,6 +268,14 @@ def load_level(fallback_level):
                     return lines
         except Exception:
             pass
+    return None
+
+
+def load_level(fallback_level):
+    """尝试从 data/level.txt 加载地图；若不存在则返回 fallback_level（list of str）。"""
+    lines = load_level_file()
+    if lines is not None:
+        return lines
     # 如果没有地图文件，则生成一个简单的地牢作为回退
     try:
         w = len(fallback_level[0]) if fallback_level and len(fallback_level) > 0 else 24
@@ -216,7 +285,154 @@ def load_level(fallback_level):
         return fallback_level
 
 
-def generate_dungeon(
+def _room_mst_legacy(centers):
+    """原 Prim 实现：每轮扫描 已访问×未访问 的全部房间对，O(n^3)。
+
+    平局时的选择依赖 set 的迭代顺序，保留它是为了让旧种子生成完全相同的拓扑。
+    """
+    remaining = set(range(len(centers)))
+    visited = {remaining.pop()}
+    edges = []
+    while remaining:
+        best = None
+        best_pair = None
+        for a in visited:
+            (ax, ay) = centers[a]
+            for b in remaining:
+                (bx, by) = centers[b]
+                dist = abs(ax - bx) + abs(ay - by)
+                if best is None or dist < best:
+                    best = dist
+                    best_pair = (a, b)
+        if best_pair is None:
+            break
+        a, b = best_pair
+        edges.append((a, b))
+        visited.add(b)
+        remaining.remove(b)
+    return edges
+
+
+def _room_mst_heap(centers):
+    """基于优先队列的 Prim 最小生成树（曼哈顿距离），O(n^2 log n)。
+
+    只在某房间的候选距离变短时才入堆；平局按 (距离, a, b) 决定，结果与 set 顺序无关。
+    """
+    import heapq
+
+    n = len(centers)
+    if n == 0:
+        return []
+    in_tree = [False] * n
+    best = [None] * n
+    heap = []
+    edges = []
+    current = 0
+    in_tree[0] = True
+    for _ in range(n - 1):
+        (ax, ay) = centers[current]
+        for b in range(n):
+            if in_tree[b]:
+                continue
+            (bx, by) = centers[b]
+            dist = abs(ax - bx) + abs(ay - by)
+            if best[b] is None or dist < best[b]:
+                best[b] = dist
+                heapq.heappush(heap, (dist, current, b))
+        while heap:
+            dist, a, b = heapq.heappop(heap)
+            if not in_tree[b] and dist == best[b]:
+                break
+        else:
+            break
+        edges.append((a, b))
+        in_tree[b] = True
+        current = b
+    return edges
+
+
+def _room_candidate_edges(centers):
+    """曼哈顿最小生成树的候选边（扫描线法），至多 4n 条，O(n log n)。
+
+    对每个房间只保留 4 个相邻 45° 扇区里最近的房间：按 x+y 排序后扫描，用按 -y 有序的
+    活动列表找出以当前房间为最近邻的房间并出列。四次坐标变换覆盖全部方向，
+    曼哈顿距离下这样的候选图必含一棵最小生成树。返回排序后的 [(距离, a, b)]，a < b。
+    """
+    from bisect import bisect_left
+
+    pts = [[x, y] for x, y in centers]
+    order = list(range(len(pts)))
+    edges = set()
+    for k in range(4):
+        order.sort(key=lambda i: (pts[i][0] + pts[i][1], i))
+        keys = []
+        vals = []
+        for i in order:
+            xi, yi = pts[i]
+            pos = bisect_left(keys, -yi)
+            end = pos
+            while end < len(keys):
+                j = vals[end]
+                dx = xi - pts[j][0]
+                dy = yi - pts[j][1]
+                if dy > dx:
+                    break
+                edges.add((dx + dy, min(i, j), max(i, j)))
+                end += 1
+            del keys[pos:end]
+            del vals[pos:end]
+            if pos < len(keys) and keys[pos] == -yi:
+                vals[pos] = i
+            else:
+                keys.insert(pos, -yi)
+                vals.insert(pos, i)
+        for p in pts:
+            if k & 1:
+                p[0] = -p[0]
+            else:
+                p[0], p[1] = p[1], p[0]
+    return sorted(edges)
+
+
+def _room_mst_sparse(centers):
+    """在候选图上做 Kruskal 的最小生成树，约 O(n log n)；与 _room_mst_heap 权重相同。
+
+    候选图不连通时（正常不会发生）退回 _room_mst_heap 的全量扫描。
+    """
+    n = len(centers)
+    if n < 2:
+        return []
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    edges = []
+    for _, a, b in _room_candidate_edges(centers):
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            continue
+        parent[ra] = rb
+        edges.append((a, b))
+        if len(edges) == n - 1:
+            return edges
+    return _room_mst_heap(centers)
+
+
+class DungeonResult(NamedTuple):
+    """generate_dungeon_data 的返回值"""
+
+    level: List[str]
+    enemies: List[dict]
+    seed: Optional[int]
+    player_pos: Optional[Tuple[int, int]]
+    exit_pos: Optional[Tuple[int, int]]
+
+
+def generate_dungeon_data(
     width: Optional[int] = None,
     height: Optional[int] = None,
     room_attempts: int = 18,
@@ -225,15 +441,28 @@ def generate_dungeon(
     min_room=4,
     max_room=12,
     corridor_radius=1,
+    backend: Optional[str] = None,
+    legacy_connect: bool = False,
+    rng=None,
 ):
-    """生成一个简单的房间+走廊地牢，返回 list[str] 格式的地图。
+    """生成一个简单的房间+走廊地牢，返回 DungeonResult（地图行 + 敌人放置），不做任何文件写入。
 
     算法：随机放置若干矩形房间（不重叠），然后用直线走廊连接房间中心。
     地图用 '#' 表示墙，'.' 表示地面，'@' 表示玩家起始位置，'X' 表示目标。
+
+    backend 选择网格雕刻后端（'python' 或 'numpy'，见 game.dungeon_carvers），
+    两者在相同随机序列下输出完全一致；numpy 不可用时回退到 python。
+
+    房间连接默认在稀疏候选图上求最小生成树（_room_mst_sparse）；legacy_connect=True 时使用原 O(n^3)
+    实现，以便旧种子得到与之前完全相同的地图。
+
+    所有随机决策都来自 rng（random.Random 实例）；未提供时由 seed 派生，因此相同种子总是得到
+    逐字节相同的地图，且可在多个进程/线程中并发生成。传入 rng=random 模块可复现旧版使用全局
+    随机状态的行为。
     """
-    import random
+    from .dungeon_carvers import make_carver
 
-    import random as _r
+    _r = rng if rng is not None else make_rng(seed)
 
     # 随机化尺寸（如果未提供），并保证最小尺寸
     # 默认生成更大的地图以便房间优先策略能发挥效果
@@ -246,7 +475,7 @@ def generate_dungeon(
     height = max(9, height)
 
     # 初始化全墙
-    grid = [['#' for _ in range(width)] for _ in range(height)]
+    carver = make_carver(backend or 'python', width, height)
 
     # If caller didn't tune room_attempts, bias toward more rooms for room-first strategy
     if room_attempts is None:
@@ -287,16 +516,10 @@ def generate_dungeon(
         if ok:
             rooms.append(new_room)
             # carve room interior
-            for yy in range(ry, ry + rh):
-                for xx in range(rx, rx + rw):
-                    grid[yy][xx] = '.'
+            carver.carve_rect(rx, ry, rw, rh)
             # optionally carve a small cleared area around the room to soften walls
             if _r.random() < 0.25:
-                for yy in range(max(0, ry - 1), min(height, ry + rh + 1)):
-                    for xx in range(max(0, rx - 1), min(width, rx + rw + 1)):
-                        if grid[yy][xx] == '#':
-                            if _r.random() < 0.5:
-                                grid[yy][xx] = '.'
+                carver.soften(max(0, rx - 1), max(0, ry - 1), min(width, rx + rw + 1), min(height, ry + rh + 1), _r)
 
     # 连接房间中心（改为 MST + 若干额外连边以生成回路），并用步进式随机走廊使路径更自然
     def center(r):
@@ -305,27 +528,12 @@ def generate_dungeon(
 
     centers = [center(r) for r in rooms]
     if centers:
-        # Build MST (Prim-like)
-        remaining = set(range(len(centers)))
-        visited = {remaining.pop()}
-        edges = []
-        while remaining:
-            best = None
-            best_pair = None
-            for a in visited:
-                (ax, ay) = centers[a]
-                for b in remaining:
-                    (bx, by) = centers[b]
-                    dist = abs(ax - bx) + abs(ay - by)
-                    if best is None or dist < best:
-                        best = dist
-                        best_pair = (a, b)
-            if best_pair is None:
-                break
-            a, b = best_pair
-            edges.append((a, b))
-            visited.add(b)
-            remaining.remove(b)
+        if legacy_connect:
+            edges = _room_mst_legacy(centers)
+        else:
+            edges = _room_mst_sparse(centers)
+        # 已有连边的规范化登记表，避免每次重建列表查重
+        edge_set = {(min(a, b), max(a, b)) for a, b in edges}
 
         # add a larger number of extra random connections to create more loops (room-first -> many cycles)
         extra = max(1, len(centers) // 2)
@@ -338,8 +546,9 @@ def generate_dungeon(
                 continue
             pair = (min(a, b), max(a, b))
             # avoid duplicate edges
-            if pair in [(min(x, y), max(x, y)) for x, y in edges]:
+            if pair in edge_set:
                 continue
+            edge_set.add(pair)
             edges.append((a, b))
             extra -= 1
 
@@ -351,11 +560,7 @@ def generate_dungeon(
             while (x, y) != (x2, y2) and steps < max_steps:
                 steps += 1
                 # carve radius at current
-                for dy in range(-corridor_radius, corridor_radius + 1):
-                    for dx in range(-corridor_radius, corridor_radius + 1):
-                        xx = max(0, min(width - 1, x + dx))
-                        yy = max(0, min(height - 1, y + dy))
-                        grid[yy][xx] = '.'
+                carver.stamp(x, y, corridor_radius)
                 # randomly choose axis to step towards target (gives more organic corridors)
                 if x != x2 and y != y2:
                     if _r.random() < 0.5:
@@ -377,12 +582,13 @@ def generate_dungeon(
             (x1, y1) = centers[a]
             (x2, y2) = centers[b]
             carve_stepwise(x1, y1, x2, y2)
+        carver.finish_corridors()
 
     # place player @ in first room center, place X in last room center (if rooms found)
     # Place player @ in first room center. Ensure the exit X is placed reliably.
     if rooms:
         px, py = center(rooms[0])
-        grid[py][px] = '@'
+        carver.set(px, py, '@')
         # Force exit in the last room center (single source-of-truth)
         tx, ty = center(rooms[-1])
         # if last room equals first room, place exit at a different nearby floor tile
@@ -392,30 +598,31 @@ def generate_dungeon(
             for ddy in range(-2, 3):
                 for ddx in range(-2, 3):
                     nx, ny = tx + ddx, ty + ddy
-                    if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] == '.' and (nx, ny) != (px, py):
+                    if 0 <= nx < width and 0 <= ny < height and carver.get(nx, ny) == '.' and (nx, ny) != (px, py):
                         found_tile = (nx, ny)
                         break
                 if found_tile:
                     break
             if found_tile:
                 tx, ty = found_tile
-        grid[ty][tx] = 'X'
+        carver.set(tx, ty, 'X')
     else:
         # no rooms: pick sensible defaults for player and exit
-        floor_tiles = [(x, y) for y in range(height) for x in range(width) if grid[y][x] == '.']
+        floor_tiles = carver.floor_positions()
         if floor_tiles:
             cx, cy = width // 2, height // 2
             # player near center
             best_p = min(floor_tiles, key=lambda t: abs(t[0] - cx) + abs(t[1] - cy))
-            grid[best_p[1]][best_p[0]] = '@'
+            carver.set(best_p[0], best_p[1], '@')
             # exit farthest from player
             best_e = max(floor_tiles, key=lambda t: abs(t[0] - best_p[0]) + abs(t[1] - best_p[1]))
-            grid[best_e[1]][best_e[0]] = 'X'
+            carver.set(best_e[0], best_e[1], 'X')
     # place enemies on random floor tiles (not on player or target)
+    # 敌人放置只取决于种子与地形（与旧版一致）
     if seed is not None:
         _r.seed(seed)
 
-    floor_positions = [(x, y) for y in range(height) for x in range(width) if grid[y][x] == '.']
+    floor_positions = carver.floor_positions()
     placed = []
     if floor_positions:
         n = min(num_enemies, len(floor_positions))
@@ -423,7 +630,7 @@ def generate_dungeon(
         next_id = 1
         for ex, ey in picks:
             # avoid player/target tile
-            if grid[ey][ex] in ('@', 'X'):
+            if carver.get(ex, ey) in ('@', 'X'):
                 continue
             # Use centralized enemy config (deterministic by coordinate)
             try:
@@ -433,7 +640,7 @@ def generate_dungeon(
             except Exception:
                 kind = 'basic'
                 hp_default = 5
-            grid[ey][ex] = 'E'
+            carver.set(ex, ey, 'E')
             placed.append({
                 'id': next_id,
                 'type': 'Enemy',
@@ -445,47 +652,51 @@ def generate_dungeon(
             })
             next_id += 1
 
-    # persist enemy placements to data/enemies.json so subsequent runs can load them
-    try:
-        out_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'enemies.json')
-        data = {'entities': placed}
-        with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception:
-        # non-fatal if we can't write
-        pass
+    level_rows = carver.to_rows()
+    player_pos = _find_in_rows(level_rows, '@')
+    exit_pos = _find_in_rows(level_rows, 'X')
+    return DungeonResult(level_rows, placed, seed, player_pos, exit_pos)
 
-    # Debug: write a snapshot of the generated level for offline inspection (includes E markers)
-    try:
-        import time as _time
-
-        level_lines = [''.join(row) for row in grid]
-        # find exit and player positions
-        exit_pos = None
-        player_pos = None
-        for y, row in enumerate(level_lines):
-            if player_pos is None:
-                p = row.find('@')
-                if p != -1:
-                    player_pos = (p, y)
-            if exit_pos is None:
-                e = row.find('X')
-                if e != -1:
-                    exit_pos = (e, y)
-            if player_pos is not None and exit_pos is not None:
-                break
-        stamp = seed if seed is not None else int(_time.time() * 1000)
-        dbg_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'debug', 'levels')
-        try:
-            os.makedirs(dbg_dir, exist_ok=True)
-        except Exception:
-            pass
-        dbg_path = os.path.join(dbg_dir, f'last_generated_level_{stamp}.txt')
-        with open(dbg_path, 'w', encoding='utf-8') as dbgf:
-            dbgf.write('\n'.join(level_lines))
-            dbgf.write('\n\n')
-            dbgf.write(f'seed={seed} stamp={stamp} exit_pos={exit_pos} player_pos={player_pos}\n')
-    except Exception:
-        pass
 
-    return [''.join(row) for row in grid]
+def _find_in_rows(rows, ch):
+    """在行列表中查找第一个 ch，返回 (x, y) 或 None"""
+    for y, row in enumerate(rows):
+        x = row.find(ch)
+        if x != -1:
+            return (x, y)
+    return None
+
+
+def write_dungeon_artifacts(result: 'DungeonResult') -> None:
+    """把生成结果的持久化/调试产物交给后台写入器（不阻塞调用方）
+
+    - data/enemies.json：敌人放置，供后续运行加载
+    - data/debug/levels/last_generated_level_<stamp>.txt：含 E 标记的地图快照
+    """
+    from .artifact_writer import get_artifact_writer
+
+    writer = get_artifact_writer()
+    if not writer.enabled:
+        return
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    writer.write_json(os.path.join(data_dir, 'enemies.json'), {'entities': result.enemies})
+
+    seed = result.seed
+    stamp = seed if seed is not None else int(time.time() * 1000)
+    dbg_path = os.path.join(data_dir, 'debug', 'levels', f'last_generated_level_{stamp}.txt')
+    writer.write_text(
+        dbg_path,
+        '\n'.join(result.level)
+        + '\n\n'
+        + f'seed={seed} stamp={stamp} exit_pos={result.exit_pos} player_pos={result.player_pos}\n',
+    )
+
+
+def generate_dungeon(*args, **kwargs):
+    """生成地牢并排队写出 enemies.json 与调试快照，返回 list[str] 地图。
+
+    参数同 generate_dungeon_data；需要无副作用的生成（批量测试、预生成）时直接用后者。
+    """
+    result = generate_dungeon_data(*args, **kwargs)
+    write_dungeon_artifacts(result)
+    return result.level
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+敌人 AI 细节分级测试
+"""
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.enemy_config import get_enemy_lod, get_max_wake_radius
+from game.entities import Enemy, EntityManager
+from game.tile_grid import TileGrid
+
+WIDTH = 200
+HEIGHT = 40
+
+
+class CountingManager(EntityManager):
+    """记录每个敌人运行完整状态机的次数"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.full_ai = {}
+
+    def _update_enemy_ai(self, enemy, level, player_pos, WIDTH, HEIGHT):
+        self.full_ai[enemy.id] = self.full_ai.get(enemy.id, 0) + 1
+        return super()._update_enemy_ai(enemy, level, player_pos, WIDTH, HEIGHT)
+
+
+def open_level():
+    return TileGrid.from_rows(['#' * WIDTH] + ['#' + '.' * (WIDTH - 2) + '#'] * (HEIGHT - 2) + ['#' * WIDTH])
+
+
+class TestLodConfig(unittest.TestCase):
+    def test_kind_overrides_global_defaults(self):
+        basic = get_enemy_lod('basic')
+        scout = get_enemy_lod('scout')
+        self.assertEqual(basic, {'near_radius': 24, 'wake_radius': 40, 'mid_rate': 3})
+        self.assertEqual(scout['near_radius'], 30)
+        self.assertEqual(scout['mid_rate'], basic['mid_rate'])
+        self.assertEqual(get_max_wake_radius(), 48)
+
+
+class TestAiLod(unittest.TestCase):
+    def setUp(self):
+        self.level = open_level()
+        self.player = (10, 20)
+        self.mgr = CountingManager(rng=random.Random(1))
+        self.near = self._spawn(15, 20)
+        self.mid = self._spawn(40, 20)
+        self.far = self._spawn(150, 20)
+
+    def _spawn(self, x, y):
+        self.level.set(x, y, 'E')
+        ent = Enemy(x, y, kind='basic')
+        self.mgr.add(ent)
+        return ent
+
+    def _run(self, frames, player=None):
+        for _ in range(frames):
+            self.mgr.update(self.level, player or self.player, WIDTH, HEIGHT)
+
+    def test_tiers(self):
+        far_pos = (self.far.x, self.far.y)
+        self._run(60)
+        self.assertEqual(self.mgr.get_lod_counts(), {'near': 1, 'mid': 1, 'far': 1})
+        # 远处敌人冻结：不在时间轮中，也不移动
+        self.assertEqual((self.far.x, self.far.y), far_pos)
+        self.assertNotIn(self.far.id, self.mgr._due)
+        # 中距离敌人不跑状态机，近处敌人每 move_interval 帧跑一次
+        self.assertNotIn(self.mid.id, self.mgr.full_ai)
+        self.assertNotIn(self.far.id, self.mgr.full_ai)
+        self.assertEqual(self.mgr.full_ai[self.near.id], 10)
+
+    def test_mid_tier_ticks_at_reduced_rate(self):
+        self._run(5)
+        start = self.mgr._due[self.mid.id]
+        self._run(start - self.mgr._tick)
+        self.assertEqual(self.mgr._due[self.mid.id] - start, 6 * 3)
+
+    def test_visible_enemy_gets_full_ai(self):
+        for _ in range(12):
+            self.mgr.update(self.level, self.player, WIDTH, HEIGHT, is_visible=lambda x, y: x < 50)
+        self.assertIn(self.mid.id, self.mgr.full_ai)
+
+    def test_player_approach_wakes_dormant_enemy(self):
+        self._run(6)
+        self.assertIn(self.far.id, self.mgr._dormant)
+        self._run(1, player=(self.far.x - 20, 20))
+        self.assertNotIn(self.far.id, self.mgr._dormant)
+        self.assertEqual(self.mgr.full_ai[self.far.id], 1)
+
+    def test_remove_dormant_enemy(self):
+        self._run(6)
+        self.mgr.remove(self.far)
+        self._run(1, player=(self.far.x, 20 - 2))
+        self.assertNotIn(self.far.id, self.mgr.full_ai)
+        self.assertEqual(self.mgr.get_lod_counts()['far'], 0)
+
+    def test_disabled_runs_full_ai_everywhere(self):
+        mgr = CountingManager(rng=random.Random(1), use_ai_lod=False)
+        for ent in (self.near, self.mid, self.far):
+            mgr.add(Enemy(ent.x, ent.y, kind='basic'))
+        for _ in range(12):
+            mgr.update(self.level, self.player, WIDTH, HEIGHT)
+        self.assertEqual(sorted(mgr.full_ai.values()), [2, 2, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
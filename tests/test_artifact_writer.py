@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+后台产物写入器与无副作用地牢生成测试
+"""
+import json
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import entities, utils
+from game.artifact_writer import ArtifactWriter
+from game.config import GameConfig
+from game.floors import FloorManager
+from game.state import GameState
+
+
+class TestArtifactWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_flush_writes_text_and_json(self):
+        writer = ArtifactWriter()
+        writer.write_text(os.path.join(self.dir, 'sub', 'a.txt'), 'hello')
+        writer.write_json(os.path.join(self.dir, 'b.json'), {'entities': [1]})
+        self.assertTrue(writer.flush(timeout=5.0))
+        with open(os.path.join(self.dir, 'sub', 'a.txt'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'hello')
+        with open(os.path.join(self.dir, 'b.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'entities': [1]})
+        self.assertEqual(writer.get_stats()['written'], 2)
+
+    def test_same_path_is_coalesced(self):
+        writer = ArtifactWriter()
+        path = os.path.join(self.dir, 'c.txt')
+        with writer._cond:
+            # 持锁期间工作线程无法取走队列（Condition 默认可重入），三次提交必然合并
+            for text in ('first', 'second', 'last'):
+                writer.write_text(path, text)
+        self.assertTrue(writer.flush(timeout=5.0))
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'last')
+        self.assertEqual(writer.get_stats()['coalesced'], 2)
+        self.assertEqual(writer.get_stats()['written'], 1)
+
+    def test_disabled_writer_drops_artifacts(self):
+        writer = ArtifactWriter(enabled=False)
+        path = os.path.join(self.dir, 'd.txt')
+        writer.write_text(path, 'x')
+        self.assertTrue(writer.flush(timeout=1.0))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(writer.get_stats()['submitted'], 0)
+
+
+class TestPureGeneration(unittest.TestCase):
+    def test_generate_dungeon_data_writes_nothing(self):
+        with mock.patch('builtins.open', side_effect=AssertionError('unexpected file write')):
+            result = utils.generate_dungeon_data(80, 30, seed=5, num_enemies=6)
+        self.assertEqual(len(result.level), 30)
+        self.assertEqual(result.level[result.player_pos[1]][result.player_pos[0]], '@')
+        for cfg in result.enemies:
+            self.assertEqual(result.level[cfg['y']][cfg['x']], 'E')
+
+    def test_generate_dungeon_queues_artifacts(self):
+        writer = ArtifactWriter()
+        with mock.patch('game.artifact_writer._artifact_writer', writer), mock.patch.object(writer, '_submit') as submit:
+            level = utils.generate_dungeon(80, 30, seed=5)
+        self.assertEqual(len(level), 30)
+        paths = [os.path.basename(call.args[0]) for call in submit.call_args_list]
+        self.assertIn('enemies.json', paths)
+        self.assertIn('last_generated_level_5.txt', paths)
+
+
+class TestInitialLevelWithoutArtifacts(unittest.TestCase):
+    def test_stale_enemies_json_is_ignored(self):
+        config = GameConfig()
+        config.regen = False
+        config.seed = 3
+        config.floor_prefetch = False
+        state = GameState(config)
+        manager = FloorManager(config, state)
+        # data/enemies.json 是别的地图留下的放置（写入器关闭时不会被覆盖）
+        stale_path = os.path.join(os.path.dirname(utils.__file__), '..', 'data', 'enemies.json')
+        self.assertTrue(os.path.exists(stale_path))
+        writer = ArtifactWriter(enabled=False)
+        with mock.patch('game.artifact_writer._artifact_writer', writer), mock.patch(
+            'game.floors.get_artifact_writer', return_value=writer
+        ), mock.patch('game.utils.load_level_file', return_value=None), mock.patch.object(
+            entities.EntityManager, 'load_from_file_with_level'
+        ) as load_file:
+            level = manager.generate_initial_level()
+            entity_mgr, _ = manager.setup_level(level)
+        load_file.assert_not_called()
+        enemies = [e for e in entity_mgr.entities_by_id.values() if isinstance(e, entities.Enemy)]
+        self.assertTrue(enemies)
+        for enemy in enemies:
+            self.assertEqual(state.level[enemy.y][enemy.x], 'E')
+
+    def test_external_level_uses_enemies_json(self):
+        config = GameConfig()
+        config.regen = False
+        config.floor_prefetch = False
+        manager = FloorManager(config, GameState(config))
+        rows = ['#####', '#@.E#', '#####']
+        with mock.patch('game.utils.load_level_file', return_value=rows):
+            self.assertEqual(manager.generate_initial_level(), rows)
+        self.assertIsNone(manager._initial_result)
+
+
+if __name__ == '__main__':
+    unittest.main()
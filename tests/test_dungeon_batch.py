@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+实例级 RNG 与并行批量生成测试
+"""
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.dungeon_batch import generate_dungeons
+from game.entities import EntityManager
+
+
+class TestSeededGeneration(unittest.TestCase):
+    def test_same_seed_same_map_regardless_of_global_state(self):
+        random.seed(1)
+        a = utils.generate_dungeon_data(80, 30, seed=11)
+        random.seed(2)
+        random.random()
+        b = utils.generate_dungeon_data(80, 30, seed=11)
+        self.assertEqual(a, b)
+
+    def test_global_random_untouched(self):
+        random.seed(3)
+        expected = random.random()
+        random.seed(3)
+        utils.generate_dungeon_data(80, 30, seed=11)
+        self.assertEqual(random.random(), expected)
+
+    def test_make_rng_streams_are_independent(self):
+        self.assertEqual(utils.make_rng(5, 'ai').random(), utils.make_rng(5, 'ai').random())
+        self.assertNotEqual(utils.make_rng(5, 'ai').random(), utils.make_rng(5).random())
+
+    def test_ai_uses_manager_rng(self):
+        level = ['#####', '#...#', '#.E.#', '#...#', '#####']
+        moves = []
+        for _ in range(2):
+            mgr = EntityManager(rng=utils.make_rng(9, 'ai'))
+            mgr.load_from_level(level)
+            enemy = next(iter(mgr.entities_by_id.values()))
+            moves.append([mgr._get_random_move(enemy, level, 5, 5)['target'] for _ in range(5)])
+        self.assertEqual(moves[0], moves[1])
+
+
+class TestBatchGeneration(unittest.TestCase):
+    def test_parallel_matches_sequential(self):
+        seeds = [1, 2, 3, 4]
+        parallel = generate_dungeons(seeds, workers=2, width=60, height=24)
+        sequential = generate_dungeons(seeds, workers=1, width=60, height=24)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual([r.seed for r in parallel], seeds)
+
+
+if __name__ == '__main__':
+    unittest.main()
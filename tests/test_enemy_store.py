@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+结构数组敌人存储测试
+"""
+import copy
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.entities import Enemy, EntityManager
+from game.enemy_store import NUMPY_AVAILABLE
+from game.tile_grid import tile_getter
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestEnemyStore(unittest.TestCase):
+    def _setup(self, backend, result, use_ai_lod=False):
+        level = copy.deepcopy(result.level)
+        mgr = EntityManager(rng=random.Random(3), use_ai_lod=use_ai_lod, backend=backend)
+        mgr.load_configs_with_level(copy.deepcopy(result.enemies), level)
+        return mgr, level
+
+    def _assert_matches(self, seed, width, height, num_enemies, use_ai_lod, frames=300):
+        result = utils.generate_dungeon_data(width, height, seed=seed, num_enemies=num_enemies)
+        objects, objects_level = self._setup('objects', result, use_ai_lod)
+        soa, soa_level = self._setup('soa', result, use_ai_lod)
+        self.assertEqual(soa.backend, 'soa')
+        self.assertEqual(soa.store.count, len(soa.entities_by_id))
+
+        player = result.player_pos
+        walk = random.Random(5)
+        get_tile = tile_getter(objects_level)
+        attacks = 0
+        for frame in range(frames):
+            dx, dy = walk.choice(((0, 1), (0, -1), (1, 0), (-1, 0), (0, 0)))
+            if get_tile(player[0] + dx, player[1] + dy) == '.':
+                player = (player[0] + dx, player[1] + dy)
+            a = objects.update(objects_level, player, width, height)
+            b = soa.update(soa_level, player, width, height)
+            self.assertEqual([e['attacker_id'] for e in a], [e['attacker_id'] for e in b], f"frame={frame}")
+            attacks += len(a)
+            self.assertEqual(
+                {i: (e.x, e.y, e.state, e.ai_cooldown, objects.move_cooldown_of(e)) for i, e in objects.entities_by_id.items()},
+                {i: (e.x, e.y, e.state, e.ai_cooldown, soa.move_cooldown_of(e)) for i, e in soa.entities_by_id.items()},
+                f"frame={frame}",
+            )
+            self.assertEqual(objects.get_lod_counts(), soa.get_lod_counts(), f"frame={frame}")
+        return attacks
+
+    def test_matches_object_backend(self):
+        self.assertGreater(self._assert_matches(21, 60, 24, 12, use_ai_lod=False), 0)
+
+    def test_matches_object_backend_with_lod(self):
+        for seed in (21, 4, 7):
+            with self.subTest(seed=seed):
+                self._assert_matches(seed, 120, 40, 30, use_ai_lod=True)
+
+    def test_entity_api(self):
+        result = utils.generate_dungeon_data(60, 24, seed=21, num_enemies=6)
+        mgr, level = self._setup('soa', result)
+        enemies = list(mgr.entities_by_id.values())
+        first, last = enemies[0], enemies[-1]
+        self.assertIsInstance(first, Enemy)
+        self.assertIs(mgr.get_entity_at(first.x, first.y), first)
+        self.assertIs(mgr.get_entity_by_id(last.id), last)
+
+        # 字段读写落在数组上
+        first.hp -= 3
+        self.assertEqual(int(mgr.store.hp[first._row]), first.hp)
+        self.assertEqual(first.to_config()['type'], 'Enemy')
+
+        # 移除后末行填补空位，对象恢复为普通 Enemy 并保留字段
+        hp, pos = first.hp, (first.x, first.y)
+        mgr.remove(first)
+        self.assertEqual(mgr.store.count, len(enemies) - 1)
+        self.assertIs(type(first), Enemy)
+        self.assertEqual((first.hp, (first.x, first.y)), (hp, pos))
+        self.assertIs(mgr.store.enemies[last._row], last)
+        self.assertEqual((int(mgr.store.x[last._row]), int(mgr.store.y[last._row])), (last.x, last.y))
+        self.assertIsNone(mgr.get_entity_at(*pos))
+
+    def test_lod_counts(self):
+        result = utils.generate_dungeon_data(120, 24, seed=4, num_enemies=20)
+        mgr, level = self._setup('soa', result, use_ai_lod=True)
+        player = (2, 12)
+        # 只在到期时分级：每个敌人至少到期一次后，远处的都已休眠
+        for _ in range(60):
+            mgr.update(level, player, 120, 24)
+        counts = mgr.get_lod_counts()
+        self.assertEqual(sum(counts.values()), mgr.store.count)
+        far = [e for e in mgr.entities_by_id.values() if max(abs(e.x - 2), abs(e.y - 12)) > 48]
+        self.assertGreaterEqual(counts['far'], len(far))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -147,7 +147,30 @@ class TestRobustErrorHandler(unittest.TestCase):
         # 失败调用
         result = self.error_handler.safe_call(test_function, "test_operation", -1)
         self.assertIsNone(result)
-    
+
+    def test_guard(self):
+        """测试预绑定安全包装器"""
+        def test_function(value):
+            if value < 0:
+                raise ValueError("Negative value")
+            return value * 2
+
+        guarded = self.error_handler.guard(test_function, "guard_operation", ErrorSeverity.LOW)
+        self.assertEqual(guarded(4), 8)
+        self.assertIsNone(guarded(-1))
+        self.assertGreaterEqual(self.error_handler.get_error_statistics()['total_errors'], 1)
+
+    def test_no_context_on_success(self):
+        """测试无异常时不创建ErrorContext（不采集调用栈）"""
+        from unittest import mock
+
+        guarded = self.error_handler.guard(lambda: "ok", "hot_path")
+        with mock.patch('game.error_handling.ErrorContext') as ctx_cls:
+            for _ in range(10):
+                self.assertEqual(guarded(), "ok")
+                self.assertEqual(self.error_handler.safe_call(lambda: "ok", "hot_path"), "ok")
+            ctx_cls.assert_not_called()
+
     def test_fallback_mechanism(self):
         """测试备用机制"""
         def main_function():
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+下一层预生成测试
+"""
+import unittest
+import threading
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.floor_prefetch import FloorPrefetcher
+from game.floors import FloorManager
+
+
+class TestFloorPrefetcher(unittest.TestCase):
+    def test_hit_returns_prefetched_result(self):
+        prefetcher = FloorPrefetcher(lambda params: ['#@X#', params['seed']])
+        prefetcher.start(2, {'seed': 7})
+        self.assertEqual(prefetcher.take(2, {'seed': 7}), ['#@X#', 7])
+        stats = prefetcher.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['hit_rate'], 100.0)
+
+    def test_mismatched_params_fall_back(self):
+        prefetcher = FloorPrefetcher(lambda params: ['#@X#'])
+        prefetcher.start(2, {'seed': 7})
+        self.assertIsNone(prefetcher.take(2, {'seed': 8}))
+        self.assertIsNone(prefetcher.take(3, {'seed': 7}))
+        stats = prefetcher.get_stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['cancelled'], 1)
+
+    def test_take_waits_for_running_job(self):
+        release = threading.Event()
+
+        def slow(params):
+            release.wait()
+            return ['#@X#']
+
+        prefetcher = FloorPrefetcher(slow)
+        prefetcher.start(2, {'seed': 1})
+        threading.Timer(0.05, release.set).start()
+        self.assertEqual(prefetcher.take(2, {'seed': 1}), ['#@X#'])
+        stats = prefetcher.get_stats()
+        self.assertEqual(stats['waits'], 1)
+        self.assertGreater(stats['last_wait_ms'], 0.0)
+
+    def test_discard_does_not_wait(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow(params):
+            release.wait(5.0)
+            return ['#@X#']
+
+        prefetcher = FloorPrefetcher(slow)
+        prefetcher.start(2, {'seed': 1})
+        # 参数不一致：立即回退，不等待正在运行的任务
+        self.assertIsNone(prefetcher.take(2, {'seed': 2}))
+        prefetcher.start(3, {'seed': 1})
+        prefetcher.cancel()
+        self.assertFalse(release.is_set())
+        stats = prefetcher.get_stats()
+        self.assertEqual((stats['cancelled'], stats['waits']), (2, 0))
+        self.assertIsNone(prefetcher.pending_floor)
+
+    def test_generation_error_is_a_miss(self):
+        def broken(params):
+            raise RuntimeError('boom')
+
+        prefetcher = FloorPrefetcher(broken)
+        prefetcher.start(2, {'seed': 1})
+        self.assertIsNone(prefetcher.take(2, {'seed': 1}))
+        self.assertEqual(prefetcher.get_stats()['failures'], 1)
+
+    def test_same_job_not_restarted(self):
+        prefetcher = FloorPrefetcher(lambda params: ['#@X#'])
+        prefetcher.start(2, {'seed': 1})
+        prefetcher.start(2, {'seed': 1})
+        self.assertEqual(prefetcher.get_stats()['started'], 1)
+        prefetcher.cancel()
+        self.assertIsNone(prefetcher.pending_floor)
+
+
+class FakeGameState:
+    floor_number = 1
+
+    def floor_params(self, floor_number, gen_seed):
+        return {'seed': gen_seed, 'floor': floor_number}
+
+
+class TestFloorSeedReservation(unittest.TestCase):
+    def _manager(self, seed):
+        config = SimpleNamespace(seed=seed, floor_prefetch=True)
+        manager = FloorManager(config, FakeGameState())
+        manager.prefetcher.generate_fn = lambda params: ['#@X#']
+        return manager
+
+    def test_fixed_seed(self):
+        manager = self._manager(100)
+        self.assertEqual(manager.floor_seed(3), 103)
+
+    def test_transition_uses_prefetch_seed(self):
+        manager = self._manager(None)
+        manager.prefetch_next_floor()
+        self.assertEqual(manager.prefetcher.pending_floor, 2)
+        reserved = manager._reserved_seeds[2]
+        self.assertEqual(manager.floor_seed(2), reserved)
+        self.assertEqual(manager.prefetcher.take(2, {'seed': reserved, 'floor': 2}), ['#@X#'])
+
+    def test_prefetch_disabled(self):
+        manager = FloorManager(SimpleNamespace(seed=None, floor_prefetch=False), FakeGameState())
+        self.assertIsNone(manager.prefetcher)
+        manager.prefetch_next_floor()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+玩家距离场测试
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.entities import EntityManager
+from game.flow_field import FlowField
+from game.tile_grid import TileGrid
+
+
+LEVEL = [
+    '##########',
+    '#........#',
+    '#.####.#.#',
+    '#....@...#',
+    '##########',
+]
+
+
+class TestFlowField(unittest.TestCase):
+    def setUp(self):
+        self.level = TileGrid.from_rows(LEVEL)
+        self.field = FlowField(max_distance=6)
+        self.field.ensure(self.level, (5, 3), 10, 5)
+
+    def test_distances(self):
+        self.assertEqual(self.field.distance(5, 3), 0)
+        self.assertEqual(self.field.distance(1, 3), 4)
+        self.assertEqual(self.field.distance(1, 1), 6)
+        self.assertIsNone(self.field.distance(2, 2))  # wall
+        self.assertEqual(self.field.distance(8, 1), 5)
+        near = FlowField(max_distance=4)
+        near.ensure(self.level, (5, 3), 10, 5)
+        self.assertEqual(near.distance(1, 3), 4)
+        self.assertIsNone(near.distance(1, 1))  # beyond max_distance
+
+    def test_path_descends_to_origin(self):
+        path = self.field.path_from((1, 1), self.level)
+        self.assertEqual(len(path), 6)
+        self.assertEqual(path[-1], (5, 3))
+        self.assertEqual(self.field.path_from((1, 1), self.level, max_steps=2), path[:2])
+        self.assertIsNone(self.field.path_from((2, 2), self.level))
+
+    def test_recompute_only_on_player_move_or_terrain_change(self):
+        self.assertFalse(self.field.ensure(self.level, (5, 3), 10, 5))
+        # 敌人进出不算地形变化
+        utils.set_tile(self.level, 3, 3, 'E')
+        utils.set_tile(self.level, 3, 3, '.')
+        self.assertFalse(self.field.ensure(self.level, (5, 3), 10, 5))
+        # 新砌一堵墙
+        utils.set_tile(self.level, 6, 2, '#')
+        self.assertTrue(self.field.ensure(self.level, (5, 3), 10, 5))
+        self.assertTrue(self.field.ensure(self.level, (6, 3), 10, 5))
+        self.assertEqual(self.field.recomputes, 3)
+
+    def test_path_prefers_free_cells(self):
+        level = TileGrid.from_rows(['#####', '#...#', '#.E.#', '#..@#', '#####'])
+        field = FlowField(max_distance=6)
+        field.ensure(level, (3, 3), 5, 5)
+        # (1,1) 到 (3,3) 距离 4；经过 (2,2) 的路线被敌人占据
+        path = field.path_from((1, 1), level)
+        self.assertEqual(len(path), 4)
+        self.assertNotEqual(path[0], (2, 2))
+        self.assertNotIn((2, 2), path)
+
+
+class TestChasePath(unittest.TestCase):
+    def test_chase_matches_astar_first_steps(self):
+        result = utils.generate_dungeon_data(60, 24, seed=8, num_enemies=0)
+        level = TileGrid.from_rows(result.level)
+        player = result.player_pos
+        mgr = EntityManager()
+        astar = EntityManager(use_flow_field=False)
+        radius = mgr.flow_field.max_distance
+        starts = [
+            (x, y)
+            for y in range(24)
+            for x in range(60)
+            if level.get(x, y) == '.' and abs(x - player[0]) + abs(y - player[1]) <= radius
+        ]
+        self.assertTrue(starts)
+        for start in starts:
+            chase = mgr._chase_path(start, player, level, 60, 24)
+            full = astar._find_path(start, player, level, 60, 24)
+            self.assertEqual(bool(chase), bool(full), start)
+            d = mgr.flow_field.distance(*start)
+            if d is not None:
+                # 距离场内：下坡路径与 A* 最短路径等长
+                self.assertEqual(d, len(full))
+                self.assertEqual(len(chase), min(2, d))
+            if chase:
+                self.assertEqual(abs(chase[0][0] - start[0]) + abs(chase[0][1] - start[1]), 1)
+        self.assertEqual(mgr.flow_field.recomputes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
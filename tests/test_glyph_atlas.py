@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+字形图集缓存测试
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.glyph_atlas import GlyphAtlas, TILE_COLORS, FOG_FACTOR, dim_color
+from game.performance import PerformanceOptimizer
+
+
+class FakeFont:
+    """记录 render 调用次数的假字体"""
+
+    def __init__(self):
+        self.render_calls = 0
+
+    def render(self, text, antialias, color):
+        self.render_calls += 1
+        return (text, color)
+
+
+class TestGlyphAtlas(unittest.TestCase):
+    """测试字形图集"""
+
+    def setUp(self):
+        self.font = FakeFont()
+        self.atlas = GlyphAtlas(self.font, 24)
+
+    def test_hit_and_miss(self):
+        """同一 (glyph, color) 只渲染一次"""
+        first = self.atlas.get('#', TILE_COLORS['#'])
+        second = self.atlas.get('#', TILE_COLORS['#'])
+        self.assertIs(first, second)
+        self.assertEqual(self.font.render_calls, 1)
+        self.assertEqual(self.atlas.misses, 1)
+        self.assertEqual(self.atlas.hits, 1)
+
+        self.atlas.get('#', dim_color(TILE_COLORS['#']))
+        self.assertEqual(self.font.render_calls, 2)
+
+    def test_invalidate_on_font_or_tile_size_change(self):
+        """字体或瓦片尺寸变化时缓存失效"""
+        self.atlas.get('.', TILE_COLORS['.'])
+        self.atlas.ensure(self.font, 24)
+        self.assertEqual(self.atlas.get_stats()['entries'], 1)
+
+        self.atlas.ensure(self.font, 32)
+        self.assertEqual(self.atlas.get_stats()['entries'], 0)
+        self.assertEqual(self.atlas.invalidations, 1)
+
+        self.atlas.get('.', TILE_COLORS['.'])
+        new_font = FakeFont()
+        self.atlas.ensure(new_font, 32)
+        self.assertEqual(self.atlas.get_stats()['entries'], 0)
+        self.atlas.get('.', TILE_COLORS['.'])
+        self.assertEqual(new_font.render_calls, 1)
+
+    def test_prewarm(self):
+        """预热后常用字形全部命中"""
+        rendered = self.atlas.prewarm()
+        self.assertEqual(rendered, len(set(GlyphAtlas.default_entries())))
+        calls = self.font.render_calls
+        for ch, color in TILE_COLORS.items():
+            self.atlas.get(ch, color)
+            self.atlas.get(ch, dim_color(color, FOG_FACTOR))
+        self.assertEqual(self.font.render_calls, calls)
+        self.assertEqual(self.atlas.misses, 0)
+
+    def test_max_entries(self):
+        """超出上限时整体重建，不会无限增长"""
+        atlas = GlyphAtlas(self.font, 24, max_entries=4)
+        for i in range(10):
+            atlas.get('.', (i, i, i))
+        self.assertLessEqual(atlas.get_stats()['entries'], 4)
+
+    def test_stats_provider(self):
+        """命中统计通过 PerformanceOptimizer.get_stats 暴露"""
+        optimizer = PerformanceOptimizer()
+        optimizer.register_stats_provider('glyph_atlas', self.atlas.get_stats)
+        self.atlas.get('@', TILE_COLORS['@'])
+        self.atlas.get('@', TILE_COLORS['@'])
+
+        stats = optimizer.get_stats()
+        self.assertIn('glyph_atlas', stats)
+        self.assertEqual(stats['glyph_atlas']['hits'], 1)
+        self.assertEqual(stats['glyph_atlas']['misses'], 1)
+        self.assertAlmostEqual(stats['glyph_atlas']['hit_rate'], 50.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
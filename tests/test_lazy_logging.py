@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+延迟格式化日志测试
+"""
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.config import GameConfig
+from game.log_utils import safe_log
+from game.logger import Logger
+from game.performance import PerformanceMonitor
+
+
+class _Exploding:
+    """被格式化时抛出异常：用来证明过滤掉的消息没有被格式化"""
+
+    def __str__(self):
+        raise AssertionError('formatted a filtered message')
+
+
+class TestLazyLogging(unittest.TestCase):
+    def setUp(self):
+        self.logger = Logger(GameConfig())
+        self.logger.game_logs.clear()
+
+    def test_is_enabled(self):
+        self.logger.debug_enabled = False
+        self.assertFalse(self.logger.is_enabled('DEBUG', 'PERF'))
+        self.assertTrue(self.logger.is_enabled('INFO', 'GAME'))
+        self.assertTrue(self.logger.is_enabled('warning', 'RENDER'))
+        self.assertFalse(self.logger.is_enabled('INFO', 'RENDER'))
+        self.logger.debug_enabled = True
+        self.assertTrue(self.logger.is_enabled('DEBUG', 'PERF'))
+
+    def test_filtered_messages_are_not_formatted(self):
+        self.logger.debug_enabled = False
+        with mock.patch.object(self.logger, '_session_channel') as channel:
+            self.logger.debug('value=%s', _Exploding())
+            self.logger.debug(lambda: str(_Exploding()))
+            self.logger.info('frame %s', _Exploding(), category='FRAME')
+            safe_log(self.logger, None, 'x=%s', _Exploding(), level='debug', channel='ENTITY')
+        channel.log.assert_not_called()
+
+    def test_enabled_messages_are_rendered(self):
+        self.logger.debug_enabled = True
+        with mock.patch.object(self.logger, '_session_channel') as channel:
+            self.logger.debug('PERF_DATA|fps|%d', 60)
+            self.logger.info(lambda: 'built lazily', category='GAME')
+            safe_log(self.logger, None, 'at (%d,%d)', 3, 4, level='debug', channel='ENTITY')
+        messages = [call.args[2] for call in channel.log.call_args_list]
+        self.assertEqual(messages, ['PERF_DATA|fps|60', 'built lazily', 'at (3,4)'])
+        self.assertTrue(self.logger.game_logs[-1].endswith('[DEBUG][ENTITY] at (3,4)'))
+
+    def test_logging_style_args(self):
+        self.logger.debug_enabled = True
+        with mock.patch.object(self.logger, '_session_channel') as channel, mock.patch('builtins.print') as printed:
+            self.logger.debug('x=%d', 5)
+            self.logger.info('%s:%s', 'a', 'b', category='GAME')
+            self.logger.warning('low fps %d', 12, category='PERFORMANCE')
+        logged = [(call.args[1], call.args[2]) for call in channel.log.call_args_list]
+        self.assertEqual(logged, [('DEBUG', 'x=5'), ('GAME', 'a:b'), ('PERFORMANCE', 'low fps 12')])
+        printed.assert_called_once_with('WARNING: low fps 12')
+
+    def test_filtered_warning_is_not_formatted(self):
+        with mock.patch.object(self.logger, '_should_log', return_value=False), mock.patch(
+            'builtins.print'
+        ) as printed:
+            self.logger.warning('value=%s', _Exploding(), category='RENDER')
+        printed.assert_not_called()
+
+    def test_safe_log_fallback_formats(self):
+        lines = []
+        game_state = mock.Mock(game_log=lines.append)
+        safe_log(None, game_state, 'hp=%d', 7)
+        self.assertEqual(lines, ['hp=7'])
+
+    def test_performance_monitor_defers(self):
+        self.logger.debug_enabled = False
+        monitor = PerformanceMonitor(self.logger)
+        with mock.patch.object(self.logger, '_render', side_effect=AssertionError('rendered')):
+            for _ in range(3):
+                monitor.start_frame()
+                monitor.record_render_time(1.5)
+                monitor.record_update_time(0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+视线判定测试
+"""
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.entities import Enemy, EntityManager
+from game.line_of_sight import LineOfSightCache, bresenham, has_line_of_sight
+from game.pathfinding import build_walkable_mask
+from game.tile_grid import TileGrid
+
+
+LEVEL = [
+    '##########',
+    '#........#',
+    '#...#....#',
+    '#........#',
+    '##########',
+]
+
+
+class TestBresenham(unittest.TestCase):
+    def test_line_is_connected(self):
+        for goal in ((7, 2), (2, 9), (-5, -3), (0, 6), (4, 0)):
+            line = list(bresenham((0, 0), goal))
+            self.assertEqual(line[0], (0, 0))
+            self.assertEqual(line[-1], goal)
+            self.assertEqual(len(line), max(abs(goal[0]), abs(goal[1])) + 1)
+            for (ax, ay), (bx, by) in zip(line, line[1:]):
+                self.assertLessEqual(max(abs(ax - bx), abs(ay - by)), 1)
+
+    def test_walls_and_enemies_block(self):
+        opaque = build_walkable_mask(LEVEL, '#E')
+        self.assertTrue(has_line_of_sight((1, 1), (8, 1), opaque, 10, 5))
+        self.assertFalse(has_line_of_sight((2, 2), (7, 2), opaque, 10, 5))
+        self.assertTrue(has_line_of_sight((4, 1), (4, 1), opaque, 10, 5))
+        # 端点本身不透明不影响结果
+        self.assertTrue(has_line_of_sight((3, 2), (4, 2), opaque, 10, 5))
+        self.assertFalse(has_line_of_sight((1, 1), (12, 1), opaque, 10, 5))
+
+
+class TestLineOfSightCache(unittest.TestCase):
+    def setUp(self):
+        self.level = TileGrid.from_rows(LEVEL)
+        self.los = LineOfSightCache()
+
+    def test_cached_until_opacity_changes(self):
+        self.assertTrue(self.los.check(self.level, (1, 3), (8, 3), 10, 5))
+        self.assertTrue(self.los.check(self.level, (1, 3), (8, 3), 10, 5))
+        self.assertEqual((self.los.hits, self.los.misses), (1, 1))
+
+        # 透明 -> 透明 的改动不影响缓存
+        utils.set_tile(self.level, 5, 1, '@')
+        self.assertTrue(self.los.check(self.level, (1, 3), (8, 3), 10, 5))
+        self.assertEqual(self.los.hits, 2)
+
+        # 路线上出现敌人：掩码更新、缓存失效
+        utils.set_tile(self.level, 5, 3, 'E')
+        self.assertFalse(self.los.check(self.level, (1, 3), (8, 3), 10, 5))
+        utils.set_tile(self.level, 5, 3, '.')
+        self.assertTrue(self.los.check(self.level, (1, 3), (8, 3), 10, 5))
+        self.assertEqual(self.los.invalidations, 2)
+
+    def test_player_move_drops_entries(self):
+        self.los.begin_tick((8, 3))
+        self.los.check(self.level, (1, 3), (8, 3), 10, 5)
+        self.los.begin_tick((8, 3))
+        self.assertEqual(self.los.get_stats()['cached'], 1)
+        self.los.begin_tick((8, 1))
+        self.assertEqual(self.los.get_stats()['cached'], 0)
+
+    def test_enemy_moves_keep_unaffected_entries(self):
+        goal = (8, 3)
+        self.los.begin_tick(goal)
+        self.assertTrue(self.los.check(self.level, (1, 3), goal, 10, 5))
+        self.assertTrue(self.los.check(self.level, (8, 1), goal, 10, 5))
+
+        # 下一个 tick：玩家不动，一个敌人移动但不经过 (1,3)->(8,3)，另一个挡在 (8,1)->(8,3) 上
+        self.los.begin_tick(goal)
+        utils.set_tile(self.level, 2, 1, 'E')
+        utils.set_tile(self.level, 2, 1, '.')
+        utils.set_tile(self.level, 3, 1, 'E')
+        utils.set_tile(self.level, 8, 2, 'E')
+        self.assertTrue(self.los.check(self.level, (1, 3), goal, 10, 5))
+        self.assertGreater(self.los.hits, 0)
+        self.assertFalse(self.los.check(self.level, (8, 1), goal, 10, 5))
+        self.assertEqual(self.los.invalidations, 1)
+
+    def test_cache_matches_fresh_trace(self):
+        rng = random.Random(3)
+        rows = ['#' * 20] + ['#' + ''.join('#' if rng.random() < 0.15 else '.' for _ in range(18)) + '#' for _ in range(10)] + ['#' * 20]
+        level = TileGrid.from_rows(rows)
+        los = LineOfSightCache()
+        goal = (10, 5)
+        utils.set_tile(level, 10, 5, '.')
+        floors = [(x, y) for y in range(12) for x in range(20) if rows[y][x] == '.' and (x, y) != goal]
+        for _ in range(30):
+            los.begin_tick(goal)
+            for _ in range(5):
+                x, y = rng.choice(floors)
+                utils.set_tile(level, x, y, 'E' if level.get(x, y) == '.' else '.')
+            opaque = build_walkable_mask(level, '#E')
+            for start in rng.sample(floors, 20):
+                self.assertEqual(los.check(level, start, goal, 20, 12), has_line_of_sight(start, goal, opaque, 20, 12))
+        self.assertGreater(los.hits, 0)
+
+    def test_entity_manager_uses_cache(self):
+        mgr = EntityManager()
+        enemy = Enemy(1, 2)
+        self.assertTrue(mgr._has_line_of_sight(enemy, (3, 2), self.level, 10, 5))
+        self.assertFalse(mgr._has_line_of_sight(enemy, (8, 2), self.level, 10, 5))
+        self.assertEqual(mgr.los.misses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+异步日志写入测试
+"""
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.config import GameConfig
+from game.log_sink import LogWriter, get_log_writer
+from game.logger import Logger
+from game.state import GameState
+
+
+class TestLogWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'sub', 'game.log')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read(self, path=None):
+        with open(path or self.path, encoding='utf-8') as f:
+            return f.read()
+
+    def test_records_written_in_order(self):
+        writer = LogWriter(batch_size=4)
+        chan = writer.channel(self.path)
+        for i in range(10):
+            chan.log('INFO', 'TEST', f'消息 {i}', ticks=i)
+        chan.write('raw line\n')
+        self.assertTrue(writer.flush(timeout=5.0))
+        lines = self._read().splitlines()
+        self.assertEqual(len(lines), 11)
+        self.assertTrue(lines[3].endswith('[000003][INFO][TEST] 消息 3'))
+        self.assertEqual(lines[-1], 'raw line')
+        self.assertIs(writer.channel(self.path), chan)
+        self.assertEqual(chan.size, os.path.getsize(self.path))
+        writer.close()
+
+    def test_rotation_uses_tracked_size(self):
+        writer = LogWriter()
+        rotated = []
+
+        def rotate():
+            os.replace(self.path, self.path + f'.{len(rotated)}')
+            rotated.append(True)
+
+        chan = writer.channel(self.path, max_bytes=100, rotate=rotate)
+        chan.write('x' * 60 + '\n')
+        self.assertTrue(writer.flush(timeout=5.0))
+        # 打开文件后不再 stat()
+        with mock.patch('os.stat', side_effect=AssertionError('stat per message')):
+            for _ in range(2):
+                chan.write('x' * 60 + '\n')
+                self.assertTrue(writer.flush(timeout=5.0))
+        self.assertEqual(writer.errors, 0)
+        self.assertEqual(len(rotated), 1)
+        self.assertEqual(self._read(), 'x' * 60 + '\n')
+        writer.close()
+
+    def test_full_queue_drops_unimportant(self):
+        writer = LogWriter(max_pending=3)
+        chan = writer.channel(self.path)
+        with mock.patch.object(writer, '_ensure_thread'):
+            writer._thread = object()  # 不启动后台线程，让队列保持满
+            results = [chan.log('INFO', 'T', str(i)) for i in range(5)]
+        writer._thread = None
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(writer.dropped, 2)
+        # 错误记录在队列满时等待而不是丢弃
+        self.assertTrue(chan.log('ERROR', 'T', 'boom'))
+        self.assertEqual(writer.blocked, 1)
+        self.assertTrue(writer.flush(timeout=5.0))
+        self.assertEqual(len(self._read().splitlines()), 4)
+        writer.close()
+
+
+    def test_ring_channel_writes_only_on_dump(self):
+        writer = LogWriter()
+        chan = writer.channel(self.path, ring_size=3)
+        for i in range(5):
+            chan.write(f'line {i}\n')
+        self.assertTrue(writer.flush(timeout=5.0))
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(writer.dump_rings(), 3)
+        self.assertTrue(writer.flush(timeout=5.0))
+        self.assertEqual(self._read(), 'line 2\nline 3\nline 4\n')
+        writer.close()
+
+
+class TestGameStateLogs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch('game.state._ROOT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.config = GameConfig()
+        self.config.debug_mode = True
+
+    def _read(self, *parts):
+        with open(os.path.join(self.tmp.name, *parts), encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_exit_and_game_log_share_buffered_sink(self):
+        state = GameState(self.config)
+        with mock.patch('builtins.open', wraps=open) as opened:
+            for i in range(5):
+                state.write_exit_log(f'transition step {i}')
+                state.game_log(f'debug {i}')
+            self.assertTrue(state.flush_logs())
+        # 每个文件只打开一次（只统计临时目录，其他测试的后台写入可能同时发生）
+        paths = [str(c.args[0]) for c in opened.call_args_list if str(c.args[0]).startswith(self.tmp.name)]
+        self.assertEqual(len(paths), 2)
+        self.assertEqual(len(self._read('logs', 'session', 'exit_log.txt')), 5)
+        self.assertTrue(self._read('game.log')[-1].endswith('debug 4'))
+        get_log_writer().close()
+
+    def test_ring_mode_dumps_on_demand(self):
+        self.config.log_ring = 2
+        state = GameState(self.config)
+        for i in range(4):
+            state.write_exit_log(f'step {i}')
+        self.assertTrue(state.flush_logs())
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'logs', 'session', 'exit_log.txt')))
+        self.assertEqual(state.dump_logs(), 2)
+        self.assertTrue(state.flush_logs())
+        lines = self._read('logs', 'session', 'exit_log.txt')
+        self.assertEqual([line.split('] ', 1)[1] for line in lines], ['step 2', 'step 3'])
+        get_log_writer().close()
+
+
+class TestLoggerSink(unittest.TestCase):
+    def test_logger_queues_and_flushes(self):
+        logger = Logger(GameConfig())
+        logger.info('sink check', category='TEST')
+        logger.error('sink error', 'TEST', ValueError('bad'))
+        self.assertTrue(logger.flush(timeout=5.0))
+        self.assertIn('[INFO][TEST] sink check', logger.log_file.read_text(encoding='utf-8'))
+        error_text = logger.error_log.read_text(encoding='utf-8')
+        self.assertIn('[ERROR][TEST] sink error', error_text)
+        self.assertIn('Exception type: ValueError', error_text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@
 import unittest
 import sys
 import time
+import tracemalloc
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -12,6 +13,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from game.memory import MemoryMonitor, SmartCacheManager, MemoryOptimizer
 from game.performance import PerformanceOptimizer
+from game.entities import Enemy
+from game.enemy_config import get_enemy_hp, get_enemy_stats
+from game.fov import FOVSystem
 
 
 class TestMemoryMonitor(unittest.TestCase):
@@ -200,5 +204,122 @@ class TestPerformanceIntegration(unittest.TestCase):
         # self.assertGreater(len(optimizations), 0)
 
 
+class _DictEnemy:
+    """对照组：__slots__ 之前的 Enemy 布局（实例 __dict__、每个敌人一份属性字典副本、预建列表）"""
+
+    def __init__(self, x, y, hp=5, dir=(1, 0), kind='basic'):
+        self.id = None
+        self.x = x
+        self.y = y
+        self.kind = kind
+        self.enemy_stats = get_enemy_stats(kind)
+        self.hp = get_enemy_hp(kind) if hp == 5 and kind != 'basic' else hp
+        self.dir = tuple(dir)
+        self.path = []
+        self.target_pos = None
+        self.patrol_points = []
+        self.state = 'patrol'
+        self.last_player_pos = None
+        self.stuck_counter = 0
+        self.ai_cooldown = 0
+        self.move_cooldown = 0
+
+
+class TestEnemyFootprint(unittest.TestCase):
+    """敌人对象内存占用（10k 个敌人）"""
+
+    COUNT = 10000
+    KINDS = ('basic', 'guard', 'scout', 'brute')
+
+    def _bytes_per_enemy(self, cls):
+        # 预热属性表缓存，只统计敌人本身
+        for kind in self.KINDS:
+            cls(0, 0, kind=kind)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            enemies = [cls(i % 400, i // 400, kind=self.KINDS[i % 4]) for i in range(self.COUNT)]
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+        self.assertEqual(len(enemies), self.COUNT)
+        return total / self.COUNT
+
+    def test_bytes_per_enemy(self):
+        legacy = self._bytes_per_enemy(_DictEnemy)
+        compact = self._bytes_per_enemy(Enemy)
+        print(f"\n敌人内存: 优化前 {legacy:.0f} B/个, 优化后 {compact:.0f} B/个 ({self.COUNT} 个)")
+        self.assertLess(compact, legacy * 0.6)
+
+    def test_stats_shared_and_read_only(self):
+        a = Enemy(1, 1, kind='guard')
+        b = Enemy(2, 2, kind='guard')
+        self.assertIs(a.enemy_stats, b.enemy_stats)
+        self.assertEqual(a.enemy_stats['move_interval'], get_enemy_stats('guard')['move_interval'])
+        with self.assertRaises(TypeError):
+            a.enemy_stats['damage'] = 99
+        with self.assertRaises(AttributeError):
+            a.extra = 1
+
+    def test_lazy_lists(self):
+        enemy = Enemy(1, 1)
+        self.assertIsNone(enemy._path)
+        enemy.path.append((1, 2))
+        self.assertEqual(enemy.path, [(1, 2)])
+        enemy.path = []
+        self.assertIsNone(enemy._path)
+        self.assertEqual(enemy.patrol_points, [])
+
+
+class TestExplorationFootprint(unittest.TestCase):
+    """探索记录内存占用（完全探索的 400x200 楼层）"""
+
+    def _measure(self, build):
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            kept = build()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        self.assertTrue(kept is not None)
+        return sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+    def test_fully_explored_floor(self):
+        rows = ['.' * 400] * 200
+        legacy = self._measure(lambda: {(x, y) for y in range(200) for x in range(400)})
+
+        def explore():
+            fov = FOVSystem(sight_radius=1)
+            fov.calculate_fov(0, 0, rows)
+            fov.tile_state[:] = b'\x01' * len(fov.tile_state)
+            return fov
+
+        grid = self._measure(explore)
+        print(f"\n探索记录: 元组集合 {legacy / 1024:.0f} KB, 状态网格 {grid / 1024:.0f} KB (400x200)")
+        self.assertLess(grid, 100 * 1024)
+        self.assertLess(grid * 20, legacy)
+
+    def test_views_do_not_copy(self):
+        rows = ['.' * 20] * 10
+        fov = FOVSystem(sight_radius=3)
+        fov.calculate_fov(5, 5, rows)
+        explored = fov.get_explored_tiles()
+        self.assertIs(fov.get_visible_tiles(), fov.visible_tiles)
+        fov.calculate_fov(12, 5, rows)
+        # 视图随探索记录更新
+        self.assertIn((5, 5), explored)
+        self.assertIn((12, 5), explored)
+        self.assertEqual(len(explored), len(set(explored)))
+        self.assertEqual(len(explored), fov.explored_count)
+
+        fov.clear_exploration()
+        self.assertEqual(len(explored), 0)
+        self.assertFalse(fov.is_explored(5, 5))
+        self.assertFalse(fov.is_visible(12, 5))
+        self.assertEqual(len(fov.get_visibility_grid()), 200)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+A* 寻路测试
+"""
+import random
+import unittest
+import sys
+from collections import deque
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.entities import EntityManager
+from game.pathfinding import build_walkable_mask, find_path
+from game.tile_grid import TileGrid
+
+
+def bfs_length(start, goal, level, max_depth=20):
+    """参考实现：深度受限 BFS 的最短路径长度（找不到返回 0）"""
+    if start == goal:
+        return 0
+    h, w = len(level), len(level[0])
+    queue = deque([(start, 0)])
+    seen = {start}
+    while queue:
+        (x, y), d = queue.popleft()
+        if d >= max_depth:
+            continue
+        for nx, ny in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if (nx, ny) == goal:
+                return d + 1
+            if (nx, ny) not in seen and 0 <= nx < w and 0 <= ny < h and level[ny][nx] in '.@':
+                seen.add((nx, ny))
+                queue.append(((nx, ny), d + 1))
+    return 0
+
+
+class TestFindPath(unittest.TestCase):
+    LEVEL = [
+        '#########',
+        '#...#...#',
+        '#.#.#.#.#',
+        '#.#...#.#',
+        '#########',
+    ]
+
+    def _path(self, start, goal, level=None, **kwargs):
+        level = level or self.LEVEL
+        mask = build_walkable_mask(level)
+        return find_path(start, goal, mask, len(level[0]), len(level), **kwargs)
+
+    def test_path_around_walls(self):
+        path = self._path((1, 1), (7, 3))
+        self.assertEqual(path[-1], (7, 3))
+        self.assertEqual(len(path), 12)
+        prev = (1, 1)
+        for x, y in path:
+            self.assertEqual(abs(x - prev[0]) + abs(y - prev[1]), 1)
+            self.assertIn(self.LEVEL[y][x], '.@')
+            prev = (x, y)
+
+    def test_depth_limit(self):
+        self.assertEqual(self._path((1, 1), (7, 3), max_depth=11), [])
+        self.assertEqual(len(self._path((1, 1), (7, 3), max_depth=12)), 12)
+
+    def test_node_limit(self):
+        self.assertEqual(self._path((1, 1), (7, 3), max_nodes=3), [])
+
+    def test_goal_need_not_be_walkable(self):
+        level = ['#####', '#.E.#', '#####']
+        self.assertEqual(self._path((1, 1), (2, 1), level), [(2, 1)])
+        self.assertEqual(self._path((1, 1), (3, 1), level), [])
+
+    def test_tile_grid_and_list_masks_match(self):
+        self.assertEqual(build_walkable_mask(self.LEVEL), build_walkable_mask(TileGrid.from_rows(self.LEVEL)))
+
+    def test_lengths_match_bfs_on_generated_map(self):
+        result = utils.generate_dungeon_data(80, 30, seed=4, num_enemies=10)
+        level = result.level
+        mgr = EntityManager()
+        rng = random.Random(4)
+        floor = [(x, y) for y, row in enumerate(level) for x, ch in enumerate(row) if ch == '.']
+        goal = result.player_pos
+        for start in rng.sample(floor, 60):
+            path = mgr._find_path(start, goal, level, 80, 30)
+            self.assertEqual(len(path), bfs_length(start, goal, level), start)
+
+
+class TestEntityManagerPathing(unittest.TestCase):
+    def test_max_path_length_configurable(self):
+        level = ['#########', '#.......#', '#########']
+        mgr = EntityManager(max_path_length=3)
+        self.assertEqual(mgr._find_path((1, 1), (7, 1), level, 9, 3), [])
+        mgr = EntityManager(max_path_length=6)
+        self.assertEqual(len(mgr._find_path((1, 1), (7, 1), level, 9, 3)), 6)
+
+    def test_mask_follows_moves(self):
+        level = TileGrid.from_rows(['#######', '#E....#', '#######'])
+        mgr = EntityManager()
+        mgr.load_from_level(level)
+        mgr._rebuild_walkable(level)
+        enemy = next(iter(mgr.entities_by_id.values()))
+        self.assertTrue(mgr._move_entity(enemy, (2, 1), level, 7, 3))
+        self.assertEqual(mgr._walkable, build_walkable_mask(level))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+分层区段分析器测试
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.entities import Enemy, EntityManager
+from game.profiler import ZoneProfiler, get_profiler, profile_zone, profiled
+from game.tile_grid import TileGrid
+
+
+LEVEL = [
+    '##########',
+    '#........#',
+    '#...#....#',
+    '#........#',
+    '##########',
+]
+
+
+class TestZoneProfiler(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        profiler = ZoneProfiler()
+        self.assertIs(profiler.zone('a'), profiler.zone('b'))
+        with profiler.zone('a'):
+            pass
+        profiler.begin_frame()
+        profiler.end_frame()
+        self.assertEqual((profiler.totals, len(profiler.events), profiler.frames), ({}, 0, 0))
+
+    def test_nested_self_time(self):
+        profiler = ZoneProfiler()
+        profiler.enable()
+        profiler.begin_frame()
+        with profiler.zone('outer'):
+            with profiler.zone('outer.inner'):
+                time.sleep(0.01)
+            with profiler.zone('outer.inner'):
+                pass
+        profiler.end_frame()
+        table = {row['zone']: row for row in profiler.get_table()}
+        self.assertEqual(table['outer.inner']['calls'], 2)
+        self.assertGreaterEqual(table['outer']['total_ms'], table['outer.inner']['total_ms'])
+        self.assertLess(table['outer']['self_ms'], table['outer.inner']['total_ms'])
+        self.assertLess(table['frame']['self_ms'], table['frame']['total_ms'])
+        self.assertEqual(profiler.frames, 1)
+        self.assertEqual(profiler.get_table()[0]['zone'], 'frame')
+
+    def test_unfinished_frame_is_closed(self):
+        profiler = ZoneProfiler()
+        profiler.enable()
+        profiler.begin_frame()
+        profiler.begin_frame()
+        profiler.end_frame()
+        self.assertEqual(profiler.frames, 2)
+        self.assertEqual(profiler._stack(), [])
+
+    def test_chrome_trace_and_table(self):
+        profiler = ZoneProfiler()
+        profiler.enable()
+        profiler.begin_frame()
+        with profiler.zone('ai.pathfind'):
+            pass
+        profiler.end_frame()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'profile', 'run.json')
+            table = profiler.write_report(path)
+            with open(path, encoding='utf-8') as f:
+                trace = json.load(f)
+            with open(os.path.join(tmp, 'profile', 'run.txt'), encoding='utf-8') as f:
+                self.assertEqual(f.read().strip(), table)
+        events = {e['name']: e for e in trace['traceEvents']}
+        self.assertEqual(set(events), {'frame', 'ai.pathfind'})
+        zone = events['ai.pathfind']
+        self.assertEqual((zone['ph'], zone['cat'], zone['args']['frame']), ('X', 'ai', 0))
+        frame = events['frame']
+        self.assertLessEqual(frame['ts'], zone['ts'])
+        self.assertGreaterEqual(frame['ts'] + frame['dur'], zone['ts'] + zone['dur'])
+        self.assertIn('ai.pathfind', table)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.profiler = get_profiler()
+        self.profiler.reset()
+        self.profiler.enable()
+        self.addCleanup(self.profiler.disable)
+        self.addCleanup(self.profiler.reset)
+
+    def test_decorator_and_zone(self):
+        @profiled('test.fn')
+        def fn(x):
+            with profile_zone('test.inner'):
+                return x * 2
+
+        self.assertEqual(fn(3), 6)
+        self.assertEqual(fn.__name__, 'fn')
+        self.assertEqual(self.profiler.totals['test.fn'][0], 1)
+        self.assertEqual(self.profiler.totals['test.inner'][0], 1)
+
+        self.profiler.disable()
+        self.assertEqual(fn(4), 8)
+        self.assertEqual(self.profiler.totals['test.fn'][0], 1)
+
+    def test_entity_update_zones(self):
+        level = TileGrid.from_rows(LEVEL)
+        mgr = EntityManager(use_flow_field=False, use_ai_lod=False)
+        mgr.add(Enemy(1, 1))
+        level.set(1, 1, 'E')
+        mgr._find_path((1, 1), (8, 3), level, 10, 5)
+        mgr.update(level, (8, 3), 10, 5)
+        self.assertIn('ai.update', self.profiler.totals)
+        self.assertIn('ai.pathfind', self.profiler.totals)
+
+
+if __name__ == '__main__':
+    unittest.main()
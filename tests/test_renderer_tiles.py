@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+逐格渲染（查表 + 批量 blit）测试
+"""
+import os
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from game.config import GameConfig
+from game.fov import FOVSystem, TileVisibility
+from game.glyph_atlas import TILE_COLORS, dim_color
+from game.renderer import Renderer
+from game.state import GameState
+
+
+class _Player:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.flash_time = 0
+        self.fov_system = FOVSystem(6)
+
+
+def _make_level(width, height):
+    rng = random.Random(5)
+    rows = []
+    for y in range(height):
+        row = ''.join(rng.choice('....#E') for _ in range(width))
+        rows.append(row)
+    rows[5] = rows[5][:5] + '@' + rows[5][6:]
+    rows[2] = rows[2][:3] + 'X' + rows[2][4:]
+    return rows
+
+
+class TestRenderLevelTiles(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.config = GameConfig()
+        self.config.view_width = 20
+        self.config.view_height = 12
+        self.game_state = GameState(self.config)
+        self.game_state.set_level(_make_level(20, 12))
+        self.renderer = Renderer(self.config, self.game_state)
+        self.player = _Player(5, 5)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def _reference(self, fov_enabled):
+        """逐格判断可见性并 blit 的参考实现"""
+        r = self.renderer
+        level = self.game_state.level
+        for y in range(len(level)):
+            for x, ch in enumerate(level[y]):
+                if fov_enabled:
+                    vis = TileVisibility.get_visibility_state(x, y, self.player.fov_system)
+                    if vis == TileVisibility.HIDDEN:
+                        continue
+                    if vis == TileVisibility.EXPLORED:
+                        ch = '.' if ch == 'E' else ch
+                        color = dim_color(TILE_COLORS.get(ch, TILE_COLORS['.']))
+                    else:
+                        color = r._get_tile_color(ch, x, y, None, self.player)
+                else:
+                    color = r._get_tile_color(ch, x, y, None, self.player)
+                surf = r.glyph_atlas.get(ch, color)
+                r.screen.blit(surf, (x * self.config.tile_size, y * self.config.tile_size))
+
+    def _snapshot(self, draw):
+        self.renderer.screen.fill((0, 0, 0))
+        draw()
+        return pygame.image.tostring(self.renderer.screen, 'RGB')
+
+    def test_matches_per_tile_reference(self):
+        fov = self.player.fov_system
+        fov.calculate_fov(12, 8, self.game_state.level)
+        fov.calculate_fov(5, 5, self.game_state.level)
+        for fov_enabled in (False, True):
+            self.config.enable_fov = fov_enabled
+            fast = self._snapshot(lambda: self.renderer._render_level_tiles(0, 0, 20, 12, None, self.player, 0, 0))
+            slow = self._snapshot(lambda: self._reference(fov_enabled))
+            self.assertEqual(fast, slow)
+
+    def test_table_rebuilt_on_font_change(self):
+        table = self.renderer._tile_glyph_table()
+        self.assertIs(self.renderer._tile_glyph_table(), table)
+        self.assertIsNone(table[ord('#') * 4 + TileVisibility.HIDDEN])
+        self.config.tile_size += 4
+        self.renderer.glyph_atlas.ensure(self.renderer.font, self.config.tile_size)
+        self.assertIsNot(self.renderer._tile_glyph_table(), table)
+
+
+if __name__ == '__main__':
+    unittest.main()
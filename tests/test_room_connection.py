@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+房间连接（最小生成树）测试
+"""
+import unittest
+import random
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+
+
+def _weight(centers, edges):
+    return sum(abs(centers[a][0] - centers[b][0]) + abs(centers[a][1] - centers[b][1]) for a, b in edges)
+
+
+def _is_spanning_tree(n, edges):
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for a, b in edges:
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            return False
+        parent[ra] = rb
+    return len(edges) == n - 1
+
+
+class TestRoomMst(unittest.TestCase):
+    """堆优化 Prim 与原实现得到等权重的生成树"""
+
+    def test_heap_mst_matches_legacy_weight(self):
+        rng = random.Random(42)
+        for n in (1, 2, 5, 30, 120):
+            centers = [(rng.randrange(400), rng.randrange(200)) for _ in range(n)]
+            heap_edges = utils._room_mst_heap(centers)
+            legacy_edges = utils._room_mst_legacy(centers)
+            self.assertTrue(_is_spanning_tree(n, heap_edges), f"n={n}")
+            self.assertEqual(_weight(centers, heap_edges), _weight(centers, legacy_edges), f"n={n}")
+
+    def test_empty(self):
+        self.assertEqual(utils._room_mst_heap([]), [])
+
+    def test_ties_are_deterministic(self):
+        centers = [(0, 0), (2, 0), (0, 2), (2, 2), (1, 1)]
+        self.assertEqual(utils._room_mst_heap(centers), utils._room_mst_heap(list(centers)))
+
+
+class TestSparseRoomMst(unittest.TestCase):
+    """候选图 Kruskal 与全量扫描得到等权重的生成树"""
+
+    def test_matches_dense_weight(self):
+        rng = random.Random(7)
+        for n in (2, 3, 10, 60, 250, 600):
+            centers = [(rng.randrange(400), rng.randrange(200)) for _ in range(n)]
+            edges = utils._room_mst_sparse(centers)
+            self.assertTrue(_is_spanning_tree(n, edges), f"n={n}")
+            self.assertEqual(_weight(centers, edges), _weight(centers, utils._room_mst_heap(centers)), f"n={n}")
+
+    def test_clustered_and_duplicate_centers(self):
+        rng = random.Random(3)
+        centers = [(rng.randrange(5), rng.randrange(5)) for _ in range(80)]
+        centers += [(300 + rng.randrange(3), 150 + rng.randrange(3)) for _ in range(80)]
+        centers += [(0, 0)] * 5 + [(150, 0), (150, 1), (0, 199)]
+        edges = utils._room_mst_sparse(centers)
+        self.assertTrue(_is_spanning_tree(len(centers), edges))
+        self.assertEqual(_weight(centers, edges), _weight(centers, utils._room_mst_heap(centers)))
+
+    def test_candidate_degree_is_bounded(self):
+        rng = random.Random(11)
+        centers = [(rng.randrange(1000), rng.randrange(1000)) for _ in range(400)]
+        self.assertLessEqual(len(utils._room_candidate_edges(centers)), 4 * len(centers))
+
+    def test_disconnected_candidates_fall_back(self):
+        centers = [(0, 0), (5, 0), (50, 50)]
+        with mock.patch.object(utils, '_room_candidate_edges', return_value=[(5, 0, 1)]):
+            edges = utils._room_mst_sparse(centers)
+        self.assertEqual(edges, utils._room_mst_heap(centers))
+
+    def test_small(self):
+        self.assertEqual(utils._room_mst_sparse([]), [])
+        self.assertEqual(utils._room_mst_sparse([(3, 4)]), [])
+
+
+class TestLegacyConnectFlag(unittest.TestCase):
+    def _generate(self, seed, **kwargs):
+        random.seed(seed)
+        return utils.generate_dungeon_data(80, 30, seed=seed, **kwargs).level
+
+    def test_generation_is_reproducible(self):
+        for legacy in (False, True):
+            self.assertEqual(
+                self._generate(3, legacy_connect=legacy), self._generate(3, legacy_connect=legacy)
+            )
+
+    def test_every_map_has_exit(self):
+        for seed in range(10):
+            level = self._generate(seed)
+            self.assertTrue(any('X' in row for row in level), f"seed={seed}")
+
+
+if __name__ == '__main__':
+    unittest.main()
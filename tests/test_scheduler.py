@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+时间轮调度测试
+"""
+import copy
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.entities import Enemy, EntityManager
+from game.scheduler import TimingWheel
+from game.tile_grid import tile_getter
+
+
+class LegacyEntityManager(EntityManager):
+    """参考实现：每帧遍历所有敌人并累加 move_cooldown（调度器之前的 update 主循环）"""
+
+    def update(self, level, player_pos, WIDTH, HEIGHT, move_interval_frames=15):
+        events = []
+        self._rebuild_walkable(level)
+        for _, ent in list(self.entities_by_pos.items()):
+            if not isinstance(ent, Enemy):
+                continue
+            ent.move_cooldown += 1
+            if ent.move_cooldown < ent.enemy_stats.get('move_interval', 6):
+                continue
+            ent.move_cooldown = 0
+            action = self._update_enemy_ai(ent, level, player_pos, WIDTH, HEIGHT)
+            if action['type'] == 'attack':
+                events.append({'type': 'attack', 'pos': action['target'], 'attacker_id': ent.id})
+            elif action['type'] == 'move':
+                if not self._move_entity(ent, action['target'], level, WIDTH, HEIGHT):
+                    ent.stuck_counter += 1
+                    if ent.stuck_counter > 3:
+                        ent.path = []
+                        ent.stuck_counter = 0
+                        if ent.state == 'chase':
+                            ent.state = 'patrol'
+                else:
+                    ent.stuck_counter = 0
+        return events
+
+
+class TestTimingWheel(unittest.TestCase):
+    def test_pop_due_only_returns_current_tick(self):
+        wheel = TimingWheel(slots=4)
+        wheel.schedule(1, 'a')
+        wheel.schedule(5, 'b')  # 同槽，下一圈
+        wheel.schedule(2, 'c')
+        self.assertEqual(len(wheel), 3)
+        self.assertEqual(wheel.pop_due(1), ['a'])
+        self.assertEqual(wheel.pop_due(2), ['c'])
+        self.assertEqual(wheel.pop_due(3), [])
+        self.assertEqual(wheel.pop_due(5), ['b'])
+        self.assertEqual(len(wheel), 0)
+
+
+class TestScheduledUpdate(unittest.TestCase):
+    def _setup(self, manager_cls, result):
+        level = copy.deepcopy(result.level)
+        mgr = manager_cls(rng=random.Random(3), use_ai_lod=False)
+        mgr.load_configs_with_level(copy.deepcopy(result.enemies), level)
+        return mgr, level
+
+    def test_matches_per_frame_loop(self):
+        result = utils.generate_dungeon_data(60, 24, seed=21, num_enemies=12)
+        legacy, legacy_level = self._setup(LegacyEntityManager, result)
+        sched, sched_level = self._setup(EntityManager, result)
+        self.assertGreater(len(sched.entities_by_id), 5)
+        # 一个敌人带着未走完的冷却加入
+        for mgr in (legacy, sched):
+            next(iter(mgr.entities_by_id.values())).move_cooldown = 2
+
+        width, height = 60, 24
+        player = result.player_pos
+        walk = random.Random(5)
+        get_tile = tile_getter(legacy_level)
+        for _ in range(300):
+            dx, dy = walk.choice(((0, 1), (0, -1), (1, 0), (-1, 0), (0, 0)))
+            nx, ny = player[0] + dx, player[1] + dy
+            if get_tile(nx, ny) == '.':
+                player = (nx, ny)
+            legacy_events = legacy.update(legacy_level, player, width, height)
+            sched_events = sched.update(sched_level, player, width, height)
+            self.assertEqual(
+                [e['attacker_id'] for e in legacy_events], [e['attacker_id'] for e in sched_events]
+            )
+            self.assertEqual(
+                {i: (e.x, e.y) for i, e in legacy.entities_by_id.items()},
+                {i: (e.x, e.y) for i, e in sched.entities_by_id.items()},
+            )
+            for ent_id, ent in legacy.entities_by_id.items():
+                self.assertEqual(ent.move_cooldown, sched.move_cooldown_of(sched.entities_by_id[ent_id]))
+
+    def test_removed_enemy_is_not_updated(self):
+        result = utils.generate_dungeon_data(60, 24, seed=21, num_enemies=6)
+        mgr, level = self._setup(EntityManager, result)
+        victim = next(iter(mgr.entities_by_id.values()))
+        pos = (victim.x, victim.y)
+        mgr.remove(victim)
+        for _ in range(30):
+            mgr.update(level, result.player_pos, 60, 24)
+        self.assertEqual((victim.x, victim.y), pos)
+        self.assertEqual(victim.move_cooldown, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
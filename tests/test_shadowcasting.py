@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+对称阴影投射视野测试
+"""
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.entities import Enemy, EntityManager
+from game.fov import FOVSystem, TileVisibility, circle_extents
+from game.tile_grid import TileGrid
+
+
+ROOM = [
+    '###########',
+    '#.........#',
+    '#....#....#',
+    '#.........#',
+    '###########',
+]
+
+
+class TestShadowcasting(unittest.TestCase):
+    def test_circle_extents(self):
+        for radius in (1, 4, 15):
+            ext = circle_extents(radius)
+            self.assertEqual(len(ext), radius + 1)
+            for d, c in enumerate(ext):
+                self.assertLessEqual(d * d + c * c, radius * radius)
+                self.assertGreater(d * d + (c + 1) * (c + 1), radius * radius)
+
+    def test_open_field_matches_circle(self):
+        rows = ['.' * 41] * 41
+        fov = FOVSystem(sight_radius=15)
+        visible = fov.calculate_fov(20, 20, rows)
+        expected = {(x, y) for y in range(41) for x in range(41) if (x - 20) ** 2 + (y - 20) ** 2 <= 225}
+        self.assertEqual(visible, expected)
+
+    def test_walls_block_sight(self):
+        fov = FOVSystem(sight_radius=10)
+        fov.calculate_fov(2, 2, ROOM)
+        self.assertTrue(fov.is_visible(5, 2))  # 墙本身可见
+        self.assertFalse(fov.is_visible(8, 2))  # 墙后
+        self.assertTrue(fov.is_visible(8, 1))
+        self.assertTrue(fov.is_visible(0, 0))
+        self.assertFalse(fov.is_visible(-1, 2))
+
+    def test_symmetric_between_floor_tiles(self):
+        rng = random.Random(2)
+        rows = [''.join('#' if rng.random() < 0.3 else '.' for _ in range(30)) for _ in range(20)]
+        grid = TileGrid.from_rows(rows)
+        floors = [(x, y) for y in range(20) for x in range(30) if rows[y][x] == '.']
+        seen = {}
+        for x, y in floors:
+            seen[(x, y)] = FOVSystem(sight_radius=8).calculate_fov(x, y, grid)
+        for a in floors:
+            for b in seen[a]:
+                if b in seen:
+                    self.assertIn(a, seen[b], f'{a} sees {b} but not vice versa')
+
+    def test_grid_matches_set(self):
+        fov = FOVSystem(sight_radius=4)
+        fov.calculate_fov(2, 2, ROOM)
+        fov.calculate_fov(8, 3, ROOM)
+        grid = fov.get_visibility_grid()
+        from_grid = {(i % fov.width, i // fov.width) for i, v in enumerate(grid) if v == TileVisibility.VISIBLE}
+        self.assertEqual(from_grid, fov.visible_tiles)
+        self.assertEqual(TileVisibility.get_visibility_state(2, 2, fov), TileVisibility.EXPLORED)
+        self.assertEqual(TileVisibility.get_visibility_state(8, 3, fov), TileVisibility.VISIBLE)
+
+    def test_visibility_rows(self):
+        fov = FOVSystem(sight_radius=4)
+        fov.calculate_fov(2, 2, ROOM)
+        fov.calculate_fov(8, 3, ROOM)
+        rows = fov.get_visibility_rows(-2, 1, 12, 6)
+        self.assertEqual(len(rows), 5)
+        for y, row in zip(range(1, 6), rows):
+            self.assertEqual(len(row), 14)
+            for x, state in zip(range(-2, 12), row):
+                self.assertEqual(state, TileVisibility.get_visibility_state(x, y, fov))
+
+    def test_enemy_los_reuses_player_fov(self):
+        level = TileGrid.from_rows(ROOM)
+        fov = FOVSystem(sight_radius=10)
+        fov.calculate_fov(1, 3, level)
+        mgr = EntityManager()
+        mgr._fov_visible, mgr._fov_origin = fov.is_visible, (1, 3)
+        self.assertTrue(mgr._has_line_of_sight(Enemy(9, 3), (1, 3), level, 11, 5))
+        self.assertEqual(mgr.los.misses, 0)
+        self.assertFalse(mgr._has_line_of_sight(Enemy(9, 2), (1, 2), level, 11, 5))
+        self.assertEqual(mgr.los.misses, 1)
+
+    def test_enemy_in_view_is_blocked_by_other_enemy(self):
+        level = TileGrid.from_rows(ROOM)
+        utils.set_tile(level, 5, 3, 'E')
+        fov = FOVSystem(sight_radius=10)
+        fov.calculate_fov(1, 3, level)
+        self.assertTrue(fov.is_visible(9, 3))  # 玩家视野不被敌人遮挡
+        mgr = EntityManager()
+        mgr._fov_visible, mgr._fov_origin = fov.is_visible, (1, 3)
+        self.assertFalse(mgr._has_line_of_sight(Enemy(9, 3), (1, 3), level, 11, 5))
+        self.assertFalse(mgr.los.check(level, (9, 3), (1, 3), 11, 5))
+        self.assertTrue(mgr._has_line_of_sight(Enemy(3, 1), (1, 3), level, 11, 5))
+
+
+class TestIncrementalFOV(unittest.TestCase):
+    def test_cached_until_something_changes(self):
+        level = TileGrid.from_rows(ROOM)
+        fov = FOVSystem(sight_radius=10)
+        first = fov.calculate_fov(2, 2, level)
+        version = fov.version
+        self.assertIs(fov.calculate_fov(2, 2, level), first)
+        self.assertEqual((fov.hits, fov.recomputes, fov.version), (1, 1, version))
+
+        # 视野内地面上的敌人不遮挡玩家视线
+        utils.set_tile(level, 3, 1, 'E')
+        self.assertIs(fov.calculate_fov(2, 2, level), first)
+
+        fov.set_sight_radius(3)
+        self.assertIsNot(fov.calculate_fov(2, 2, level), first)
+        self.assertEqual(fov.recomputes, 2)
+
+    def test_wall_change_invalidates(self):
+        level = TileGrid.from_rows(ROOM)
+        fov = FOVSystem(sight_radius=10)
+        fov.calculate_fov(2, 2, level)
+        self.assertFalse(fov.is_visible(8, 2))
+        utils.set_tile(level, 5, 2, '.')
+        self.assertEqual(fov.terrain_version, 1)
+        fov.calculate_fov(2, 2, level)
+        self.assertTrue(fov.is_visible(8, 2))
+        self.assertIn((8, 2), fov.last_delta.entered)
+
+    def test_delta_matches_set_difference(self):
+        rng = random.Random(4)
+        rows = [''.join('#' if rng.random() < 0.25 else '.' for _ in range(40)) for _ in range(25)]
+        fov = FOVSystem(sight_radius=6)
+        x, y = 20, 12
+        before = set(fov.calculate_fov(x, y, rows))
+        explored = set(before)
+        for _ in range(60):
+            dx, dy = rng.choice(((0, 1), (0, -1), (1, 0), (-1, 0)))
+            if 0 < x + dx < 39 and 0 < y + dy < 24:
+                x, y = x + dx, y + dy
+            after = fov.calculate_fov(x, y, rows)
+            if after != before:
+                entered, left = fov.last_delta
+                self.assertEqual(set(entered), after - before)
+                self.assertEqual(set(left), before - after)
+            explored |= after
+            self.assertEqual(len(fov.get_explored_tiles()), len(explored))
+            before = set(after)
+
+    def test_cached_matches_fresh_after_random_edits(self):
+        rng = random.Random(19)
+        rows = [''.join('#' if rng.random() < 0.3 else '.' for _ in range(60)) for _ in range(40)]
+        level = TileGrid.from_rows(rows)
+        fov = FOVSystem(sight_radius=8)
+        x, y = 32, 21
+        utils.set_tile(level, x, y, '.')
+        for step in range(2000):
+            if rng.random() < 0.5:
+                dx, dy = rng.choice(((0, 1), (0, -1), (1, 0), (-1, 0)))
+                if 0 <= x + dx < 60 and 0 <= y + dy < 40 and level.get(x + dx, y + dy) != '#':
+                    x, y = x + dx, y + dy
+            else:
+                ex, ey = x + rng.randint(-9, 9), y + rng.randint(-9, 9)
+                if (ex, ey) != (x, y) and 0 <= ex < 60 and 0 <= ey < 40:
+                    utils.set_tile(level, ex, ey, rng.choice('#.E'))
+            cached = fov.calculate_fov(x, y, level)
+            self.assertEqual(cached, FOVSystem(sight_radius=8).calculate_fov(x, y, level), f"step={step}")
+        self.assertGreater(fov.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+逐帧遥测环形缓冲测试
+"""
+import math
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.performance import PerformanceMonitor
+from game.telemetry import COL_FRAME, COL_FRAME_MS, COL_RENDER_MS, FIELDS, TelemetryRing, load_telemetry
+
+try:
+    import numpy  # noqa: F401
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _filled(rows, capacity):
+    ring = TelemetryRing(capacity)
+    for i in range(rows):
+        ring.begin_row()
+        ring.set(COL_FRAME, i)
+        ring.set(COL_FRAME_MS, i * 0.5)
+    return ring
+
+
+class TestTelemetryRing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_wraps_and_keeps_order(self):
+        ring = _filled(10, 4)
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(ring.recent('frame'), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(ring.recent('frame_ms', 2), [4.0, 4.5])
+        # 未写入的列为 NaN，统计时跳过
+        self.assertEqual(ring.recent('render_ms'), [])
+        self.assertTrue(math.isnan(ring.get(COL_RENDER_MS)))
+
+    def test_recording_does_not_allocate(self):
+        ring = _filled(100, 64)
+        before = sys.getallocatedblocks()
+        for i in range(5000):
+            ring.begin_row()
+            ring.set(COL_FRAME, i)
+            ring.set(COL_FRAME_MS, 16.5)
+        self.assertLess(sys.getallocatedblocks() - before, 50)
+
+    def test_binary_round_trip(self):
+        path = os.path.join(self.tmp.name, 'run.tlm')
+        self.assertEqual(_filled(10, 4).dump(path), 4)
+        data = load_telemetry(path)
+        self.assertEqual(set(data), set(FIELDS))
+        self.assertEqual(list(data['frame']), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(list(data['frame_ms']), [3.0, 3.5, 4.0, 4.5])
+        self.assertTrue(all(math.isnan(v) for v in data['render_ms']))
+
+    def test_binary_round_trip_without_numpy(self):
+        path = os.path.join(self.tmp.name, 'run.tlm')
+        _filled(3, 8).dump(path)
+        with mock.patch.dict(sys.modules, {'numpy': None}):
+            data = load_telemetry(path)
+        self.assertEqual(list(data['frame']), [0.0, 1.0, 2.0])
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, 'numpy not installed')
+    def test_npz_round_trip(self):
+        path = os.path.join(self.tmp.name, 'run.npz')
+        _filled(6, 4).dump(path)
+        data = load_telemetry(path)
+        self.assertEqual(list(data['frame']), [2.0, 3.0, 4.0, 5.0])
+
+
+class TestMonitorTelemetry(unittest.TestCase):
+    def test_frame_rows(self):
+        logger = mock.Mock()
+        monitor = PerformanceMonitor(logger, telemetry_capacity=16)
+        for i in range(3):
+            monitor.start_frame()
+            monitor.record_update_time(2.0 + i)
+            monitor.record_counts(5, 40 + i)
+            monitor.record_render_time(4.0)
+            monitor.end_frame()
+        ring = monitor.telemetry
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.recent('frame'), [0.0, 1.0, 2.0])
+        self.assertEqual(ring.recent('visible_tiles'), [40.0, 41.0, 42.0])
+        self.assertEqual(monitor.update_times, [2.0, 3.0, 4.0])
+        # 每帧指标不再写成 PERF_DATA 文本日志
+        for call in logger.debug.call_args_list:
+            self.assertNotIn('PERF_DATA', str(call.args[0]))
+
+    def test_dump(self):
+        monitor = PerformanceMonitor(telemetry_capacity=16)
+        monitor.start_frame()
+        monitor.record_render_time(3.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'perf', 'run.tlm')
+            self.assertEqual(monitor.dump_telemetry(path), 1)
+            self.assertEqual(list(load_telemetry(path)['render_ms']), [3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
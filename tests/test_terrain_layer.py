@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+静态地形层测试
+"""
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game import terrain_layer as terrain_module
+from game.fov import FOVSystem, TileVisibility
+from game.glyph_atlas import GlyphAtlas, TILE_COLORS, dim_color
+from game.terrain_layer import TerrainLayer, terrain_key
+
+
+class FakeFont:
+    def render(self, text, antialias, color):
+        return (text, color)
+
+
+class FakeRect:
+    def __init__(self, x, y, w, h):
+        self.rect = (x, y, w, h)
+
+    def clip(self, other):
+        return self
+
+
+class FakeSurface:
+    """记录 blit 次数的假 Surface"""
+
+    def __init__(self, size=(0, 0)):
+        self.size = size
+        self.blits = 0
+        self.clip = None
+
+    def convert(self):
+        return self
+
+    def fill(self, color, rect=None):
+        pass
+
+    def blit(self, surf, pos):
+        self.blits += 1
+
+    def get_clip(self):
+        return self.clip
+
+    def set_clip(self, rect):
+        self.clip = rect
+
+
+class FakePygame:
+    Surface = FakeSurface
+    Rect = FakeRect
+
+
+class FakeFOV:
+    def __init__(self, visible):
+        self.visible_tiles = set(visible)
+        self.previously_seen = set(visible)
+
+    def is_visible(self, x, y):
+        return (x, y) in self.visible_tiles
+
+    def is_explored(self, x, y):
+        return (x, y) in self.previously_seen
+
+
+LEVEL = [
+    '##########',
+    '#@.......#',
+    '#....E...#',
+    '#.......X#',
+    '##########',
+]
+
+
+class TestTerrainKey(unittest.TestCase):
+    """测试地形层字形选择"""
+
+    def test_keys(self):
+        self.assertEqual(terrain_key('#', TileVisibility.VISIBLE), ('#', TILE_COLORS['#']))
+        self.assertIsNone(terrain_key('#', TileVisibility.HIDDEN))
+        self.assertIsNone(terrain_key('@', TileVisibility.VISIBLE))
+        self.assertIsNone(terrain_key('E', TileVisibility.VISIBLE))
+        # 雾中的敌人显示为已探索地面
+        self.assertEqual(terrain_key('E', TileVisibility.EXPLORED), ('.', dim_color(TILE_COLORS['.'])))
+
+
+class TestTerrainLayer(unittest.TestCase):
+    """测试分块缓存与脏格子重绘"""
+
+    def setUp(self):
+        patcher = mock.patch.object(terrain_module, 'pygame', FakePygame)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.level = list(LEVEL)
+        self.layer = TerrainLayer(GlyphAtlas(FakeFont(), 8), 8, chunk_size=4)
+        utils.add_tile_listener(self.layer.mark_dirty)
+        self.addCleanup(utils.remove_tile_listener, self.layer.mark_dirty)
+        self.screen = FakeSurface()
+
+    def _draw(self, fov=None):
+        self.layer.bind(self.level, 8, fov is not None)
+        self.layer.draw(self.screen, 0, 0, 10, 5, 0, 0, 0, 0, fov)
+
+    def test_chunks_built_once(self):
+        """分块只在首次绘制时光栅化，之后每帧只 blit"""
+        self._draw()
+        built = self.layer.chunks_built
+        redrawn = self.layer.cells_redrawn
+        self.assertEqual(built, 3 * 2)
+        self.assertEqual(self.layer.dynamic_cells, {(1, 1), (5, 2)})
+
+        self._draw()
+        self.assertEqual(self.layer.chunks_built, built)
+        self.assertEqual(self.layer.cells_redrawn, redrawn)
+
+    def test_set_tile_marks_dirty(self):
+        """set_tile 改变的格子只重绘该格"""
+        self._draw()
+        redrawn = self.layer.cells_redrawn
+        utils.set_tile(self.level, 1, 1, '.')
+        utils.set_tile(self.level, 2, 1, '@')
+        self._draw()
+        # (1,1) 由留空变为地面需要重绘；(2,1) 由地面变为留空
+        self.assertEqual(self.layer.cells_redrawn, redrawn + 2)
+        self.assertEqual(self.layer.dynamic_cells, {(2, 1), (5, 2)})
+
+    def test_other_level_ignored(self):
+        """其他关卡上的 set_tile 不影响当前地形层"""
+        self._draw()
+        other = list(LEVEL)
+        utils.set_tile(other, 2, 2, '#')
+        self._draw()
+        self.assertFalse(self.layer._dirty)
+
+    def test_level_change_rebuilds(self):
+        """切换关卡时整体重建"""
+        self._draw()
+        rebuilds = self.layer.rebuilds
+        self.level = list(LEVEL)
+        self._draw()
+        self.assertEqual(self.layer.rebuilds, rebuilds + 1)
+
+    def test_fov_delta(self):
+        """视野变化只重绘进出视野的格子"""
+        fov = FakeFOV({(1, 1), (2, 1)})
+        self._draw(fov)
+        redrawn = self.layer.cells_redrawn
+
+        fov.visible_tiles = {(2, 1), (3, 1)}
+        fov.previously_seen.update(fov.visible_tiles)
+        self._draw(fov)
+        # (1,1) 变为雾中玩家、(3,1) 变为可见地面
+        self.assertEqual(self.layer.cells_redrawn, redrawn + 2)
+
+    def test_fov_system_delta(self):
+        """真实视野系统：按 last_delta 标记脏格子，视野未变时不做比较"""
+        fov = FOVSystem(sight_radius=2)
+        fov.calculate_fov(1, 1, self.level)
+        self._draw(fov)
+        redrawn = self.layer.cells_redrawn
+
+        fov.calculate_fov(2, 1, self.level)
+        entered, left = fov.last_delta
+        self.assertTrue(entered and left)
+        self._draw(fov)
+        self.assertEqual(self.layer.delta_syncs, 1)
+        self.assertGreater(self.layer.cells_redrawn, redrawn)
+
+        fov.calculate_fov(2, 1, self.level)
+        self._draw(fov)
+        self.assertEqual(self.layer.delta_syncs, 1)
+        self.assertFalse(self.layer._dirty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+TileGrid 瓦片网格测试
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.tile_grid import TileGrid, as_tile_grid, find_tiles, row_codes, tile_getter
+
+
+LEVEL = [
+    '#######',
+    '#@..E.#',
+    '#.#..X#',
+    '#######',
+]
+
+
+class TestTileGrid(unittest.TestCase):
+    """测试 TileGrid 读写、批量查询与兼容接口"""
+
+    def setUp(self):
+        self.grid = TileGrid.from_rows(LEVEL)
+
+    def test_dimensions_and_rows(self):
+        self.assertEqual((self.grid.width, self.grid.height), (7, 4))
+        self.assertEqual(len(self.grid), 4)
+        self.assertEqual(self.grid[1], '#@..E.#')
+        self.assertEqual(self.grid[1][4], 'E')
+        self.assertEqual(self.grid[-1], '#######')
+        self.assertEqual(list(self.grid), LEVEL)
+        self.assertEqual(self.grid, LEVEL)
+        self.assertEqual('\n'.join(self.grid), '\n'.join(LEVEL))
+
+    def test_get_set(self):
+        self.grid.set(2, 1, '@')
+        self.assertEqual(self.grid.get(2, 1), '@')
+        # 行缓存随写入失效
+        self.assertEqual(self.grid[1], '#@@.E.#')
+
+    def test_row_assignment(self):
+        """兼容 level[y] = row 写法"""
+        self.grid[2] = '#.....#'
+        self.assertEqual(self.grid.get(5, 2), '.')
+        with self.assertRaises(ValueError):
+            self.grid[2] = '#..#'
+
+    def test_bulk_queries(self):
+        self.assertEqual(self.grid.find('@'), (1, 1))
+        self.assertIsNone(self.grid.find('N'))
+        self.assertEqual(self.grid.find_all('X'), [(5, 2)])
+        self.assertEqual(self.grid.count('#'), 19)
+        self.assertEqual(len(self.grid.floor_cells()), 6)
+        mask = self.grid.walkable_mask()
+        self.assertEqual(mask[1 * 7 + 2], 1)
+        self.assertEqual(mask[1 * 7 + 4], 0)
+        self.assertEqual(sum(self.grid.walkable_mask('.@')), 7)
+
+    def test_list_of_lists(self):
+        grid = as_tile_grid([list(row) for row in LEVEL])
+        self.assertEqual(grid, LEVEL)
+        self.assertIs(as_tile_grid(grid), grid)
+        self.assertFalse(as_tile_grid([]))
+
+    def test_helpers_accept_lists(self):
+        self.assertEqual(find_tiles(LEVEL, 'E'), self.grid.find_all('E'))
+        self.assertEqual(tile_getter(LEVEL)(5, 2), tile_getter(self.grid)(5, 2))
+        self.assertEqual(row_codes(LEVEL, 1, 1, 5), b'@..E')
+        self.assertEqual(row_codes(self.grid, 1, 1, 5), b'@..E')
+
+    def test_set_tile(self):
+        """utils.set_tile 在 TileGrid 上原地写入，并保留出口保护"""
+        utils.set_tile(self.grid, 2, 1, 'E')
+        self.assertEqual(self.grid.get(2, 1), 'E')
+        utils.set_tile(self.grid, 5, 2, '.')
+        self.assertEqual(self.grid.get(5, 2), 'X')
+        utils.set_tile(self.grid, 5, 2, '@', force=True)
+        self.assertEqual(self.grid.get(5, 2), '@')
+        # 越界写入被忽略
+        utils.set_tile(self.grid, 99, 1, 'E')
+        self.assertEqual(utils.find_player(self.grid), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+逐帧遥测分析：读取 --telemetry 写出的 .tlm / .npz 文件
+
+输出各列的平均 / p50 / p95 / p99 / 最大值，以及最慢的若干帧及其子系统耗时分解。
+
+用法: python tools/analyze_telemetry.py <文件> [最慢帧数]
+"""
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.telemetry import load_telemetry
+
+TIMING_COLUMNS = ('frame_ms', 'input_ms', 'update_ms', 'transition_ms', 'render_ms')
+COUNT_COLUMNS = ('entities', 'visible_tiles', 'fps', 'memory_mb')
+
+
+def _percentile(values, pct):
+    if not values:
+        return float('nan')
+    index = min(len(values) - 1, max(0, int(math.ceil(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+def _summary(name, column):
+    values = sorted(v for v in column if v == v)
+    if not values:
+        return f"{name:>14} | {'-':>8} | {'-':>8} | {'-':>8} | {'-':>8} | {'-':>8}"
+    avg = sum(values) / len(values)
+    return (
+        f"{name:>14} | {avg:8.2f} | {_percentile(values, 50):8.2f} | {_percentile(values, 95):8.2f} | "
+        f"{_percentile(values, 99):8.2f} | {values[-1]:8.2f}"
+    )
+
+
+def analyze(path: str, worst: int = 10):
+    start = time.perf_counter()
+    data = load_telemetry(path)
+    load_ms = (time.perf_counter() - start) * 1000
+    frames = data.get('frame', ())
+    print(f"遥测文件: {path} ({len(frames)} 帧, 读取 {load_ms:.2f} ms)")
+    if not len(frames):
+        return
+
+    print("-" * 66)
+    print(f"{'列':>14} | {'平均':>8} | {'p50':>8} | {'p95':>8} | {'p99':>8} | {'最大':>8}")
+    for name in TIMING_COLUMNS + COUNT_COLUMNS:
+        if name in data:
+            print(_summary(name, data[name]))
+
+    frame_ms = data.get('frame_ms')
+    if frame_ms is None:
+        return
+    ranked = sorted((i for i in range(len(frame_ms)) if frame_ms[i] == frame_ms[i]), key=lambda i: -frame_ms[i])
+    print()
+    print(f"最慢的 {min(worst, len(ranked))} 帧 (ms):")
+    header = ' | '.join(f"{name[:-3]:>10}" for name in TIMING_COLUMNS)
+    print(f"{'帧':>8} | {header} | {'敌人':>6} | {'视野格':>6}")
+    for i in ranked[:worst]:
+        cells = ' | '.join(f"{data[name][i]:10.2f}" if name in data else f"{'-':>10}" for name in TIMING_COLUMNS)
+        entities = data['entities'][i] if 'entities' in data else float('nan')
+        visible = data['visible_tiles'][i] if 'visible_tiles' in data else float('nan')
+        entities = f"{int(entities):6d}" if entities == entities else f"{'-':>6}"
+        visible = f"{int(visible):6d}" if visible == visible else f"{'-':>6}"
+        print(f"{int(data['frame'][i]):8d} | {cells} | {entities} | {visible}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    n = 10
+    if len(sys.argv) >= 3:
+        try:
+            n = int(sys.argv[2])
+        except Exception:
+            pass
+    analyze(sys.argv[1], n)
@@ -54,7 +54,7 @@ class AutoFolderMaintenance:
         self.maintenance_thread.start()
         
         if self.logger:
-            self.logger.info("Auto folder maintenance started", "MAINTENANCE")
+            self.logger.info("Auto folder maintenance started", category="MAINTENANCE")
         else:
             print("🔧 自动文件夹维护已启动")
     
@@ -65,7 +65,7 @@ class AutoFolderMaintenance:
             self.maintenance_thread.join(timeout=5)
         
         if self.logger:
-            self.logger.info("Auto folder maintenance stopped", "MAINTENANCE")
+            self.logger.info("Auto folder maintenance stopped", category="MAINTENANCE")
         else:
             print("🛑 自动文件夹维护已停止")
     
@@ -112,7 +112,7 @@ class AutoFolderMaintenance:
         """执行清理"""
         try:
             if self.logger:
-                self.logger.info(f"Starting auto cleanup: {', '.join(reasons)}", "MAINTENANCE")
+                self.logger.info(f"Starting auto cleanup: {', '.join(reasons)}", category="MAINTENANCE")
             
             # 清理日志文件夹
             logs_result = self.folder_manager.cleanup_logs(dry_run=False)
@@ -126,7 +126,7 @@ class AutoFolderMaintenance:
             if self.logger:
                 self.logger.info(
                     f"Auto cleanup completed: {logs_archived} logs, {debug_archived} debug files archived",
-                    "MAINTENANCE"
+                    category="MAINTENANCE"
                 )
             else:
                 print(f"🧹 自动清理完成: 归档了{logs_archived}个日志文件, {debug_archived}个debug文件")
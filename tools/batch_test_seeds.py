@@ -1,6 +1,8 @@
 """Batch test generate_dungeon for a range of seeds and report missing exits.
 
 Usage: run with the project's virtualenv Python.
+    python tools/batch_test_seeds.py [start] [end] [backend]
+backend: python (default) or numpy
 """
 import sys
 import os
@@ -8,12 +10,19 @@ ROOT = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, ROOT)
 
 from game import utils
+from game.dungeon_batch import generate_dungeons
 
-def check_seeds(start=1, end=50):
+def check_seeds(start=1, end=50, backend='python'):
+    seeds = list(range(start, end+1))
+    try:
+        # all cores; identical to sequential generation thanks to per-seed RNGs
+        levels = [r.level for r in generate_dungeons(seeds, width=80, height=30, backend=backend)]
+    except Exception:
+        levels = None
     missing = []
-    for s in range(start, end+1):
+    for i, s in enumerate(seeds):
         try:
-            level = utils.generate_dungeon(80, 30, seed=s)
+            level = levels[i] if levels is not None else utils.generate_dungeon_data(80, 30, seed=s, backend=backend).level
             has_exit = any('X' in row for row in level)
             if not has_exit:
                 missing.append(s)
@@ -35,7 +44,8 @@ if __name__ == '__main__':
             end = int(sys.argv[2])
         except Exception:
             pass
-    miss = check_seeds(start, end)
+    backend = sys.argv[3] if len(sys.argv) >= 4 else 'python'
+    miss = check_seeds(start, end, backend)
     print(f'checked seeds {start}..{end} total={end-start+1} missing_count={len(miss)}')
     if miss:
         print('missing seeds:', miss)
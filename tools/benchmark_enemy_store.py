@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+敌人存储基准：对象 + 时间轮 vs 结构数组（numpy 向量化）
+
+开阔的 400x200 地图，敌人随机分布，玩家在中央，关闭 AI 分级让全部敌人保持活跃。
+AI 决策帧只返回 idle，比较每帧冷却计数、相邻攻击与追击范围判断这部分的开销。
+
+用法: python tools/benchmark_enemy_store.py [帧数]
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.entities import Enemy, EntityManager
+from game.enemy_store import NUMPY_AVAILABLE
+from game.tile_grid import TileGrid
+
+WIDTH = 400
+HEIGHT = 200
+KINDS = ('basic', 'guard', 'scout', 'brute')
+
+
+class _IdleManager(EntityManager):
+    def _plan_enemy_move(self, enemy, level, player_pos, WIDTH, HEIGHT, in_chase_range):
+        return {'type': 'idle'}
+
+
+def _tick_ms(backend, positions, frames):
+    level = TileGrid.from_rows(['#' * WIDTH] + ['#' + '.' * (WIDTH - 2) + '#'] * (HEIGHT - 2) + ['#' * WIDTH])
+    mgr = _IdleManager(rng=random.Random(1), use_flow_field=False, use_ai_lod=False, backend=backend)
+    kinds = random.Random(len(positions))
+    for x, y in positions:
+        level.set(x, y, 'E')
+        mgr.add(Enemy(x, y, kind=kinds.choice(KINDS)))
+    player = (WIDTH // 2, HEIGHT // 2)
+    start = time.perf_counter()
+    for _ in range(frames):
+        mgr.update(level, player, WIDTH, HEIGHT)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def run_benchmark(frames: int = 120):
+    if not NUMPY_AVAILABLE:
+        print("需要 numpy: pip install numpy")
+        return
+    rng = random.Random(11)
+    cells = [(x, y) for y in range(1, HEIGHT - 1) for x in range(1, WIDTH - 1) if (x, y) != (WIDTH // 2, HEIGHT // 2)]
+    print(f"敌人存储基准 ({WIDTH}x{HEIGHT}, {frames} 帧, 决策固定 idle)")
+    print("-" * 52)
+    print(f"{'敌人':>6} | {'对象 ms/帧':>10} | {'结构数组 ms/帧':>14} | {'加速':>6}")
+    for n in (100, 1000, 10000):
+        positions = rng.sample(cells, n)
+        objects = _tick_ms('objects', positions, frames)
+        soa = _tick_ms('soa', positions, frames)
+        print(f"{n:>6} | {objects:10.3f} | {soa:14.3f} | {objects / soa:5.1f}x")
+
+
+if __name__ == '__main__':
+    n = 120
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
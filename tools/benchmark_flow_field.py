@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+追击寻路基准：共享玩家距离场 vs 每个敌人一次 A*
+
+开阔的 200x100 地图（带随机柱子），敌人分布在玩家 30 步范围内并全部处于追击状态。
+每个 tick 玩家移动一格（距离场重算一次），统计单个 tick 内所有追击者规划路径的总耗时。
+
+用法: python tools/benchmark_flow_field.py [tick 数]
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.entities import EntityManager
+from game.flow_field import FlowField
+from game.tile_grid import TileGrid
+
+WIDTH = 200
+HEIGHT = 100
+RADIUS = 30
+
+
+def _make_level(rng):
+    rows = [['#'] * WIDTH] + [['#'] + ['.'] * (WIDTH - 2) + ['#'] for _ in range(HEIGHT - 2)] + [['#'] * WIDTH]
+    for _ in range(WIDTH * HEIGHT // 25):
+        rows[rng.randrange(1, HEIGHT - 1)][rng.randrange(1, WIDTH - 1)] = '#'
+    return TileGrid.from_rows(rows)
+
+
+def _tick_ms(mgr, level, player, chasers, use_field):
+    start = time.perf_counter()
+    if use_field:
+        mgr.flow_field.ensure(level, player, WIDTH, HEIGHT)
+        for pos in chasers:
+            mgr._chase_path(pos, player, level, WIDTH, HEIGHT)
+    else:
+        mgr._rebuild_walkable(level)
+        for pos in chasers:
+            mgr._find_path(pos, player, level, WIDTH, HEIGHT)
+    return (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(ticks: int = 5):
+    rng = random.Random(3)
+    level = _make_level(rng)
+    cx, cy = WIDTH // 2, HEIGHT // 2
+    for x, y in ((cx, cy), (cx + 1, cy)):
+        level.set(x, y, '.')
+    near = [
+        (x, y)
+        for y in range(HEIGHT)
+        for x in range(WIDTH)
+        if level.get(x, y) == '.' and 2 <= abs(x - cx) + abs(y - cy) <= RADIUS
+    ]
+    print(f"追击寻路基准 ({WIDTH}x{HEIGHT}, 半径 {RADIUS}, 每 tick 玩家移动一次)")
+    print("-" * 56)
+    print(f"{'追击者':>6} | {'A* ms/tick':>11} | {'距离场 ms/tick':>14} | {'加速':>6}")
+    for n in (100, 500, 1000):
+        chasers = rng.sample(near, n)
+        for x, y in chasers:
+            level.set(x, y, 'E')
+        mgr = EntityManager(max_path_length=RADIUS + 2)
+        mgr.flow_field = FlowField(RADIUS + 2)
+        results = {}
+        for use_field in (False, True):
+            total = 0.0
+            for t in range(ticks):
+                player = (cx + (t % 2), cy)
+                total += _tick_ms(mgr, level, player, chasers, use_field)
+            results[use_field] = total / ticks
+        for x, y in chasers:
+            level.set(x, y, '.')
+        print(f"{n:>6} | {results[False]:11.2f} | {results[True]:14.2f} | {results[False] / results[True]:5.1f}x")
+
+
+if __name__ == '__main__':
+    n = 5
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+视野基准：对称阴影投射每步重算耗时
+
+生成 400x200 地牢，玩家沿随机游走逐步移动，每步完整重算一次视野。
+
+用法: python tools/benchmark_fov.py [步数]
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.fov import FOVSystem
+from game.tile_grid import TileGrid, tile_getter
+
+WIDTH = 400
+HEIGHT = 200
+
+
+def run_benchmark(steps: int = 500):
+    result = utils.generate_dungeon_data(WIDTH, HEIGHT, seed=7, num_enemies=0)
+    level = TileGrid.from_rows(result.level)
+    get_tile = tile_getter(level)
+    print(f"视野基准 ({WIDTH}x{HEIGHT}, {steps} 步)")
+    print("-" * 44)
+    print(f"{'半径':>4} | {'ms/步':>8} | {'平均可见格':>10}")
+    for radius in (8, 15, 25):
+        rng = random.Random(3)
+        x, y = result.player_pos
+        fov = FOVSystem(sight_radius=radius)
+        visible = 0
+        start = time.perf_counter()
+        for _ in range(steps):
+            dx, dy = rng.choice(((0, 1), (0, -1), (1, 0), (-1, 0)))
+            if get_tile(x + dx, y + dy) != '#':
+                x, y = x + dx, y + dy
+            visible += len(fov.calculate_fov(x, y, level))
+        ms = (time.perf_counter() - start) * 1000 / steps
+        print(f"{radius:>4} | {ms:8.3f} | {visible / steps:10.1f}")
+
+
+if __name__ == '__main__':
+    n = 500
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+地牢生成器基准
+
+在 400x200 地图上对比不同生成后端的单次 generate_dungeon 耗时，
+并校验相同种子下各后端输出一致。
+
+用法: python tools/benchmark_generator.py [种子数量]
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.dungeon_carvers import NUMPY_AVAILABLE
+
+WIDTH = 400
+HEIGHT = 200
+ROOM_ATTEMPTS = 200
+
+
+def _generate(seed, backend):
+    random.seed(seed)
+    return utils.generate_dungeon_data(WIDTH, HEIGHT, room_attempts=ROOM_ATTEMPTS, seed=seed, backend=backend).level
+
+
+def run_benchmark(seeds: int = 10):
+    backends = ['python'] + (['numpy'] if NUMPY_AVAILABLE else [])
+    results = {}
+    outputs = {}
+    for backend in backends:
+        start = time.perf_counter()
+        outputs[backend] = [_generate(s, backend) for s in range(seeds)]
+        results[backend] = (time.perf_counter() - start) / seeds * 1000  # ms
+
+    identical = all(outputs[b] == outputs['python'] for b in backends)
+    print(f"地牢生成基准 ({WIDTH}x{HEIGHT}, room_attempts={ROOM_ATTEMPTS}, {seeds} 个种子)")
+    print("-" * 48)
+    for backend, ms in results.items():
+        print(f"{backend:8} | {ms:9.2f} ms/map")
+    print("-" * 48)
+    print(f"输出一致: {identical}")
+    return results
+
+
+if __name__ == '__main__':
+    n = 10
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+日志开销基准：每帧 PERF_DATA 调试日志（调试关闭 / 开启）
+
+模拟 PerformanceMonitor 每帧三条调试日志（frame_time / render_time / update_time）：
+- eager: 调用前先拼好 f-string（旧写法）
+- lazy:  格式串 + 参数，被过滤时不做格式化（新写法）
+
+用法: python tools/benchmark_logging.py [帧数]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from game.config import GameConfig
+from game.logger import Logger
+
+
+def _eager(logger, frames):
+    start = time.perf_counter()
+    for i in range(frames):
+        ft = 16.0 + (i % 7) * 0.1
+        logger.debug(f"PERF_DATA|frame_time|{ft:.2f}")
+        logger.debug(f"PERF_DATA|render_time|{ft * 0.6:.2f}")
+        logger.debug(f"PERF_DATA|update_time|{ft * 0.3:.2f}")
+    return (time.perf_counter() - start) * 1e6 / frames
+
+
+def _lazy(logger, frames):
+    start = time.perf_counter()
+    for i in range(frames):
+        ft = 16.0 + (i % 7) * 0.1
+        logger.debug("PERF_DATA|frame_time|%.2f", ft)
+        logger.debug("PERF_DATA|render_time|%.2f", ft * 0.6)
+        logger.debug("PERF_DATA|update_time|%.2f", ft * 0.3)
+    return (time.perf_counter() - start) * 1e6 / frames
+
+
+def run_benchmark(frames: int = 20000):
+    logger = Logger(GameConfig())
+    print(f"每帧调试日志开销 ({frames} 帧, 每帧 3 条)")
+    print("-" * 44)
+    print(f"{'调试':>4} | {'eager us/帧':>11} | {'lazy us/帧':>10}")
+    for debug in (False, True):
+        logger.debug_enabled = debug
+        eager = _eager(logger, frames)
+        lazy = _lazy(logger, frames)
+        logger.flush()
+        print(f"{'开' if debug else '关':>4} | {eager:11.2f} | {lazy:10.2f}")
+
+
+if __name__ == '__main__':
+    n = 20000
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
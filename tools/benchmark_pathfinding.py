@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+敌人寻路基准
+
+在 200x100 地图上让 500 个敌人向玩家寻路，对比原先复制路径的 BFS
+（每个队列条目保存完整路径、用列表判断可行走）与父指针 A*（可行走掩码 + 曼哈顿启发式）。
+分别统计玩家附近（曼哈顿距离 ≤ 20，实际追击场景）与全图随机位置的敌人。
+
+用法: python tools/benchmark_pathfinding.py [敌人数量]
+"""
+import sys
+import time
+import random
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game import utils
+from game.entities import EntityManager
+from game.tile_grid import TileGrid
+
+WIDTH = 200
+HEIGHT = 100
+SEED = 7
+
+
+def legacy_find_path(start, goal, level, WIDTH, HEIGHT):
+    """原 EntityManager._find_path 实现"""
+    if start == goal:
+        return []
+    queue = deque([(start, [])])
+    visited = {start}
+    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    max_path_length = 20
+    while queue:
+        (x, y), path = queue.popleft()
+        if len(path) >= max_path_length:
+            continue
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            if (nx, ny) == goal:
+                return path + [(nx, ny)]
+            if (nx, ny) not in visited and 0 <= nx < WIDTH and 0 <= ny < HEIGHT:
+                tile = level[ny][nx]
+                if tile in ['.', '@']:
+                    visited.add((nx, ny))
+                    queue.append(((nx, ny), path + [(nx, ny)]))
+    return []
+
+
+def _time(fn, starts, goal):
+    t0 = time.perf_counter()
+    lengths = [len(fn(s, goal)) for s in starts]
+    return (time.perf_counter() - t0) * 1000, lengths
+
+
+def run_benchmark(n: int = 500):
+    result = utils.generate_dungeon_data(WIDTH, HEIGHT, room_attempts=120, num_enemies=0, seed=SEED)
+    level = TileGrid.from_rows(result.level)
+    player = result.player_pos
+    floor = level.floor_cells()
+    rng = random.Random(SEED)
+    near = [p for p in floor if abs(p[0] - player[0]) + abs(p[1] - player[1]) <= 20]
+    scenarios = {
+        'near': [rng.choice(near) for _ in range(n)],
+        'random': [rng.choice(floor) for _ in range(n)],
+    }
+
+    mgr = EntityManager()
+    print(f"敌人寻路基准 ({WIDTH}x{HEIGHT}, {n} 个敌人, 深度上限 20)")
+    print("-" * 56)
+    print(f"{'场景':>8} | {'BFS ms':>9} | {'A* ms':>9} | {'加速':>6} | 路径长度一致")
+    for name, starts in scenarios.items():
+        bfs_ms, bfs_len = _time(lambda s, g: legacy_find_path(s, g, level, WIDTH, HEIGHT), starts, player)
+        mgr._walkable = None
+        astar_ms, astar_len = _time(lambda s, g: mgr._find_path(s, g, level, WIDTH, HEIGHT), starts, player)
+        print(f"{name:>8} | {bfs_ms:9.2f} | {astar_ms:9.2f} | {bfs_ms / astar_ms:5.1f}x | {bfs_len == astar_len}")
+
+
+if __name__ == '__main__':
+    n = 500
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
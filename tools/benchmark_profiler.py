@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+区段分析器开销基准：关闭 / 开启时每个区段的额外开销
+
+- 单次调用：普通函数 vs @profiled / with profile_zone（关闭、开启）
+- 每帧：500 个追击敌人各自 A*（关闭距离场，_find_path 调用最多的情形）的 EntityManager.update
+
+用法: python tools/benchmark_profiler.py [调用次数]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.entities import Enemy, EntityManager
+from game.profiler import get_profiler, profile_zone, profiled
+from game.tile_grid import TileGrid
+
+WIDTH = 200
+HEIGHT = 100
+
+
+def _plain(x):
+    return x + 1
+
+
+@profiled('bench.fn')
+def _decorated(x):
+    return x + 1
+
+
+def _zoned(x):
+    with profile_zone('bench.zone'):
+        return x + 1
+
+
+def _ns_per_call(fn, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) * 1e9 / calls
+
+
+def _frame_ms(frames=30, enemies=500):
+    rng = random.Random(5)
+    level = TileGrid.from_rows(['#' * WIDTH] + ['#' + '.' * (WIDTH - 2) + '#'] * (HEIGHT - 2) + ['#' * WIDTH])
+    mgr = EntityManager(rng=random.Random(1), use_flow_field=False, use_ai_lod=False)
+    player = (WIDTH // 2, HEIGHT // 2)
+    cells = [(x, y) for y in range(HEIGHT // 2 - 12, HEIGHT // 2 + 12) for x in range(WIDTH // 2 - 25, WIDTH // 2 + 25)]
+    for x, y in rng.sample([c for c in cells if c != player], enemies):
+        level.set(x, y, 'E')
+        mgr.add(Enemy(x, y, kind='scout'))
+    start = time.perf_counter()
+    for _ in range(frames):
+        mgr.update(level, player, WIDTH, HEIGHT, move_interval_frames=1)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def run_benchmark(calls: int = 200000):
+    profiler = get_profiler()
+    print(f"区段分析器单次调用开销 ({calls} 次)")
+    print("-" * 44)
+    print(f"{'方式':>14} | {'关闭 ns':>8} | {'开启 ns':>8}")
+    plain = _ns_per_call(_plain, calls)
+    print(f"{'普通函数':>14} | {plain:8.1f} | {'-':>8}")
+    for name, fn in (('@profiled', _decorated), ('profile_zone', _zoned)):
+        profiler.disable()
+        off = _ns_per_call(fn, calls)
+        profiler.reset()
+        profiler.enable()
+        on = _ns_per_call(fn, calls)
+        profiler.disable()
+        print(f"{name:>14} | {off:8.1f} | {on:8.1f}")
+
+    print()
+    profiler.reset()
+    off = _frame_ms()
+    profiler.enable()
+    on = _frame_ms()
+    profiler.disable()
+    calls_per_frame = profiler.totals.get('ai.pathfind', [0])[0] / 30
+    print(f"EntityManager.update ({WIDTH}x{HEIGHT}, 500 个追击者, 每帧约 {calls_per_frame:.0f} 次 _find_path)")
+    print(f"关闭: {off:.2f} ms/帧, 开启: {on:.2f} ms/帧")
+
+
+if __name__ == '__main__':
+    n = 200000
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+safe_call 每次调用开销微基准
+
+对比三种调用方式在"无异常"热路径上的单次开销：
+- legacy: 旧实现，每次调用构造装饰器 + ErrorContext（含 traceback.format_stack()）
+- safe_call: 新的 RobustErrorHandler.safe_call（异常时才创建上下文）
+- guard: 预绑定包装器（主循环中使用的方式）
+
+用法: python tools/benchmark_safe_call.py [调用次数]
+"""
+import sys
+import time
+import functools
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.error_handling import RobustErrorHandler, ErrorContext, ErrorSeverity
+
+
+def _legacy_safe_call(handler, func, operation_name, *args, **kwargs):
+    """复现旧版 safe_call 的热路径：每次构造装饰器并提前采集调用栈"""
+
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*a, **kw):
+            context = ErrorContext(operation_name, ErrorSeverity.MEDIUM)
+            context.max_retries = 3
+            context.add_system_info(function_name=f.__name__, args_count=len(a), kwargs_keys=list(kw.keys()))
+            while context.retry_count <= context.max_retries:
+                try:
+                    return f(*a, **kw)
+                except Exception:
+                    return None
+            return None
+
+        return wrapper
+
+    return decorator(func)(*args, **kwargs)
+
+
+def _frame_work(dt):
+    return dt
+
+
+def _time_per_call(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6  # 微秒
+
+
+def run_benchmark(iterations: int = 20000):
+    handler = RobustErrorHandler()
+    try:
+        guarded = handler.guard(_frame_work, "game_systems")
+
+        results = {
+            'legacy': _time_per_call(lambda: _legacy_safe_call(handler, _frame_work, "game_systems", 16), iterations),
+            'safe_call': _time_per_call(lambda: handler.safe_call(_frame_work, "game_systems", 16), iterations),
+            'guard': _time_per_call(lambda: guarded(16), iterations),
+            'direct': _time_per_call(lambda: _frame_work(16), iterations),
+        }
+    finally:
+        handler.cleanup()
+
+    print(f"safe_call 微基准 ({iterations} 次调用，无异常路径)")
+    print("-" * 48)
+    for name, us in results.items():
+        print(f"{name:10} | {us:8.3f} us/call")
+    # 主循环每帧约 7 次受保护调用
+    saved = (results['legacy'] - results['guard']) * 7 / 1000
+    print("-" * 48)
+    print(f"每帧(7次调用)节省约 {saved:.3f} ms")
+    return results
+
+
+if __name__ == '__main__':
+    n = 20000
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+敌人调度基准：每帧遍历所有敌人 vs 时间轮只处理到期敌人
+
+开阔的 200x100 地图，敌人随机分布（move_interval 3-8 帧）。为了只比较调度本身，
+AI 决策固定返回 idle；旧实现每帧还要校正全部敌人的地图瓦片并重建可行走掩码。
+
+用法: python tools/benchmark_scheduler.py [帧数]
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.entities import Enemy, EntityManager
+from game.tile_grid import TileGrid, tile_getter
+
+WIDTH = 200
+HEIGHT = 100
+KINDS = ('basic', 'guard', 'scout', 'brute')
+
+
+class _IdleManager(EntityManager):
+    def _update_enemy_ai(self, enemy, level, player_pos, WIDTH, HEIGHT):
+        return {'type': 'idle'}
+
+
+class _LegacyManager(_IdleManager):
+    """调度器之前的 update：逐帧遍历、逐个累加冷却"""
+
+    def update(self, level, player_pos, WIDTH, HEIGHT, move_interval_frames=15):
+        get_tile = tile_getter(level)
+        for (ex, ey), ent in list(self.entities_by_pos.items()):
+            if get_tile(ex, ey) != 'E':
+                level.set(ex, ey, 'E')
+        self._rebuild_walkable(level)
+        for _, ent in list(self.entities_by_pos.items()):
+            if not isinstance(ent, Enemy):
+                continue
+            ent.move_cooldown += 1
+            if ent.move_cooldown < ent.enemy_stats.get('move_interval', 6):
+                continue
+            ent.move_cooldown = 0
+            self._update_enemy_ai(ent, level, player_pos, WIDTH, HEIGHT)
+        return []
+
+
+def _populate(mgr, level, positions, rng):
+    for x, y in positions:
+        level.set(x, y, 'E')
+        mgr.add(Enemy(x, y, kind=rng.choice(KINDS)))
+
+
+def run_benchmark(frames: int = 240):
+    rng = random.Random(7)
+    cells = [(x, y) for y in range(1, HEIGHT - 1) for x in range(1, WIDTH - 1)]
+    player = (WIDTH // 2, HEIGHT // 2)
+    print(f"敌人调度基准 ({WIDTH}x{HEIGHT}, {frames} 帧, AI 固定 idle)")
+    print("-" * 54)
+    print(f"{'敌人':>6} | {'逐帧遍历 ms/帧':>14} | {'时间轮 ms/帧':>12} | {'加速':>6}")
+    for n in (100, 1000, 5000):
+        positions = rng.sample(cells, n)
+        results = {}
+        for cls in (_LegacyManager, _IdleManager):
+            level = TileGrid.from_rows(['#' * WIDTH] + ['#' + '.' * (WIDTH - 2) + '#'] * (HEIGHT - 2) + ['#' * WIDTH])
+            mgr = cls(rng=random.Random(1), use_flow_field=False)
+            _populate(mgr, level, positions, random.Random(n))
+            start = time.perf_counter()
+            for _ in range(frames):
+                mgr.update(level, player, WIDTH, HEIGHT)
+            results[cls] = (time.perf_counter() - start) * 1000 / frames
+        legacy, wheel = results[_LegacyManager], results[_IdleManager]
+        print(f"{n:>6} | {legacy:14.3f} | {wheel:12.3f} | {legacy / wheel:5.1f}x")
+
+
+if __name__ == '__main__':
+    n = 240
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
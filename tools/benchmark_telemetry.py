@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+遥测录制基准：每帧 PERF_DATA 文本日志 + deque vs 预分配遥测环
+
+模拟 PerformanceMonitor 每帧记录 frame_time / render_time / update_time：
+- text: 追加到三个 deque，并写三条 PERF_DATA 调试日志（调试开启时落盘）
+- ring: 开始一行并写入三列（TelemetryRing，只做下标赋值）
+再把 10 万帧遥测写成 .tlm（以及 .npz，需要 numpy）并计时读取。
+
+用法: python tools/benchmark_telemetry.py [帧数]
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from game.config import GameConfig
+from game.logger import Logger
+from game.telemetry import COL_FRAME, COL_FRAME_MS, COL_RENDER_MS, COL_UPDATE_MS, TelemetryRing, load_telemetry
+
+
+def _text(logger, frames):
+    frame_times, render_times, update_times = deque(maxlen=120), deque(maxlen=120), deque(maxlen=120)
+    start = time.perf_counter()
+    for i in range(frames):
+        ft = 16.0 + (i % 7) * 0.1
+        frame_times.append(ft)
+        logger.debug("PERF_DATA|frame_time|%.2f", ft)
+        render_times.append(ft * 0.6)
+        logger.debug("PERF_DATA|render_time|%.2f", ft * 0.6)
+        update_times.append(ft * 0.3)
+        logger.debug("PERF_DATA|update_time|%.2f", ft * 0.3)
+    return (time.perf_counter() - start) * 1e6 / frames
+
+
+def _ring(frames):
+    ring = TelemetryRing(4096)
+    start = time.perf_counter()
+    for i in range(frames):
+        ft = 16.0 + (i % 7) * 0.1
+        ring.begin_row()
+        ring.set(COL_FRAME, i)
+        ring.set(COL_FRAME_MS, ft)
+        ring.set(COL_RENDER_MS, ft * 0.6)
+        ring.set(COL_UPDATE_MS, ft * 0.3)
+    return (time.perf_counter() - start) * 1e6 / frames
+
+
+def _load_ms(path, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load_telemetry(path)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_benchmark(frames: int = 20000):
+    logger = Logger(GameConfig())
+    print(f"每帧性能数据录制开销 ({frames} 帧, 每帧 3 个指标)")
+    print("-" * 44)
+    print(f"{'调试':>4} | {'text us/帧':>10} | {'ring us/帧':>10}")
+    for debug in (False, True):
+        logger.debug_enabled = debug
+        text = _text(logger, frames)
+        ring = _ring(frames)
+        logger.flush()
+        print(f"{'开' if debug else '关':>4} | {text:10.2f} | {ring:10.2f}")
+
+    ring = TelemetryRing(100000)
+    for i in range(100000):
+        ring.begin_row()
+        ring.set(COL_FRAME, i)
+        ring.set(COL_FRAME_MS, 16.0 + (i % 7) * 0.1)
+    print()
+    with tempfile.TemporaryDirectory() as tmp:
+        targets = ['telemetry.tlm']
+        try:
+            import numpy  # noqa: F401
+
+            targets.append('telemetry.npz')
+        except ImportError:
+            pass
+        for name in targets:
+            path = os.path.join(tmp, name)
+            ring.dump(path)
+            size_kb = os.path.getsize(path) / 1024
+            print(f"100000 帧 {name[-4:]}: {size_kb:8.0f} KB, 读取 {_load_ms(path):6.2f} ms")
+
+
+if __name__ == '__main__':
+    n = 20000
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+静态地形层渲染基准
+
+在 160x80 地图（generate_dungeon 默认上限）上对比：
+- tiles: 逐格绘制 (Renderer._render_level_tiles)
+- layer: 地形层分块 blit + 动态字形 (Renderer._render_terrain)
+
+用法: python tools/benchmark_terrain_layer.py [帧数]
+"""
+import os
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from game.config import GameConfig
+from game.state import GameState
+from game.renderer import Renderer
+from game.fov import FOVSystem
+
+
+class _Player:
+    def __init__(self, x, y, sight_radius):
+        self.x = x
+        self.y = y
+        self.flash_time = 0
+        self.fov_system = FOVSystem(sight_radius)
+
+
+def _make_level(width, height, seed=1):
+    """构造不依赖生成器（无文件副作用）的测试地图"""
+    rng = random.Random(seed)
+    grid = [['.' for _ in range(width)] for _ in range(height)]
+    for x in range(width):
+        grid[0][x] = grid[height - 1][x] = '#'
+    for y in range(height):
+        grid[y][0] = grid[y][width - 1] = '#'
+    for _ in range(width * height // 6):
+        grid[rng.randrange(1, height - 1)][rng.randrange(1, width - 1)] = '#'
+    for _ in range(40):
+        grid[rng.randrange(1, height - 1)][rng.randrange(1, width - 1)] = 'E'
+    grid[1][1] = '@'
+    grid[height - 2][width - 2] = 'X'
+    return [''.join(row) for row in grid]
+
+
+def _time_frames(fn, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - start) / frames * 1000  # ms
+
+
+def run_benchmark(frames: int = 60, width: int = 160, height: int = 80):
+    pygame.init()
+    results = {}
+    for view_w, view_h in ((40, 30), (width, height)):
+        config = GameConfig()
+        config.view_width = view_w
+        config.view_height = view_h
+        game_state = GameState(config)
+        game_state.set_level(_make_level(width, height))
+        renderer = Renderer(config, game_state)
+        player = _Player(view_w // 2, view_h // 2, config.sight_radius)
+
+        for fov in (False, True):
+            config.enable_fov = fov
+            player.fov_system.calculate_fov(player.x, player.y, game_state.level)
+            args = (0, 0, view_w, view_h, None, player, 0, 0)
+            tiles = _time_frames(lambda: renderer._render_level_tiles(*args), frames)
+            renderer._render_terrain(*args)  # 预热分块
+            layer = _time_frames(lambda: renderer._render_terrain(*args), frames)
+            results[(view_w, view_h, fov)] = (tiles, layer)
+
+    print(f"地形层渲染基准 (地图 {width}x{height}, {frames} 帧)")
+    print("-" * 60)
+    print(f"{'视口':>10} | {'FOV':>5} | {'tiles ms':>9} | {'layer ms':>9} | {'加速':>6}")
+    for (vw, vh, fov), (tiles, layer) in results.items():
+        speedup = tiles / layer if layer else 0.0
+        print(f"{vw:>4}x{vh:<5} | {str(fov):>5} | {tiles:9.3f} | {layer:9.3f} | {speedup:5.1f}x")
+    pygame.quit()
+    return results
+
+
+if __name__ == '__main__':
+    n = 60
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
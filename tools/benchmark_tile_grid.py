@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+TileGrid 每次移动开销基准
+
+模拟 EntityManager._move_entity 的一次敌人移动（目标格检查 + 两次 set_tile），
+对比 list[str] 地图与 TileGrid 在 80x30 与 400x200 地图上的单次开销。
+
+用法: python tools/benchmark_tile_grid.py [移动次数]
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from game.utils import set_tile
+from game.tile_grid import TileGrid, tile_getter
+
+
+def _make_level(width, height):
+    rows = ['#' * width]
+    rows += ['#' + '.' * (width - 2) + '#' for _ in range(height - 2)]
+    rows.append('#' * width)
+    return rows
+
+
+def _time_moves(level, moves):
+    get_tile = tile_getter(level)
+    start = time.perf_counter()
+    for (ox, oy), (nx, ny) in moves:
+        if get_tile(nx, ny) != '.':
+            continue
+        set_tile(level, ox, oy, '.')
+        set_tile(level, nx, ny, 'E')
+    return (time.perf_counter() - start) / len(moves) * 1e6  # 微秒
+
+
+def _make_moves(width, height, n, seed=1):
+    rng = random.Random(seed)
+    moves = []
+    for _ in range(n):
+        x = rng.randrange(1, width - 2)
+        y = rng.randrange(1, height - 1)
+        moves.append(((x, y), (x + 1, y)))
+    return moves
+
+
+def run_benchmark(n: int = 20000):
+    results = {}
+    for width, height in ((80, 30), (400, 200)):
+        moves = _make_moves(width, height, n)
+        rows = _make_level(width, height)
+        list_us = _time_moves(list(rows), moves)
+        grid_us = _time_moves(TileGrid.from_rows(rows), moves)
+        results[(width, height)] = (list_us, grid_us)
+
+    print(f"TileGrid 移动开销基准 ({n} 次移动)")
+    print("-" * 52)
+    print(f"{'地图':>9} | {'list[str] us':>12} | {'TileGrid us':>11} | {'加速':>6}")
+    for (w, h), (list_us, grid_us) in results.items():
+        print(f"{w:>4}x{h:<4} | {list_us:12.3f} | {grid_us:11.3f} | {list_us / grid_us:5.1f}x")
+    return results
+
+
+if __name__ == '__main__':
+    n = 20000
+    if len(sys.argv) >= 2:
+        try:
+            n = int(sys.argv[1])
+        except Exception:
+            pass
+    run_benchmark(n)
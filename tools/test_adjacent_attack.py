@@ -65,7 +65,7 @@ def test_adjacent_attack():
         # 显示每个敌人的状态
         status_line = "  状态: "
         for enemy in enemies:
-            move_status = "✓" if enemy.move_cooldown == 0 else f"{enemy.move_cooldown}"
+            move_status = "✓" if entity_mgr.move_cooldown_of(enemy) == 0 else f"{entity_mgr.move_cooldown_of(enemy)}"
             ai_status = "✓" if enemy.ai_cooldown == 0 else f"{enemy.ai_cooldown}"
             status_line += f"{enemy.kind}({move_status}/{ai_status}) "
         print(status_line)
@@ -47,7 +47,7 @@ def test_attack_responsiveness():
                     print(f"  ✅ 敌人立即攻击！伤害: {event['damage']}")
                     print(f"  攻击者ID: {event['attacker_id']}")
         else:
-            print(f"  ⏱️ 移动冷却中: {scout.move_cooldown}/{scout.enemy_stats['move_interval']}")
+            print(f"  ⏱️ 移动冷却中: {entity_mgr.move_cooldown_of(scout)}/{scout.enemy_stats['move_interval']}")
     
     print("\n=== 测试多种敌人攻击速度 ===")
     
@@ -61,7 +61,7 @@ def test_enemy_speed_optimization():
         events = entity_mgr.update(level, player_pos, 20, 10)
         
         for enemy in enemies:
-            status = "移动" if enemy.move_cooldown == 0 else f"冷却({enemy.move_cooldown})"
+            status = "移动" if entity_mgr.move_cooldown_of(enemy) == 0 else f"冷却({entity_mgr.move_cooldown_of(enemy)})"
             ai_status = "AI更新" if enemy.ai_cooldown == 0 else f"AI冷却({enemy.ai_cooldown})"
             print(f"  {enemy.kind}: {status}, {ai_status}")
         